@@ -1,5 +1,7 @@
 from google.adk.agents import Agent
 
+from .coalescing import coalesce_after_model, coalesce_before_model
+
 root_agent = Agent(
     name="greeting_agent",
     # https://ai.google.dev/gemini-api/docs/models
@@ -9,4 +11,6 @@ root_agent = Agent(
     You are a helpful assistant that greets the user. 
     Ask for the user's name and greet them by name.
     """,
+    before_model_callback=coalesce_before_model,
+    after_model_callback=coalesce_after_model,
 )
@@ -0,0 +1,193 @@
+"""
+Single-Flight Request Coalescing
+
+When many users send the same prompt at the same moment, each session fires
+its own identical model call. This module lets concurrent identical requests
+share one upstream call: the first caller (the leader) goes to the model, and
+everyone else with the same canonical LlmRequest awaits the leader's response.
+
+A flight is released without a response, and one of the waiting callers
+takes over as the new leader, when:
+
+- the leader's task ends (for example, the caller disconnected),
+- the leader's model call fails: on_model_error_callback where ADK has it,
+  otherwise the next model call the same task makes,
+- a follower has waited follower_timeout seconds; it then calls the model
+  itself.
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Dict, Optional, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+
+# Marks a flight whose leader went away without a response
+_LEADER_GONE = object()
+DEFAULT_FOLLOWER_TIMEOUT = 30.0
+
+
+def request_key(llm_request: LlmRequest) -> str:
+    """
+    Build a canonical hash of everything that determines the model's answer.
+
+    Args:
+        llm_request: The request about to be sent to the model
+
+    Returns:
+        str: A hex digest identical for identical requests
+    """
+    canonical = {
+        "model": llm_request.model,
+        "contents": [
+            content.model_dump(mode="json", exclude_none=True)
+            for content in llm_request.contents or []
+        ],
+        "config": (
+            llm_request.config.model_dump(exclude_none=True)
+            if llm_request.config
+            else None
+        ),
+    }
+    payload = json.dumps(canonical, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RequestCoalescer:
+    """Tracks in-flight model calls and lets identical calls share a response."""
+
+    def __init__(self, follower_timeout: float = DEFAULT_FOLLOWER_TIMEOUT):
+        """
+        Args:
+            follower_timeout: Seconds a follower waits for a flight before
+                calling the model itself
+        """
+        self.follower_timeout = follower_timeout
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._leading: Dict[asyncio.Task, Tuple[str, asyncio.Future]] = {}
+        self.stats = {
+            "requests": 0,
+            "upstream_calls": 0,
+            "shared": 0,
+            "handoffs": 0,
+            "failed": 0,
+            "timeouts": 0,
+        }
+
+    async def join(self, key: str) -> Optional[LlmResponse]:
+        """
+        Join the flight for `key`.
+
+        Returns:
+            None if the caller is the leader and must call the model itself,
+            otherwise a copy of the leader's response.
+        """
+        self.stats["requests"] += 1
+        # A task makes one model call at a time: if it still leads a flight,
+        # that call failed and the task carried on
+        self.fail()
+        while True:
+            future = self._inflight.get(key)
+            if future is None:
+                self._lead(key)
+                return None
+
+            try:
+                # Shield so a cancelled follower never cancels the shared flight
+                result = await asyncio.wait_for(
+                    asyncio.shield(future), self.follower_timeout
+                )
+            except asyncio.TimeoutError:
+                # The leader is stuck or failed unseen: drop its flight
+                self.stats["timeouts"] += 1
+                self._abandon(key, future)
+                continue
+            if result is _LEADER_GONE:
+                self.stats["handoffs"] += 1
+                continue
+            self.stats["shared"] += 1
+            return result.model_copy(deep=True)
+
+    def _lead(self, key: str) -> None:
+        task = asyncio.current_task()
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        if task not in self._leading:
+            task.add_done_callback(self._release)
+        self._leading[task] = (key, future)
+        self.stats["upstream_calls"] += 1
+
+    def _abandon(self, key: str, future: asyncio.Future, result=_LEADER_GONE) -> None:
+        # A later flight for the same key may have replaced this one
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.done():
+            future.set_result(result)
+
+    def complete(self, response: LlmResponse) -> None:
+        """Publish the current leader's response to its followers."""
+        flight = self._leading.pop(asyncio.current_task(), None)
+        if flight is not None:
+            self._abandon(*flight, result=response)
+
+    def fail(self) -> None:
+        """Release the current leader's flight after its model call failed."""
+        flight = self._leading.pop(asyncio.current_task(), None)
+        if flight is not None:
+            self.stats["failed"] += 1
+            self._abandon(*flight)
+
+    def _release(self, task: asyncio.Task) -> None:
+        # The leader's task ended without completing its flight
+        flight = self._leading.pop(task, None)
+        if flight is not None:
+            self._abandon(*flight)
+
+    @property
+    def duplicate_rate(self) -> float:
+        """Fraction of requests answered from another caller's flight."""
+        if not self.stats["requests"]:
+            return 0.0
+        return self.stats["shared"] / self.stats["requests"]
+
+
+def create_coalescing_callbacks(coalescer: RequestCoalescer):
+    """
+    Create the model callbacks that route through `coalescer`.
+
+    Returns the before_model_callback, the after_model_callback and an
+    on_model_error_callback. ADK 1.6.1 has no on_model_error_callback; there
+    a failed flight is released by the leader's next call or its followers'
+    timeout.
+    """
+
+    async def before_model_callback(
+        callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        return await coalescer.join(request_key(llm_request))
+
+    def after_model_callback(
+        callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        # Streaming chunks are not shareable, wait for the final response
+        if not llm_response.partial:
+            coalescer.complete(llm_response)
+        return None
+
+    def on_model_error_callback(
+        callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+    ) -> Optional[LlmResponse]:
+        coalescer.fail()
+        return None
+
+    return before_model_callback, after_model_callback, on_model_error_callback
+
+
+request_coalescer = RequestCoalescer()
+(
+    coalesce_before_model,
+    coalesce_after_model,
+    coalesce_model_error,
+) = create_coalescing_callbacks(request_coalescer)
@@ -0,0 +1,105 @@
+"""
+Request Coalescing Simulation
+
+Sends bursts of concurrent requests through the RequestCoalescer with a fake
+upstream model and reports the duplicate rate and the upstream calls saved.
+A fraction of callers disconnect mid-flight, and a fraction of upstream calls
+fail, to exercise leader handoff. No model is called.
+
+Usage:
+    python simulate_coalescing.py [--bursts 50] [--burst-size 200] [--prompts 20]
+"""
+
+import argparse
+import asyncio
+import random
+
+from google.adk.models import LlmResponse
+from google.genai import types
+
+from greeting_agent.coalescing import RequestCoalescer
+
+
+async def call_model(coalescer, prompt, latency, error_rate):
+    """One caller: join the flight for `prompt`, calling upstream if leader."""
+    response = await coalescer.join(prompt)
+    if response is None:
+        try:
+            await asyncio.sleep(latency)
+            if random.random() < error_rate:
+                raise ConnectionError("upstream unavailable")
+        except ConnectionError:
+            # The caller reports the error and carries on, as a chat loop would
+            coalescer.fail()
+            return None
+        response = LlmResponse(
+            content=types.Content(
+                role="model", parts=[types.Part(text=f"Re: {prompt}")]
+            )
+        )
+        coalescer.complete(response)
+    return response
+
+
+async def main_async(args):
+    coalescer = RequestCoalescer(follower_timeout=args.follower_timeout)
+    # Zipf-like popularity: a few prompts ("hi", "hello") dominate
+    prompts = [f"prompt-{i}" for i in range(args.prompts)]
+    weights = [1 / (rank + 1) for rank in range(args.prompts)]
+    disconnected = completed = failed = 0
+
+    for _ in range(args.bursts):
+        tasks = [
+            asyncio.create_task(
+                call_model(
+                    coalescer,
+                    random.choices(prompts, weights)[0],
+                    random.uniform(0.05, 0.2),
+                    args.error_rate,
+                )
+            )
+            for _ in range(args.burst_size)
+        ]
+        await asyncio.sleep(0.01)
+
+        # Some callers disconnect while their request is in flight
+        for task in random.sample(tasks, int(len(tasks) * args.disconnect_rate)):
+            task.cancel()
+
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, asyncio.CancelledError):
+                disconnected += 1
+            elif result is None:
+                failed += 1
+            else:
+                completed += 1
+        await asyncio.sleep(random.uniform(0, args.gap))
+
+    stats = coalescer.stats
+    print("\n=== Coalescing simulation ===")
+    print(f"Requests: {stats['requests']} ({disconnected} callers disconnected)")
+    print(f"Completed responses: {completed} ({failed} upstream errors)")
+    print(f"Upstream calls: {stats['upstream_calls']}")
+    print(f"Shared responses: {stats['shared']}")
+    print(f"Leader handoffs after disconnect or error: {stats['handoffs']}")
+    print(f"Follower timeouts: {stats['timeouts']}")
+    print(f"Duplicate rate: {coalescer.duplicate_rate:.1%}")
+    print(f"Calls saved: {stats['requests'] - stats['upstream_calls']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--bursts", type=int, default=50)
+    parser.add_argument("--burst-size", type=int, default=200)
+    parser.add_argument("--prompts", type=int, default=20)
+    parser.add_argument("--disconnect-rate", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--follower-timeout", type=float, default=5.0)
+    parser.add_argument(
+        "--gap", type=float, default=0.1, help="max seconds between bursts"
+    )
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+"""
+Batch Lead Qualification
+
+Streams leads from a CSV or JSONL export through LeadQualificationPipeline
+(validator, scorer, recommender) and writes one result per lead as soon as
+it is qualified:
+
+- --concurrency workers take leads from a bounded queue as they free up, so
+  memory stays flat however long the export is: the report keeps running
+  totals and a fixed-size sample of the latencies, not a record per lead,
+- every lead runs in its own session, deleted once its result is written,
+- results go to a JSONL file or, for a .db or .sqlite path, to the results
+  table of a SQLite database, committed every few hundred leads,
+- a rerun with the same output skips the leads that already have a result,
+  matched by --id-field, so a run that died picks up where it stopped.
+  Leads that failed are tried again,
+- with --stage-concurrency, each stage gets its own limit instead and the
+  stages work on different leads at once, with at most --queue-size leads
+  waiting for each (lead_qualification_agent/pipelining.py).
+
+At the end it reports leads per second, the latency per lead (p50 and
+p95, estimated from a sample of LATENCY_SAMPLE leads), and the model calls
+and tokens per lead on stderr. With --scripted the pipeline runs on
+scripted_llm.ScriptedLeadLlm instead of Gemini, answering after --latency
+seconds, to measure the runner without a provider, and with a
+near-duplicate index of its own that is deleted at the end; make_leads.py
+writes an export to try it on.
+
+Usage:
+    python batch_leads.py leads.csv --output results.jsonl [--concurrency 32]
+    python batch_leads.py leads.jsonl --output results.db [--id-field id]
+    python batch_leads.py leads.csv --output results.db --scripted
+    python batch_leads.py leads.csv --output results.db --stage-concurrency
+        LeadValidatorAgent=8,LeadScorerAgent=8,ActionRecommenderAgent=16
+"""
+
+import argparse
+import asyncio
+import contextlib
+import csv
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Iterator, List, Set
+
+from dotenv import load_dotenv
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from lead_qualification_agent.agent import root_agent
+from lead_qualification_agent.dedup import LeadIndex, set_lead_index
+from lead_qualification_agent.pipelining import StagePipeline, set_stage_pipeline
+
+load_dotenv()
+
+# --- Constants ---
+USER_ID = "batch"
+OUTPUT_KEYS = ("validation_status", "lead_score", "action_recommendation")
+RESULT_COLUMNS = ("id", "status", *OUTPUT_KEYS, "model_calls", "tokens", "seconds")
+COMMIT_EVERY = 500
+PROGRESS_EVERY = 10_000
+# Latencies kept for the percentiles, whatever the number of leads
+LATENCY_SAMPLE = 10_000
+# How far back from the end of a results file to look for its last newline
+TAIL_BLOCK = 64 * 1024
+
+
+def read_leads(path: str, id_field: str) -> Iterator[Dict[str, Any]]:
+    """The leads in a CSV or JSONL export, one at a time."""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for number, lead in enumerate(rows, 1):
+            # Without an id the position stands in, stable across reruns
+            lead.setdefault(id_field, f"row-{number}")
+            lead[id_field] = str(lead[id_field])
+            yield lead
+
+
+def lead_message(lead: Dict[str, Any], id_field: str) -> str:
+    """The pipeline's input for a lead: a 'Field: value' line per non-empty field."""
+    lines = ["Lead Information:"]
+    for field, value in lead.items():
+        value = str(value or "").strip()
+        if field != id_field and value:
+            lines.append(f"{field.replace('_', ' ').title()}: {value}")
+    return "\n".join(lines)
+
+
+def truncate_partial_line(path: str) -> None:
+    """Drop a half-written last line, left by a crash mid-write."""
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - TAIL_BLOCK)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                f.truncate(start + newline + 1)
+                return
+            end = start
+        f.truncate(0)
+
+
+class JsonlResults:
+    """Results as JSON lines, flushed one by one."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._done: Set[str] = set()
+        if os.path.exists(path):
+            truncate_partial_line(path)
+            # Line by line, so a long results file is never read whole
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    if record["status"] == "ok":
+                        self._done.add(record["id"])
+        self._file = open(path, "a", encoding="utf-8")
+
+    def done_ids(self) -> Set[str]:
+        return self._done
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class SqliteResults:
+    """Results in a SQLite table, one row per lead id."""
+
+    def __init__(self, path: str):
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results (id TEXT PRIMARY KEY, status TEXT, "
+            "validation_status TEXT, lead_score TEXT, action_recommendation TEXT, "
+            "model_calls INTEGER, tokens INTEGER, seconds REAL, error TEXT)"
+        )
+        self._pending = 0
+
+    def done_ids(self) -> Set[str]:
+        rows = self._db.execute("SELECT id FROM results WHERE status = 'ok'")
+        return {row[0] for row in rows}
+
+    def write(self, record: Dict[str, Any]) -> None:
+        columns = (*RESULT_COLUMNS, "error")
+        self._db.execute(
+            f"INSERT OR REPLACE INTO results ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})",
+            [record.get(column) for column in columns],
+        )
+        self._pending += 1
+        # Committing every lead would make fsync the bottleneck; a crash
+        # loses at most COMMIT_EVERY results, which the rerun qualifies again
+        if self._pending >= COMMIT_EVERY:
+            self._db.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        self._db.commit()
+        self._db.close()
+
+
+def open_results(path: str):
+    if path.endswith((".db", ".sqlite")):
+        return SqliteResults(path)
+    return JsonlResults(path)
+
+
+async def qualify(runner: InMemoryRunner, lead_id: str, message: str) -> dict:
+    """Run one lead through the pipeline in a session of its own."""
+    started = time.perf_counter()
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id=USER_ID
+    )
+    record = {"id": lead_id, "model_calls": 0, "tokens": 0}
+    try:
+        content = types.Content(role="user", parts=[types.Part(text=message)])
+        async for event in runner.run_async(
+            user_id=USER_ID, session_id=session.id, new_message=content
+        ):
+            if event.usage_metadata is not None:
+                record["model_calls"] += 1
+                record["tokens"] += event.usage_metadata.total_token_count or 0
+        session = await runner.session_service.get_session(
+            app_name=runner.app_name, user_id=USER_ID, session_id=session.id
+        )
+        record["status"] = "ok"
+        for key in OUTPUT_KEYS:
+            record[key] = str(session.state.get(key, "")).strip()
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    finally:
+        await runner.session_service.delete_session(
+            app_name=runner.app_name, user_id=USER_ID, session_id=session.id
+        )
+    record["seconds"] = round(time.perf_counter() - started, 4)
+    return record
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class BatchStats:
+    """
+    Running totals of a batch, in constant memory.
+
+    The latencies of successful leads are kept in a reservoir sample of
+    `sample_size`: every lead has the same chance of being in it, so its
+    percentiles estimate those of the whole batch.
+    """
+
+    def __init__(self, sample_size: int = LATENCY_SAMPLE, seed: int = 0):
+        self.sample_size = sample_size
+        self.qualified = 0
+        self.ok = 0
+        self.model_calls = 0
+        self.tokens = 0
+        self.latencies: List[float] = []
+        self._rng = random.Random(seed)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        self.qualified += 1
+        if record["status"] != "ok":
+            return
+        self.ok += 1
+        self.model_calls += record["model_calls"]
+        self.tokens += record["tokens"]
+        if len(self.latencies) < self.sample_size:
+            self.latencies.append(record["seconds"])
+        else:
+            slot = self._rng.randrange(self.ok)
+            if slot < self.sample_size:
+                self.latencies[slot] = record["seconds"]
+
+
+def report(stats: BatchStats, skipped, wall_seconds):
+    print(
+        f"{stats.qualified} leads in {wall_seconds:.1f}s: {stats.ok} ok, "
+        f"{stats.qualified - stats.ok} failed, {skipped} already done",
+        file=sys.stderr,
+    )
+    if stats.ok:
+        print(
+            f"{stats.qualified / wall_seconds:.1f} leads/s; latency "
+            f"p50 {percentile(stats.latencies, 0.5):.2f}s, "
+            f"p95 {percentile(stats.latencies, 0.95):.2f}s; per lead "
+            f"{stats.model_calls / stats.ok:.2f} model calls, "
+            f"{stats.tokens / stats.ok:.0f} tokens",
+            file=sys.stderr,
+        )
+
+
+def make_runner(args) -> InMemoryRunner:
+    if not args.scripted:
+        return InMemoryRunner(agent=root_agent, app_name="lead_qualification_agent")
+    from scripted_llm import ScriptedLeadLlm, scripted_pipeline
+
+    llm = ScriptedLeadLlm(seed=args.seed, latency=args.latency)
+    return InMemoryRunner(agent=scripted_pipeline(llm), app_name="batch_leads")
+
+
+async def main_async(args):
+    runner = make_runner(args)
+    results = open_results(args.output)
+    done = results.done_ids()
+    # With stage limits, enough leads are in flight to fill every stage
+    workers_count = args.pipeline.capacity if args.pipeline else args.concurrency
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers_count * 2)
+    stats = BatchStats(seed=args.seed)
+    skipped = 0
+
+    async def worker():
+        while (item := await queue.get()) is not None:
+            record = await qualify(runner, *item)
+            results.write(record)
+            stats.add(record)
+            if stats.qualified % PROGRESS_EVERY == 0:
+                print(f"[BATCH] {stats.qualified} leads qualified", file=sys.stderr)
+
+    started = time.perf_counter()
+    workers = [asyncio.create_task(worker()) for _ in range(workers_count)]
+    try:
+        for lead in read_leads(args.input, args.id_field):
+            lead_id = lead[args.id_field]
+            if lead_id in done:
+                skipped += 1
+                continue
+            await queue.put((lead_id, lead_message(lead, args.id_field)))
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        results.close()
+    report(stats, skipped, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("input", help="CSV or JSONL file of leads")
+    parser.add_argument("--output", required=True, help=".jsonl, .db or .sqlite")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--stage-concurrency",
+        help="Per-stage limits, as AgentName=N,... (replaces --concurrency)",
+    )
+    parser.add_argument("--queue-size", type=int, default=8)
+    parser.add_argument("--scripted", action="store_true")
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    args.pipeline = None
+    if args.stage_concurrency:
+        stages = {agent.name for agent in root_agent.sub_agents}
+        concurrency = {}
+        for item in args.stage_concurrency.split(","):
+            name, _, limit = item.partition("=")
+            if name.strip() not in stages or not limit.strip().isdigit():
+                parser.error(
+                    "--stage-concurrency: expected Name=N, with Name one of "
+                    + ", ".join(sorted(stages))
+                )
+            concurrency[name.strip()] = int(limit)
+        args.pipeline = StagePipeline(concurrency, args.queue_size)
+        set_stage_pipeline(args.pipeline)
+
+    with contextlib.ExitStack() as stack:
+        if args.scripted:
+            # Scripted runs start from, and leave behind, no scored leads
+            directory = stack.enter_context(tempfile.TemporaryDirectory())
+            set_lead_index(LeadIndex(os.path.join(directory, "lead_index.db")))
+        asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
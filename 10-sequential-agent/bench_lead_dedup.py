@@ -0,0 +1,216 @@
+"""
+Near-Duplicate Lead Index Benchmark
+
+Fills a LeadIndex (lead_qualification_agent/dedup.py) with --leads distinct
+synthetic prospects, then measures:
+
+- build: leads added per second and the size of the database on disk,
+- lookups of --queries reformatted copies of indexed leads (fields
+  shuffled, case, spacing and phone format changed, an alias for the email
+  field), and of as many copies of leads with notes that drop them: how
+  many find the lead they copy,
+- lookups of --queries prospects that are not in the index: how many find
+  a lead anyway (false reuses), and the latency of both kinds,
+- the pipeline: --stream leads, each prospect sent three times in
+  different formats, qualified with and without the index, in model calls
+  per lead. The model is scripted_llm.ScriptedLeadLlm, so no provider is
+  called.
+
+The database is written to a temporary directory unless --path is given.
+
+Usage:
+    python bench_lead_dedup.py [--leads 1000000] [--queries 10000]
+                               [--threshold 0.9] [--stream 600] [--path PATH]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from google.adk.runners import InMemoryRunner
+
+from batch_leads import lead_message, percentile, qualify
+from lead_qualification_agent.dedup import LeadIndex, set_lead_index
+from scripted_llm import ScriptedLeadLlm, make_lead, scripted_pipeline
+
+# --- Constants ---
+SYLLABLES = [
+    "an", "bel", "cor", "dan", "el", "fin", "gar", "hol", "is", "jan", "kel",
+    "lor", "mar", "nel", "os", "per", "quin", "ros", "sol", "tam", "ur", "ven",
+    "wil", "yor",
+]  # fmt: skip
+COMPANY_KINDS = ["Labs", "Group", "Systems", "Partners", "Logistics", "Health"]
+ADD_EVERY = 10_000
+
+
+def prospect(i: int, seed: int) -> dict:
+    """A make_lead() lead with a name, email, phone and company of its own."""
+    lead = make_lead(i, seed)
+    rng = random.Random(f"{seed}-{i}")
+
+    def word(syllables):
+        return "".join(rng.choice(SYLLABLES) for _ in range(syllables)).title()
+
+    first, last, company = word(2), word(3), word(2)
+    lead.update(
+        name=f"{first} {last}",
+        company=f"{company} {rng.choice(COMPANY_KINDS)}",
+        # Incomplete leads are not scored, so none are indexed
+        email=f"{first[0].lower()}.{last.lower()}@{company.lower()}.com",
+        phone=f"{rng.randint(200, 999)}-{rng.randint(200, 999)}-"
+        f"{rng.randint(1000, 9999)}",
+        interest=lead["interest"] or "Looking for an AI assistant",
+    )
+    return lead
+
+
+def reformat(lead: dict, rng: random.Random, drop_notes: bool = False) -> str:
+    """The lead as another source would send it, optionally without notes."""
+    fields = [(name, value) for name, value in lead.items() if name != "id"]
+    rng.shuffle(fields)
+    lines = ["Lead Information:"]
+    for name, value in fields:
+        if not value or (name == "notes" and drop_notes):
+            continue
+        label = name.title()
+        if name == "email":
+            label = rng.choice(["Email", "Email Address", "E-mail Address"])
+            value = rng.choice([value, value.upper()])
+        elif name == "phone":
+            digits = value.replace("-", "")
+            value = rng.choice(
+                [value, f"({digits[:3]}) {digits[3:6]} {digits[6:]}", digits]
+            )
+        elif name in ("name", "company"):
+            value = rng.choice([value, value.upper(), value.lower()])
+        elif name == "interest" and rng.random() < 0.5:
+            value += "."
+        lines.append(f"{label}:{' ' * rng.randint(1, 3)}{value}")
+    return "\n".join(lines)
+
+
+def build(index, args):
+    started = time.perf_counter()
+    for start in range(0, args.leads, ADD_EVERY):
+        with index.bulk():
+            for i in range(start, min(start + ADD_EVERY, args.leads)):
+                lead = prospect(i, args.seed)
+                index.add(lead_message(lead, "id"), str(i), f"action {i}")
+    seconds = time.perf_counter() - started
+    size = sum(
+        os.path.getsize(index.path + suffix)
+        for suffix in ("", "-wal")
+        if os.path.exists(index.path + suffix)
+    )
+    print(
+        f"build: {args.leads} leads in {seconds:.0f}s ({args.leads / seconds:,.0f} "
+        f"leads/s), {size / 2**20:,.0f} MiB on disk "
+        f"({size / args.leads:,.0f} bytes per lead)"
+    )
+
+
+def lookups(index, args, rng):
+    def timed(message):
+        started = time.perf_counter()
+        match = index.find(message)
+        return match, time.perf_counter() - started
+
+    for label, drop_notes in (("reformatted", False), ("without notes", True)):
+        latencies, found, right = [], 0, 0
+        for _ in range(args.queries):
+            i = rng.randrange(args.leads)
+            lead = prospect(i, args.seed)
+            # Only leads with notes can lose them
+            while drop_notes and not lead["notes"]:
+                i = rng.randrange(args.leads)
+                lead = prospect(i, args.seed)
+            match, seconds = timed(reformat(lead, rng, drop_notes))
+            latencies.append(seconds)
+            found += match is not None
+            right += match is not None and match["lead_score"] == str(i)
+        print(
+            f"{label}: {found / args.queries:.1%} found, "
+            f"{right / args.queries:.1%} found the lead they copy; "
+            f"latency p50 {percentile(latencies, 0.5) * 1e3:.2f}ms, "
+            f"p95 {percentile(latencies, 0.95) * 1e3:.2f}ms"
+        )
+
+    latencies, false_hits = [], 0
+    for j in range(args.queries):
+        lead = prospect(args.leads + j, args.seed)
+        match, seconds = timed(lead_message(lead, "id"))
+        latencies.append(seconds)
+        false_hits += match is not None
+    print(
+        f"new prospects: {false_hits / args.queries:.2%} matched a lead anyway; "
+        f"latency p50 {percentile(latencies, 0.5) * 1e3:.2f}ms, "
+        f"p95 {percentile(latencies, 0.95) * 1e3:.2f}ms"
+    )
+
+    i = rng.randrange(args.leads)
+    expired = index.find(
+        lead_message(prospect(i, args.seed), "id"),
+        now=time.time() + index.ttl_seconds + 1,
+    )
+    print(f"a lead past the TTL is {'reused' if expired else 'not reused'}")
+
+
+async def stream(args, directory, dedup):
+    """Model calls per lead for a stream of prospects each sent three times."""
+    rng = random.Random(args.seed)
+    prospects = [prospect(i, args.seed) for i in range(args.stream // 3)]
+    messages = [reformat(lead, rng) for lead in prospects for _ in range(3)]
+    rng.shuffle(messages)
+    path = os.path.join(directory, f"stream-{dedup}.db")
+    set_lead_index(LeadIndex(path, threshold=args.threshold))
+    llm = ScriptedLeadLlm(seed=args.seed)
+    runner = InMemoryRunner(
+        agent=scripted_pipeline(llm, dedup=dedup), app_name="lead_dedup"
+    )
+    records = []
+    # The callbacks print a line per lead they answer for
+    with contextlib.redirect_stdout(io.StringIO()):
+        for number, message in enumerate(messages):
+            records.append(await qualify(runner, f"stream-{number}", message))
+    return statistics.mean(record["model_calls"] for record in records)
+
+
+async def main_async(args, directory):
+    path = args.path or os.path.join(directory, "lead_index.db")
+    index = LeadIndex(path, threshold=args.threshold)
+    print(f"=== {args.leads:,} leads, threshold {args.threshold} ===")
+    build(index, args)
+    lookups(index, args, random.Random(args.seed))
+    index.close()
+
+    if args.stream:
+        without = await stream(args, directory, dedup=False)
+        with_index = await stream(args, directory, dedup=True)
+        print(
+            f"pipeline, {args.stream} leads sent three times each: "
+            f"{without:.2f} model calls per lead without the index, "
+            f"{with_index:.2f} with it"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--leads", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--stream", type=int, default=600)
+    parser.add_argument("--path", help="Database to build (default: temporary)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(main_async(args, directory))
+
+
+if __name__ == "__main__":
+    main()
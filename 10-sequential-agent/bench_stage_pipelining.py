@@ -0,0 +1,165 @@
+"""
+Stage Pipelining Benchmark
+
+Qualifies --leads synthetic leads (scripted_llm.make_lead) at the same
+total concurrency two ways and compares them:
+
+- per lead: --concurrency leads at a time, each holding its unit of
+  concurrency from the validator to the recommender,
+- pipelined: a StagePipeline (lead_qualification_agent/pipelining.py)
+  splits the same total between the stages, in proportion to the model
+  time each stage used in the per-lead run, with --queue-size leads
+  allowed to wait for each stage.
+
+Each runs under two latency profiles of scripted_llm.ScriptedLeadLlm:
+uniform (every stage answers in 0.2s) and skewed (validator 0.1s, scorer
+0.2s, recommender 0.6s). A last pair of runs, on the skewed profile, has
+the recommender's model limited to --recommender-cap calls at once, as a
+provider quota would: per lead, only that many leads can run at once;
+pipelined, only the recommender is held to it.
+
+It reports leads per second, the latency per lead (p50 and p95), and the
+mean number of model calls in flight, against the total concurrency. The
+near-duplicate index is left out.
+
+Usage:
+    python bench_stage_pipelining.py [--leads 1000] [--concurrency 24]
+                                     [--queue-size 8] [--recommender-cap 4]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+from collections import Counter
+from typing import AsyncGenerator
+
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.runners import InMemoryRunner
+from pydantic import PrivateAttr
+
+from batch_leads import lead_message, percentile, qualify
+from lead_qualification_agent.agent import root_agent
+from lead_qualification_agent.pipelining import StagePipeline, set_stage_pipeline
+from scripted_llm import ScriptedLeadLlm, make_lead, scripted_pipeline
+
+PROFILES = {
+    "uniform": {"validator": 0.2, "scorer": 0.2, "recommender": 0.2},
+    "skewed": {"validator": 0.1, "scorer": 0.2, "recommender": 0.6},
+}
+# The scripted model's roles, in the order of the pipeline's sub-agents
+ROLES = ("validator", "scorer", "recommender")
+
+
+class TimedLlm(ScriptedLeadLlm):
+    """A ScriptedLeadLlm that adds up the model time each role takes."""
+
+    _busy: Counter = PrivateAttr(default_factory=Counter)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        role, _ = self.answer(llm_request)
+        started = time.perf_counter()
+        async for response in super().generate_content_async(llm_request, stream):
+            yield response
+        self._busy[role] += time.perf_counter() - started
+
+
+async def run(args, profile, concurrency, pipeline=None):
+    llm = TimedLlm(seed=args.seed, stage_latency=profile)
+    runner = InMemoryRunner(
+        agent=scripted_pipeline(llm, dedup=False), app_name="stage_pipelining"
+    )
+    set_stage_pipeline(pipeline)
+    in_flight = asyncio.Semaphore(pipeline.capacity if pipeline else concurrency)
+
+    async def qualify_lead(i):
+        async with in_flight:
+            lead = make_lead(i, args.seed)
+            return await qualify(runner, lead["id"], lead_message(lead, "id"))
+
+    started = time.perf_counter()
+    # The validation gate prints a line per lead it stops
+    with contextlib.redirect_stdout(io.StringIO()):
+        records = await asyncio.gather(*(qualify_lead(i) for i in range(args.leads)))
+    wall_seconds = time.perf_counter() - started
+    set_stage_pipeline(None)
+    return records, wall_seconds, llm._busy
+
+
+def summarize(label, args, records, wall_seconds, busy):
+    latencies = [record["seconds"] for record in records]
+    print(
+        f"{label:<34} {len(records) / wall_seconds:6.1f} leads/s  "
+        f"p50 {percentile(latencies, 0.5):.2f}s  "
+        f"p95 {percentile(latencies, 0.95):.2f}s  "
+        f"calls in flight {sum(busy.values()) / wall_seconds:5.1f}"
+        f"/{args.concurrency}"
+    )
+
+
+def split(total, busy, fixed=None):
+    """
+    `total` slots shared by the stages in proportion to their model time.
+
+    Stages in `fixed` (by role) get the limit given there; the others share
+    what is left.
+    """
+    fixed = fixed or {}
+    roles = [role for role in ROLES if role not in fixed]
+    left = total - sum(fixed.values())
+    shares = [busy[role] / sum(busy[r] for r in roles) * left for role in roles]
+    limits = dict(zip(roles, (max(1, int(share)) for share in shares)))
+    # Hand the slots lost to rounding to the stages that lost the most
+    by_remainder = sorted(
+        roles, key=lambda role: limits[role] - shares[roles.index(role)]
+    )
+    for role in by_remainder[: left - sum(limits.values())]:
+        limits[role] += 1
+    limits.update(fixed)
+    return {
+        agent.name: limits[role] for agent, role in zip(root_agent.sub_agents, ROLES)
+    }
+
+
+def label_limits(concurrency):
+    return "/".join(str(limit) for limit in concurrency.values())
+
+
+async def main_async(args):
+    print(f"=== {args.leads} leads, total concurrency {args.concurrency} ===")
+    for name, profile in PROFILES.items():
+        records, wall_seconds, busy = await run(args, profile, args.concurrency)
+        summarize(f"{name}, per lead", args, records, wall_seconds, busy)
+        concurrency = split(args.concurrency, busy)
+        pipeline = StagePipeline(concurrency, args.queue_size)
+        records, wall_seconds, busy = await run(args, profile, 0, pipeline)
+        label = f"{name}, pipelined {label_limits(concurrency)}"
+        summarize(label, args, records, wall_seconds, busy)
+
+    cap = args.recommender_cap
+    profile = PROFILES["skewed"]
+    # Per lead, any of the leads in flight may be in the recommender at once
+    records, wall_seconds, busy = await run(args, profile, cap)
+    summarize(f"capped, per lead {cap}", args, records, wall_seconds, busy)
+    concurrency = split(args.concurrency, busy, fixed={"recommender": cap})
+    pipeline = StagePipeline(concurrency, args.queue_size)
+    records, wall_seconds, busy = await run(args, profile, 0, pipeline)
+    label = f"capped, pipelined {label_limits(concurrency)}"
+    summarize(label, args, records, wall_seconds, busy)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--leads", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=24)
+    parser.add_argument("--queue-size", type=int, default=8)
+    parser.add_argument("--recommender-cap", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,13 @@ Sequential Agent with a Minimal Callback
 
 This example demonstrates a lead qualification pipeline with a minimal
 before_agent_callback that only initializes state once at the beginning.
-"""
 
-from google.adk.agents import SequentialAgent
+The pipeline checkpoints after each stage when run through
+run_checkpointed.py, which resumes a run that died (see checkpoint.py), and
+its stages can run under per-stage limits (see pipelining.py).
+"""
 
+from .pipelining import StagedSequentialAgent
 from .subagents.recommender import action_recommender_agent
 from .subagents.scorer import lead_scorer_agent
 
@@ -14,7 +17,7 @@ from .subagents.scorer import lead_scorer_agent
 from .subagents.validator import lead_validator_agent
 
 # Create the sequential agent with minimal callback
-root_agent = SequentialAgent(
+root_agent = StagedSequentialAgent(
     name="LeadQualificationPipeline",
     sub_agents=[lead_validator_agent, lead_scorer_agent, action_recommender_agent],
     description="A pipeline that validates, scores, and recommends actions for sales leads",
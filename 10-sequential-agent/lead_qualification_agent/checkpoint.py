@@ -0,0 +1,225 @@
+"""
+Pipeline Checkpoints
+
+A process that dies halfway through a pipeline loses every model call made
+so far: the rerun starts again from the first stage. A run named by
+checkpoint_run_id in the session state instead saves its progress to a
+local CheckpointStore as it goes: CheckpointedSequentialAgent records each
+sub-agent as it completes, with the session state it left behind (its
+output_key values).
+
+resume_session() starts the run, or restores its last checkpoint into a new
+session. The completed stages are then skipped, so at most the stage in
+progress is repeated. Sessions without a checkpoint_run_id are not
+checkpointed.
+
+A stage can also end the pipeline early: a callback that calls
+stop_pipeline() makes CheckpointedSequentialAgent skip the stages after it
+for the rest of the invocation, and a checkpointed run records them as
+completed, so a resumed run skips them too.
+
+The store is the one in 12-loop-agent/linkedin_post_agent/checkpoint.py,
+copied because each example runs from its own directory; the loop counters
+that copy also saves are left out here, as this pipeline has no loop.
+"""
+
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+
+from google.adk.agents import SequentialAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions import Session
+from google.genai import types
+
+# --- Constants ---
+DEFAULT_CHECKPOINT_DIR = ".checkpoints"
+RUN_KEY = "checkpoint_run_id"
+STOP_KEY = "pipeline_stop"
+# Run ids become file names
+RUN_ID_PATTERN = re.compile(r"^[\w.-]+$")
+
+
+class CheckpointStore:
+    """Checkpoints as one JSON file per run, replaced atomically on every save."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, run_id: str) -> str:
+        if not RUN_ID_PATTERN.match(run_id):
+            raise ValueError(f"Invalid run id {run_id!r}: use letters, digits, . _ -")
+        return os.path.join(self.directory, f"{run_id}.json")
+
+    def load(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """The run's checkpoint, or None if it has none."""
+        try:
+            with open(self._path(run_id), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, run_id: str, checkpoint: Dict[str, Any]) -> None:
+        """Write the checkpoint; a crash mid-write leaves the previous one."""
+        path = self._path(run_id)
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(checkpoint, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def delete(self, run_id: str) -> None:
+        try:
+            os.unlink(self._path(run_id))
+        except FileNotFoundError:
+            pass
+
+
+_store = CheckpointStore(os.environ.get("CHECKPOINT_DIR", DEFAULT_CHECKPOINT_DIR))
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """The store every run saves to, in CHECKPOINT_DIR (default .checkpoints)."""
+    return _store
+
+
+def set_checkpoint_store(store: CheckpointStore) -> None:
+    """Save every run to `store` from now on."""
+    global _store
+    _store = store
+
+
+def _new_checkpoint(message: str) -> Dict[str, Any]:
+    return {
+        "message": message,
+        "state": {},
+        "completed": [],
+        "updated_at": time.time(),
+    }
+
+
+def load_checkpoint(ctx: InvocationContext) -> Optional[Dict[str, Any]]:
+    """The checkpoint of the session's run, or None if it is not checkpointed."""
+    run_id = ctx.session.state.get(RUN_KEY)
+    if run_id is None:
+        return None
+    return _store.load(run_id)
+
+
+def save_checkpoint(ctx: InvocationContext, completed: Optional[str] = None) -> None:
+    """
+    Save the session state of a checkpointed run, with its progress.
+
+    Args:
+        ctx: The invocation context of the agent saving
+        completed: The name of a sub-agent that has just completed
+    """
+    run_id = ctx.session.state.get(RUN_KEY)
+    if run_id is None:
+        return
+    checkpoint = _store.load(run_id) or _new_checkpoint("")
+    checkpoint["state"] = {
+        key: value
+        for key, value in ctx.session.state.items()
+        if key != RUN_KEY and not key.startswith("temp:")
+    }
+    if completed is not None:
+        checkpoint["completed"].append(completed)
+    checkpoint["updated_at"] = time.time()
+    _store.save(run_id, checkpoint)
+
+
+def stop_pipeline(callback_context: CallbackContext, reason: str) -> None:
+    """Skip the stages after the current one, for this invocation only."""
+    # Tagged with the invocation, so the next message to the session runs
+    # the whole pipeline again
+    callback_context.state[STOP_KEY] = {
+        "invocation_id": callback_context.invocation_id,
+        "reason": reason,
+    }
+
+
+def stop_reason(ctx: InvocationContext) -> Optional[str]:
+    """Why a stage stopped the pipeline in this invocation, or None."""
+    stop = ctx.session.state.get(STOP_KEY)
+    if not stop or stop["invocation_id"] != ctx.invocation_id:
+        return None
+    return stop["reason"]
+
+
+class CheckpointedSequentialAgent(SequentialAgent):
+    """
+    A SequentialAgent that checkpoints after each sub-agent.
+
+    In a checkpointed run, sub-agents recorded as completed are skipped; the
+    session already holds the state they left behind. Once a stage calls
+    stop_pipeline(), the remaining sub-agents are skipped as well.
+    """
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        checkpoint = load_checkpoint(ctx)
+        completed: List[str] = checkpoint["completed"] if checkpoint else []
+        for sub_agent in self.sub_agents:
+            if sub_agent.name in completed:
+                print(f"[CHECKPOINT] Skipping {sub_agent.name}, completed earlier")
+                continue
+            reason = stop_reason(ctx)
+            if reason is not None:
+                print(f"[GATE] Skipping {sub_agent.name}: {reason}")
+                save_checkpoint(ctx, completed=sub_agent.name)
+                continue
+            async for event in sub_agent.run_async(ctx):
+                yield event
+            # The runner has applied every yielded event to the session
+            save_checkpoint(ctx, completed=sub_agent.name)
+
+
+async def resume_session(
+    runner: Runner, user_id: str, run_id: str, message: Optional[str] = None
+) -> Tuple[Session, types.Content]:
+    """
+    Create a session for run `run_id`, and the message to send to it.
+
+    A new run needs `message`. A run that has a checkpoint is resumed: the
+    session starts with the saved state, and the message is the one the
+    run started with.
+
+    Raises:
+        ValueError: The run has no checkpoint and no message was given, or
+            was started with a different message
+    """
+    checkpoint = _store.load(run_id)
+    if checkpoint is None:
+        if message is None:
+            raise ValueError(f"Run {run_id!r} has no checkpoint to resume")
+        checkpoint = _new_checkpoint(message)
+        _store.save(run_id, checkpoint)
+    elif message is not None and message != checkpoint["message"]:
+        raise ValueError(f"Run {run_id!r} was started with a different message")
+    else:
+        print(
+            f"[CHECKPOINT] Resuming {run_id}, completed: "
+            + (", ".join(checkpoint["completed"]) or "nothing")
+        )
+
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name,
+        user_id=user_id,
+        state={**checkpoint["state"], RUN_KEY: run_id},
+    )
+    content = types.Content(role="user", parts=[types.Part(text=checkpoint["message"])])
+    return session, content
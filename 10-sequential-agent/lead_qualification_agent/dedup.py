@@ -0,0 +1,343 @@
+"""
+Near-Duplicate Lead Index
+
+The same prospect comes in many times a week, from a form, a badge scan and
+an import, each copy formatted a little differently. LeadIndex remembers
+the lead_score and action_recommendation of every lead scored recently, so
+a near-duplicate can reuse them instead of being scored again:
+
+- a lead is normalized (fields sorted, case, punctuation and spacing
+  ignored) and described by the MinHash signature of its 5-byte shingles,
+- signatures are split into bands and locality-sensitive hashing turns
+  each band into a bucket key, so a lookup only compares the leads that
+  share a bucket with it, however many the index holds,
+- a candidate is reused when the estimated Jaccard similarity of the two
+  leads reaches the threshold, it was scored within the TTL, and the two
+  share an email or phone number if both have one. Two prospects whose
+  leads only differ in the contact details are different people, however
+  alike the rest of their leads read.
+
+The index is a SQLite database (LEAD_INDEX_PATH, default .lead_index.db),
+with LEAD_DEDUP_THRESHOLD (default 0.9) and LEAD_DEDUP_TTL_HOURS (default
+168). reuse_lead_score is a before_agent_callback for the scorer and
+record_lead_score an after_agent_callback for the recommender, which adds
+the lead from a worker thread so its insert and commit do not hold up the
+event loop.
+"""
+
+import asyncio
+import contextlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Iterator, Optional, Set
+
+import numpy as np
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+from .checkpoint import stop_pipeline
+from .rules import parse_lead
+
+# --- Constants ---
+DEFAULT_INDEX_PATH = ".lead_index.db"
+DEFAULT_THRESHOLD = 0.9
+DEFAULT_TTL_HOURS = 7 * 24
+SHINGLE_BYTES = 5
+CONTACT_FIELDS = ("email", "phone")
+NUM_PERM = 64
+# 8 bands of 8 rows: leads 90% similar share a bucket 99% of the time, leads
+# 50% similar 3% of the time
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+# Signatures are only comparable under the same hash functions
+HASH_SEED = 20240611
+SCHEMA_VERSION = f"minhash-{NUM_PERM}x{BANDS}-{SHINGLE_BYTES}-{HASH_SEED}"
+
+_rng = np.random.default_rng(HASH_SEED)
+_ONE = np.uint64(1)
+# Odd multipliers, as multiply-shift hashing needs
+_PERM_A = _rng.integers(0, 1 << 63, NUM_PERM, dtype=np.uint64) << _ONE | _ONE
+_PERM_B = _rng.integers(0, 1 << 63, NUM_PERM, dtype=np.uint64)
+_BAND_MULTIPLIERS = _rng.integers(0, 1 << 63, ROWS, dtype=np.uint64) << _ONE | _ONE
+_BAND_OFFSETS = _rng.integers(0, 1 << 63, BANDS, dtype=np.uint64)
+
+
+def normalize_lead(message: str) -> str:
+    """
+    The text of a lead that formatting does not change.
+
+    Fields are sorted by name; values are NFKC-normalized and case-folded,
+    and runs of punctuation and spaces become one space, or none between
+    digits, so '(555) 123-4567' and '555.123.4567' read the same. A message
+    without 'Field: value' lines is normalized as a whole.
+    """
+    fields = parse_lead(message)
+    if not fields:
+        return _normalize_text(message)
+    return "\n".join(
+        f"{name} {_normalize_text(value)}" for name, value in sorted(fields.items())
+    )
+
+
+def _normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = re.sub(r"[^\w@]+", " ", text)
+    # Phone numbers are grouped in many ways
+    return re.sub(r"(?<=\d) (?=\d)", "", text).strip()
+
+
+def contact_details(message: str) -> Set[str]:
+    """The normalized email and phone number of a lead, those it has."""
+    fields = parse_lead(message)
+    return {
+        _normalize_text(fields[name]) for name in CONTACT_FIELDS if fields.get(name)
+    }
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """The NUM_PERM MinHash values of the byte shingles of `text`, as uint32."""
+    data = np.frombuffer(text.encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+    if len(data) < SHINGLE_BYTES:
+        data = np.pad(data, (0, SHINGLE_BYTES - len(data)))
+    count = len(data) - SHINGLE_BYTES + 1
+    shingles = data[:count].copy()
+    for offset in range(1, SHINGLE_BYTES):
+        shingles |= data[offset : offset + count] << np.uint64(8 * offset)
+    # Multiply-shift hashing: (a * x + b) wraps modulo 2**64 and the top 32
+    # bits are the hash
+    hashes = (_PERM_A[:, None] * shingles[None, :] + _PERM_B[:, None]) >> np.uint64(32)
+    return hashes.min(axis=1).astype(np.uint32)
+
+
+def band_keys(signature: np.ndarray) -> np.ndarray:
+    """One bucket key per band of `signature`, as int64 for SQLite."""
+    rows = signature.reshape(BANDS, ROWS).astype(np.uint64)
+    # Wraps around modulo 2**64, which is what a hash wants
+    keys = (rows * _BAND_MULTIPLIERS).sum(axis=1) ^ _BAND_OFFSETS
+    return keys.view(np.int64)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """The Jaccard similarity of two leads, estimated from their signatures."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+class LeadIndex:
+    """Scored leads in a SQLite database, looked up by near-duplicate text."""
+
+    def __init__(
+        self,
+        path: str,
+        threshold: float = DEFAULT_THRESHOLD,
+        ttl_seconds: float = DEFAULT_TTL_HOURS * 3600,
+    ):
+        """
+        Args:
+            path: The database file, created if missing
+            threshold: The least estimated Jaccard similarity to reuse a score
+            ttl_seconds: How long after scoring a lead its score is reused
+        """
+        self.path = path
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        # Leads are added from worker threads (record_lead_score); _lock
+        # keeps one thread at a time on the connection
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+            "CREATE TABLE IF NOT EXISTS leads (id INTEGER PRIMARY KEY, "
+            "signature BLOB, contacts TEXT, lead_score TEXT, "
+            "action_recommendation TEXT, "
+            "scored_at REAL);"
+            "CREATE INDEX IF NOT EXISTS leads_scored_at ON leads (scored_at);"
+            "CREATE TABLE IF NOT EXISTS buckets (key INTEGER, lead_id INTEGER, "
+            "PRIMARY KEY (key, lead_id)) WITHOUT ROWID;"
+        )
+        self._db.execute(
+            "INSERT OR IGNORE INTO meta VALUES ('schema', ?)", (SCHEMA_VERSION,)
+        )
+        (schema,) = self._db.execute(
+            "SELECT value FROM meta WHERE key = 'schema'"
+        ).fetchone()
+        if schema != SCHEMA_VERSION:
+            raise ValueError(
+                f"{path} was built with {schema}, not {SCHEMA_VERSION}; delete it"
+            )
+        self._db.commit()
+        self._bulk = False
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+
+    def find(
+        self, message: str, now: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        The most similar lead scored within the TTL, if similar enough.
+
+        Returns:
+            Optional[Dict[str, Any]]: Its lead_score, action_recommendation,
+            similarity and scored_at, or None
+        """
+        signature = minhash_signature(normalize_lead(message))
+        contacts = contact_details(message)
+        keys = band_keys(signature).tolist()
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT leads.id, signature, contacts, lead_score, "
+                "action_recommendation, scored_at "
+                "FROM buckets JOIN leads ON leads.id = buckets.lead_id "
+                f"WHERE buckets.key IN ({', '.join('?' * BANDS)}) AND scored_at >= ?",
+                [*keys, now - self.ttl_seconds],
+            ).fetchall()
+        best = None
+        for _, blob, stored, lead_score, action_recommendation, scored_at in rows:
+            stored_contacts = set(stored.split("\n")) if stored else set()
+            if contacts and stored_contacts and not contacts & stored_contacts:
+                continue
+            score = similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+            if score >= self.threshold and (best is None or score > best["similarity"]):
+                best = {
+                    "lead_score": lead_score,
+                    "action_recommendation": action_recommendation,
+                    "similarity": score,
+                    "scored_at": scored_at,
+                }
+        return best
+
+    def add(
+        self,
+        message: str,
+        lead_score: str,
+        action_recommendation: str,
+        scored_at: Optional[float] = None,
+    ) -> None:
+        """Remember the score and recommendation of a lead scored just now."""
+        signature = minhash_signature(normalize_lead(message))
+        keys = band_keys(signature).tolist()
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO leads (signature, contacts, lead_score, "
+                "action_recommendation, scored_at) VALUES (?, ?, ?, ?, ?)",
+                (
+                    signature.tobytes(),
+                    "\n".join(sorted(contact_details(message))),
+                    lead_score,
+                    action_recommendation,
+                    time.time() if scored_at is None else scored_at,
+                ),
+            )
+            self._db.executemany(
+                "INSERT OR IGNORE INTO buckets VALUES (?, ?)",
+                [(key, cursor.lastrowid) for key in keys],
+            )
+            if not self._bulk:
+                self._db.commit()
+
+    @contextlib.contextmanager
+    def bulk(self) -> Iterator["LeadIndex"]:
+        """Add many leads in one transaction, committed when the block ends."""
+        self._bulk = True
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._bulk = False
+                self._db.commit()
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Forget the leads scored longer ago than the TTL; returns how many."""
+        cutoff = (time.time() if now is None else now) - self.ttl_seconds
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM buckets WHERE lead_id IN "
+                "(SELECT id FROM leads WHERE scored_at < ?)",
+                (cutoff,),
+            )
+            deleted = self._db.execute(
+                "DELETE FROM leads WHERE scored_at < ?", (cutoff,)
+            ).rowcount
+            self._db.commit()
+        return deleted
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+
+
+_index: Optional[LeadIndex] = None
+
+
+def get_lead_index() -> LeadIndex:
+    """The index the pipeline uses, opened (and pruned) on first use."""
+    global _index
+    if _index is None:
+        _index = LeadIndex(
+            os.environ.get("LEAD_INDEX_PATH", DEFAULT_INDEX_PATH),
+            threshold=float(os.environ.get("LEAD_DEDUP_THRESHOLD", DEFAULT_THRESHOLD)),
+            ttl_seconds=float(os.environ.get("LEAD_DEDUP_TTL_HOURS", DEFAULT_TTL_HOURS))
+            * 3600,
+        )
+        _index.prune()
+    return _index
+
+
+def set_lead_index(index: LeadIndex) -> None:
+    """Look leads up in, and add them to, `index` from now on."""
+    global _index
+    _index = index
+
+
+def _lead_message(callback_context: CallbackContext) -> Optional[str]:
+    user_content = callback_context.user_content
+    if user_content is None or not user_content.parts:
+        return None
+    return "\n".join(part.text for part in user_content.parts if part.text)
+
+
+def reuse_lead_score(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    Reuse the score of a near-duplicate scored recently and skip the scorer.
+
+    Restores lead_score and action_recommendation and stops the pipeline,
+    so the recommender is skipped too. Returns None to let the scorer run
+    on a lead with no near-duplicate in the index.
+    """
+    message = _lead_message(callback_context)
+    if message is None:
+        return None
+    match = get_lead_index().find(message)
+    if match is None:
+        return None
+
+    print(f"[DEDUP] Reusing the score of a lead {match['similarity']:.0%} similar")
+    callback_context.state["lead_score"] = match["lead_score"]
+    callback_context.state["action_recommendation"] = match["action_recommendation"]
+    stop_pipeline(callback_context, "near-duplicate of a lead scored recently")
+    return types.Content(role="model", parts=[types.Part(text=match["lead_score"])])
+
+
+async def record_lead_score(
+    callback_context: CallbackContext,
+) -> Optional[types.Content]:
+    """Add the lead just scored, with its recommendation, to the index."""
+    message = _lead_message(callback_context)
+    lead_score = callback_context.state.get("lead_score")
+    action_recommendation = callback_context.state.get("action_recommendation")
+    if message is None or lead_score is None or action_recommendation is None:
+        return None
+    # The insert and its commit wait on the disk; the other leads need not
+    await asyncio.to_thread(
+        get_lead_index().add, message, str(lead_score), str(action_recommendation)
+    )
+    return None
@@ -0,0 +1,156 @@
+"""
+Stage Pipelining
+
+When many leads are qualified at once, each lead normally holds one unit of
+concurrency from its first stage to its last. A StagePipeline instead gives
+each stage of LeadQualificationPipeline its own limits, so the validator,
+scorer and recommender work on different leads at the same time:
+
+- concurrency: how many leads each stage runs at once,
+- queue_size: how many leads may wait for each stage. A lead that finishes
+  a stage keeps its slot until there is room in the next stage's queue, so
+  a slow stage holds back the stages before it instead of letting leads
+  pile up in memory.
+
+Stages with no limit run as soon as a lead reaches them. A
+StagedSequentialAgent holds each run's slots in lead_stages(), and
+enter_stage, which it puts first among each sub-agent's
+before_agent_callbacks, hands the slot on from stage to stage. The slot is
+released when the run ends, so a lead whose pipeline stops early (see
+stop_pipeline() in checkpoint.py) frees it once the remaining stages are
+skipped. With no StagePipeline set, stages are not limited.
+"""
+
+import asyncio
+import contextlib
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Optional, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+
+from .checkpoint import CheckpointedSequentialAgent
+
+# --- Constants ---
+DEFAULT_QUEUE_SIZE = 8
+
+
+class LeadStages:
+    """The stage slot one lead holds, handed over from stage to stage."""
+
+    def __init__(self, pipeline: Optional["StagePipeline"]):
+        self._pipeline = pipeline
+        self._held: Optional[asyncio.Semaphore] = None
+
+    async def enter(self, stage: str) -> None:
+        """Wait for room in `stage`, giving up the previous stage's slot."""
+        limits = self._pipeline.limits(stage) if self._pipeline else None
+        if limits is None:
+            self.release()
+            return
+        queue, workers = limits
+        # The previous slot is held while the queue is full: backpressure
+        await queue.acquire()
+        self.release()
+        try:
+            await workers.acquire()
+        finally:
+            queue.release()
+        self._held = workers
+
+    def release(self) -> None:
+        if self._held is not None:
+            self._held.release()
+            self._held = None
+
+
+class StagePipeline:
+    """Per-stage concurrency and queue limits, keyed by sub-agent name."""
+
+    def __init__(
+        self, concurrency: Dict[str, int], queue_size: int = DEFAULT_QUEUE_SIZE
+    ):
+        """
+        Args:
+            concurrency: How many leads each named stage runs at once
+            queue_size: How many leads may wait for each limited stage
+        """
+        self.concurrency = dict(concurrency)
+        self.queue_size = queue_size
+        self._limits = {
+            stage: (asyncio.Semaphore(queue_size), asyncio.Semaphore(limit))
+            for stage, limit in self.concurrency.items()
+        }
+
+    @property
+    def capacity(self) -> int:
+        """The most leads that can be in the limited stages or their queues."""
+        return sum(self.concurrency.values()) + self.queue_size * len(self._limits)
+
+    def limits(
+        self, stage: str
+    ) -> Optional[Tuple[asyncio.Semaphore, asyncio.Semaphore]]:
+        return self._limits.get(stage)
+
+
+_pipeline: Optional[StagePipeline] = None
+
+
+def get_stage_pipeline() -> Optional[StagePipeline]:
+    """The limits the pipeline's stages run under, or None for none."""
+    return _pipeline
+
+
+def set_stage_pipeline(pipeline: Optional[StagePipeline]) -> None:
+    """Run the stages under `pipeline` from now on (None removes the limits)."""
+    global _pipeline
+    _pipeline = pipeline
+
+
+@contextlib.asynccontextmanager
+async def lead_stages() -> AsyncIterator[LeadStages]:
+    """The slots of one lead's run, all released when the run ends."""
+    stages = LeadStages(_pipeline)
+    try:
+        yield stages
+    finally:
+        stages.release()
+
+
+# The slots of the runs in progress, by invocation id
+_running: Dict[str, LeadStages] = {}
+
+
+async def enter_stage(callback_context: CallbackContext) -> None:
+    """before_agent_callback: wait for the stage's slot in the lead's run."""
+    stages = _running.get(callback_context.invocation_id)
+    if stages is not None:
+        await stages.enter(callback_context.agent_name)
+    return None
+
+
+class StagedSequentialAgent(CheckpointedSequentialAgent):
+    """
+    A CheckpointedSequentialAgent whose sub-agents each wait for their slot
+    in the StagePipeline, if one is set, before they run.
+    """
+
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        for sub_agent in self.sub_agents:
+            callbacks = sub_agent.canonical_before_agent_callbacks
+            if enter_stage not in callbacks:
+                # First, so a callback that answers for the stage (the rule
+                # gate, a near-duplicate) also runs in the stage's slot
+                sub_agent.before_agent_callback = [enter_stage, *callbacks]
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        async with lead_stages() as stages:
+            _running[ctx.invocation_id] = stages
+            try:
+                async for event in super()._run_async_impl(ctx):
+                    yield event
+            finally:
+                del _running[ctx.invocation_id]
@@ -0,0 +1,205 @@
+"""
+Rule-Based Lead Validation
+
+Many leads in a CRM export fail validation for reasons code can see: no
+name, no email or phone, no stated interest, or an email address that is
+not one. check_lead() reads the "Field: value" lines of a lead and returns
+the rules it breaks, following the LeadRules in use:
+
+- required: groups of fields, each satisfied by any one of its fields (by
+  default a name, an email or phone, and an interest),
+- formats: a pattern a field's value must match to count towards its
+  group. A malformed email or phone number only makes a lead invalid when
+  it is all that group has; next to a well-formed alternative it is
+  ignored, and a field outside every group is left for the model to judge.
+
+check_lead_rules is a before_agent_callback for the validator: a lead that
+breaks a rule is marked invalid without calling the model, and the rest of
+the pipeline is skipped (see stop_pipeline() in checkpoint.py).
+stop_invalid_lead is the validator's after_agent_callback and does the same
+for leads the model finds invalid. Either way the recommendation asks for
+the missing details, as the recommender would have, and the scorer is not
+paid for a lead that cannot be qualified.
+
+A message with fewer than min_fields recognizable fields is left to the
+model, which can read a lead written as prose.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+from .checkpoint import stop_pipeline
+
+# --- Constants ---
+DEFAULT_REQUIRED = (("name",), ("email", "phone"), ("interest",))
+DEFAULT_FORMATS = {
+    "email": re.compile(r"^[^@\s]+@[^@\s]+\.[A-Za-z]{2,}$"),
+    # At least 7 digits, with the usual separators and an optional
+    # extension: "ext. 89", "x89", "#89", "extension 89"
+    "phone": re.compile(
+        r"^\+?(?:[\s().-]*\d){7,15}[\s().-]*"
+        r"(?:[,;]?\s*(?:ext(?:ension)?\.?|x|#)\s*\d{1,6}\s*)?$",
+        re.IGNORECASE,
+    ),
+}
+# Other names CRM exports use for the fields the rules look at
+FIELD_ALIASES = {
+    "full_name": "name",
+    "contact_name": "name",
+    "email_address": "email",
+    "e_mail": "email",
+    "e_mail_address": "email",
+    "phone_number": "phone",
+    "need": "interest",
+    "needs": "interest",
+}
+# What each required field stands for in the reason given
+FIELD_DESCRIPTIONS = {
+    "name": "contact name",
+    "email": "contact information",
+    "phone": "contact information",
+    "interest": "indication of interest or need",
+}
+INVALID_RECOMMENDATION = (
+    "Reach out to complete the lead before qualifying it: {reason}."
+)
+
+
+@dataclass(frozen=True)
+class LeadRules:
+    """The fields a lead needs, and the formats their values must have."""
+
+    required: Tuple[Tuple[str, ...], ...] = DEFAULT_REQUIRED
+    formats: Dict[str, Pattern] = field(default_factory=lambda: dict(DEFAULT_FORMATS))
+    min_fields: int = 2
+
+    @classmethod
+    def from_env(cls) -> "LeadRules":
+        """
+        The default rules, with LEAD_REQUIRED_FIELDS if it is set.
+
+        LEAD_REQUIRED_FIELDS lists the required groups separated by commas,
+        the fields of a group separated by '|': 'name,email|phone,interest'.
+        """
+        spec = os.environ.get("LEAD_REQUIRED_FIELDS")
+        if not spec:
+            return cls()
+        required = tuple(
+            tuple(name.strip().lower() for name in group.split("|") if name.strip())
+            for group in spec.split(",")
+            if group.strip()
+        )
+        return cls(required=required)
+
+
+@dataclass
+class RuleViolation:
+    """A broken rule and the reason to give for the lead being invalid."""
+
+    rule: str
+    reason: str
+
+
+_rules = LeadRules.from_env()
+
+
+def get_lead_rules() -> LeadRules:
+    """The rules the validator's gate checks leads against."""
+    return _rules
+
+
+def set_lead_rules(rules: LeadRules) -> None:
+    """Check leads against `rules` from now on."""
+    global _rules
+    _rules = rules
+
+
+def parse_lead(message: str) -> Dict[str, str]:
+    """The non-empty 'Field: value' lines of a lead, by lower-cased field name."""
+    lead = {}
+    for line in message.splitlines():
+        name, separator, value = line.partition(":")
+        if separator and value.strip():
+            name = re.sub(r"\W+", "_", name.strip().lower())
+            lead[FIELD_ALIASES.get(name, name)] = value.strip()
+    return lead
+
+
+def check_lead(message: str, rules: Optional[LeadRules] = None) -> List[RuleViolation]:
+    """
+    Check a lead message against `rules` (default: get_lead_rules()).
+
+    Returns:
+        List[RuleViolation]: Every rule the lead breaks; empty if it breaks
+        none, or has too few recognizable fields to be checked
+    """
+    rules = rules or _rules
+    lead = parse_lead(message)
+    known = {name for group in rules.required for name in group} | set(rules.formats)
+    if len(known & set(lead)) < rules.min_fields:
+        return []
+
+    malformed = {
+        name
+        for name, pattern in rules.formats.items()
+        if lead.get(name) and not pattern.match(lead[name])
+    }
+    violations = []
+    for group in rules.required:
+        if any(lead.get(name) and name not in malformed for name in group):
+            continue
+        # Only a malformed value the group has no other field for is reported
+        bad = [name for name in group if name in malformed]
+        if bad:
+            violations.extend(
+                RuleViolation(f"format:{name}", f"malformed {name}") for name in bad
+            )
+        else:
+            described = FIELD_DESCRIPTIONS.get(group[0], " or ".join(group))
+            violations.append(
+                RuleViolation(f"required:{'|'.join(group)}", f"missing {described}")
+            )
+    return violations
+
+
+def _mark_invalid(callback_context: CallbackContext, validation_status: str) -> None:
+    reason = validation_status.partition(":")[2].strip() or "incomplete lead"
+    callback_context.state["action_recommendation"] = INVALID_RECOMMENDATION.format(
+        reason=reason
+    )
+    stop_pipeline(callback_context, validation_status)
+
+
+def check_lead_rules(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    Mark a lead that breaks a rule invalid and skip the validator.
+
+    Writes validation_status and action_recommendation and stops the
+    pipeline. Returns None to let the validator judge a lead that passes.
+    """
+    user_content = callback_context.user_content
+    if user_content is None or not user_content.parts:
+        return None
+    message = "\n".join(part.text for part in user_content.parts if part.text)
+    violations = check_lead(message)
+    if not violations:
+        return None
+
+    validation_status = "invalid: " + "; ".join(v.reason for v in violations)
+    print(f"[RULES] {validation_status}")
+    callback_context.state["validation_status"] = validation_status
+    _mark_invalid(callback_context, validation_status)
+    return types.Content(role="model", parts=[types.Part(text=validation_status)])
+
+
+def stop_invalid_lead(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Skip the rest of the pipeline for a lead the validator found invalid."""
+    validation_status = str(callback_context.state.get("validation_status", ""))
+    if validation_status.strip().lower().startswith("invalid"):
+        _mark_invalid(callback_context, validation_status.strip())
+    return None
@@ -3,10 +3,15 @@ Action Recommender Agent
 
 This agent is responsible for recommending appropriate next actions
 based on the lead validation and scoring results.
+
+Each lead scored, with its recommendation, is added to the near-duplicate
+index (see dedup.py).
 """
 
 from google.adk.agents import LlmAgent
 
+from ...dedup import record_lead_score
+
 # --- Constants ---
 GEMINI_MODEL = "gemini-2.0-flash"
 
@@ -33,4 +38,5 @@ action_recommender_agent = LlmAgent(
     """,
     description="Recommends next actions based on lead qualification.",
     output_key="action_recommendation",
+    after_agent_callback=record_lead_score,
 )
@@ -3,10 +3,15 @@ Lead Scorer Agent
 
 This agent is responsible for scoring a lead's qualification level
 based on various criteria.
+
+A lead that is a near-duplicate of one scored recently reuses its score
+(see dedup.py) instead of calling the model.
 """
 
 from google.adk.agents import LlmAgent
 
+from ...dedup import reuse_lead_score
+
 # --- Constants ---
 GEMINI_MODEL = "gemini-2.0-flash"
 
@@ -29,4 +34,5 @@ lead_scorer_agent = LlmAgent(
     """,
     description="Scores qualified leads on a scale of 1-10.",
     output_key="lead_score",
+    before_agent_callback=reuse_lead_score,
 )
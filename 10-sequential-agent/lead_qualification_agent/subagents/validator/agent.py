@@ -3,10 +3,16 @@ Lead Validator Agent
 
 This agent is responsible for validating if a lead has all the necessary information
 for qualification.
+
+Leads that clearly break a rule (see rules.py) are marked invalid before the
+model is called, and the scorer and recommender are skipped for any lead
+found invalid.
 """
 
 from google.adk.agents import LlmAgent
 
+from ...rules import check_lead_rules, stop_invalid_lead
+
 # --- Constants ---
 GEMINI_MODEL = "gemini-2.0-flash"
 
@@ -29,4 +35,6 @@ lead_validator_agent = LlmAgent(
     """,
     description="Validates lead information for completeness.",
     output_key="validation_status",
+    before_agent_callback=check_lead_rules,
+    after_agent_callback=stop_invalid_lead,
 )
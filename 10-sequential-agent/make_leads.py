@@ -0,0 +1,42 @@
+"""
+Synthetic Lead Export
+
+Writes --count synthetic CRM leads (scripted_llm.make_lead) to a CSV or
+JSONL file, for the batch runner and benchmarks:
+
+- about two thirds are complete, the rest have no contact details, no
+  stated interest, or only a vague one and no company,
+- the format follows the extension: .csv or .jsonl.
+
+Usage:
+    python make_leads.py leads.csv [--count 100000] [--seed 0]
+"""
+
+import argparse
+import csv
+import json
+
+from scripted_llm import LEAD_FIELDS, make_lead
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("path")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with open(args.path, "w", encoding="utf-8", newline="") as f:
+        if args.path.endswith(".csv"):
+            writer = csv.DictWriter(f, fieldnames=("id", *LEAD_FIELDS))
+            writer.writeheader()
+            for i in range(args.count):
+                writer.writerow(make_lead(i, args.seed))
+        else:
+            for i in range(args.count):
+                f.write(json.dumps(make_lead(i, args.seed)) + "\n")
+    print(f"Wrote {args.count} leads to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Checkpointed Lead Qualification Run
+
+Runs LeadQualificationPipeline on one lead as a named run that saves a
+checkpoint after each stage (see lead_qualification_agent/checkpoint.py).
+If the process dies, running the same --run-id again resumes it: the
+validator, scorer or recommender that already completed is not called
+again.
+
+- the lead is needed only to start a run, a resumed run reuses it,
+- checkpoints are JSON files in CHECKPOINT_DIR (default .checkpoints).
+
+Usage:
+    python run_checkpointed.py --run-id sarah-johnson "Lead Information: ..."
+    python run_checkpointed.py --run-id sarah-johnson
+"""
+
+import argparse
+import asyncio
+
+from dotenv import load_dotenv
+from google.adk.runners import InMemoryRunner
+
+from lead_qualification_agent.agent import root_agent
+from lead_qualification_agent.checkpoint import resume_session
+
+load_dotenv()
+
+USER_ID = "checkpointed"
+OUTPUT_KEYS = ("validation_status", "lead_score", "action_recommendation")
+
+
+async def main_async(args):
+    runner = InMemoryRunner(agent=root_agent, app_name="lead_qualification_agent")
+    session, message = await resume_session(runner, USER_ID, args.run_id, args.lead)
+    async for event in runner.run_async(
+        user_id=USER_ID, session_id=session.id, new_message=message
+    ):
+        if event.is_final_response() and event.content and event.content.parts:
+            print(f"[{event.author}] {event.content.parts[0].text.strip()}")
+
+    session = await runner.session_service.get_session(
+        app_name=runner.app_name, user_id=USER_ID, session_id=session.id
+    )
+    print("\n=== Result ===")
+    for key in OUTPUT_KEYS:
+        print(f"{key}: {str(session.state.get(key, '')).strip()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--run-id", required=True)
+    parser.add_argument("lead", nargs="?")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
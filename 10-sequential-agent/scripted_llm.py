@@ -0,0 +1,272 @@
+"""
+Scripted Lead Qualification Model
+
+A stand-in for Gemini that plays the validator, scorer and recommender of
+lead_qualification_agent, for simulations and benchmarks that must not call
+a provider. It recognizes the agent from its instruction and reads the lead
+from the user message, one "Field: value" line per field:
+
+- the validator answers 'valid', or 'invalid: <reason>' when the lead has
+  no name, no email or phone, or no stated interest,
+- the scorer starts from 3 and adds points for a budget, a timeline, a
+  decision-making position and a specific interest, with a point of noise
+  either way, and answers '<score>: <justification>', and
+- the recommender answers with the action for the score band in the
+  instruction, or asks for the missing details of an invalid lead.
+
+Each response carries usage metadata (about 4 characters per token), and
+sleeps `latency` seconds to stand in for the provider's response time, or
+the role's `stage_latency` ('validator', 'scorer' or 'recommender').
+
+make_lead() draws a synthetic CRM lead of mixed quality, and
+scripted_pipeline() builds the pipeline around the model.
+"""
+
+import asyncio
+import random
+import re
+import zlib
+from typing import AsyncGenerator, Dict, Optional, Tuple
+
+from google.adk.agents import SequentialAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+
+from lead_qualification_agent.agent import root_agent
+from lead_qualification_agent.rules import (
+    check_lead_rules,
+    parse_lead,
+    stop_invalid_lead,
+)
+from lead_qualification_agent.subagents.validator import lead_validator_agent
+
+# --- Constants ---
+CHARS_PER_TOKEN = 4
+# ADK appends the agent's name and description to its instruction
+IDENTITY_MARKER = "\n\nYou are an agent."
+ROLES = {
+    "Lead Validation AI": "validator",
+    "Lead Scoring AI": "scorer",
+    "Action Recommendation AI": "recommender",
+}
+LEAD_FIELDS = (
+    "name",
+    "email",
+    "phone",
+    "company",
+    "position",
+    "interest",
+    "budget",
+    "timeline",
+    "notes",
+)
+
+FIRST_NAMES = ["Sarah", "John", "Priya", "Miguel", "Aiko", "Tom", "Fatima", "Lena"]
+LAST_NAMES = ["Johnson", "Doe", "Patel", "Garcia", "Tanaka", "Baker", "Khan", "Berg"]
+COMPANIES = [
+    "Tech Innovate Solutions",
+    "Northwind Logistics",
+    "Acme Retail",
+    "Bluefin Health",
+    "Summit Financial",
+    "Greenleaf Energy",
+]
+DECISION_MAKERS = [
+    "CTO",
+    "CEO",
+    "VP of Operations",
+    "Head of Support",
+    "Director of IT",
+]
+OTHER_POSITIONS = ["Analyst", "Engineer", "Intern", "Coordinator", "Consultant"]
+INTERESTS = [
+    "Looking for an AI solution to automate customer support",
+    "Needs to cut invoice processing time across three warehouses",
+    "Evaluating chatbots for patient appointment scheduling",
+    "Wants fraud alerts summarized for the risk team",
+]
+VAGUE_INTERESTS = ["Something with AI maybe", "Just browsing", "Saw the webinar"]
+BUDGETS = ["$50K-100K available for the right solution", "$20K this fiscal year"]
+TIMELINES = ["Hoping to implement within next quarter", "Decision in 6 weeks"]
+NOTES = [
+    "Currently using a competitor's product but unhappy with performance",
+    "Met at conference, seemed interested but was vague about needs",
+    "Downloaded the pricing sheet twice",
+]
+
+
+def make_lead(i: int, seed: int = 0) -> Dict[str, str]:
+    """Lead `i` of a synthetic CRM export; about a third are incomplete or vague."""
+    rng = random.Random(seed * 1_000_003 + i)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    company = rng.choice(COMPANIES)
+    domain = re.sub(r"\W", "", company.split()[0].lower())
+    lead = {
+        "id": f"lead-{i}",
+        "name": f"{first} {last}",
+        "email": f"{first[0].lower()}.{last.lower()}@{domain}.com",
+        "phone": f"555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        "company": company,
+        "position": rng.choice(DECISION_MAKERS + OTHER_POSITIONS),
+        "interest": rng.choice(INTERESTS),
+        "budget": rng.choice(BUDGETS) if rng.random() < 0.5 else "",
+        "timeline": rng.choice(TIMELINES) if rng.random() < 0.5 else "",
+        "notes": rng.choice(NOTES) if rng.random() < 0.5 else "",
+    }
+    quality = rng.random()
+    if quality < 0.15:
+        lead["email"] = lead["phone"] = ""
+    elif quality < 0.25:
+        lead["interest"] = ""
+    elif quality < 0.35:
+        lead["interest"] = rng.choice(VAGUE_INTERESTS)
+        lead["company"] = lead["position"] = ""
+    return lead
+
+
+def validate(lead: Dict[str, str]) -> str:
+    if not lead.get("name") or not (lead.get("email") or lead.get("phone")):
+        return "invalid: missing contact information"
+    if not lead.get("interest"):
+        return "invalid: no indication of interest or need"
+    return "valid"
+
+
+def score(lead: Dict[str, str], rng: random.Random) -> str:
+    points, reasons = 3, []
+    if lead.get("budget"):
+        points += 2
+        reasons.append("clear budget")
+    if lead.get("timeline"):
+        points += 2
+        reasons.append("a timeline")
+    if lead.get("position") in DECISION_MAKERS:
+        points += 2
+        reasons.append("decision-making authority")
+    if lead.get("interest") in INTERESTS:
+        points += 1
+        reasons.append("a specific need")
+    points = max(1, min(10, points + rng.choice((-1, 0, 0, 1))))
+    justification = ", ".join(reasons) or "vague interest with no timeline or budget"
+    return f"{points}: {justification[0].upper()}{justification[1:]}"
+
+
+def recommend(lead_score: str, validation_status: str) -> str:
+    if validation_status.startswith("invalid"):
+        reason = validation_status.partition(":")[2].strip()
+        return f"Reach out to complete the lead before qualifying it ({reason})."
+    match = re.match(r"\s*(\d+)", lead_score)
+    points = int(match.group(1)) if match else 1
+    if points >= 8:
+        return "Sales action: book a product demo and send a tailored proposal."
+    if points >= 4:
+        return "Qualifying action: schedule a discovery call to assess needs."
+    return "Nurture: add to the educational email sequence and revisit later."
+
+
+def _text(text: str) -> types.Content:
+    return types.Content(role="model", parts=[types.Part(text=text)])
+
+
+def _section(instruction: str, start: str, end: Optional[str] = None) -> str:
+    text = instruction.split(start, 1)[1]
+    if end is not None:
+        text = text.split(end, 1)[0]
+    return text.strip()
+
+
+def _usage(
+    llm_request: LlmRequest, content: types.Content
+) -> types.GenerateContentResponseUsageMetadata:
+    prompt_chars = len(llm_request.config.system_instruction or "")
+    for request_content in llm_request.contents:
+        for part in request_content.parts or []:
+            prompt_chars += len(part.text or "")
+    output_chars = sum(len(part.text or "") for part in content.parts)
+    return types.GenerateContentResponseUsageMetadata(
+        prompt_token_count=prompt_chars // CHARS_PER_TOKEN,
+        candidates_token_count=output_chars // CHARS_PER_TOKEN,
+        total_token_count=(prompt_chars + output_chars) // CHARS_PER_TOKEN,
+    )
+
+
+class ScriptedLeadLlm(BaseLlm):
+    """Plays the lead validator, scorer and recommender without a provider."""
+
+    model: str = "scripted-lead-llm"
+    seed: int = 0
+    latency: float = 0.0
+    stage_latency: Dict[str, float] = {}
+
+    def answer(self, llm_request: LlmRequest) -> Tuple[str, types.Content]:
+        """The role the request is for, and its answer."""
+        instruction = llm_request.config.system_instruction or ""
+        instruction = instruction.split(IDENTITY_MARKER, 1)[0]
+        role = next((ROLES[marker] for marker in ROLES if marker in instruction), None)
+        if role is None:
+            raise ValueError("ScriptedLeadLlm does not know this agent")
+        # The lead is the first user message; later ones relay other agents
+        message = next(
+            (
+                part.text
+                for content in llm_request.contents
+                if content.role == "user"
+                for part in content.parts or []
+                if part.text
+            ),
+            "",
+        )
+        lead = parse_lead(message)
+        if role == "validator":
+            return role, _text(validate(lead))
+        if role == "scorer":
+            rng = random.Random(zlib.crc32(message.encode()) ^ self.seed)
+            return role, _text(score(lead, rng))
+        lead_score = _section(instruction, "Lead Score:", "Lead Validation Status:")
+        validation_status = _section(instruction, "Lead Validation Status:")
+        return role, _text(recommend(lead_score, validation_status))
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        role, content = self.answer(llm_request)
+        latency = self.stage_latency.get(role, self.latency)
+        if latency:
+            await asyncio.sleep(latency)
+        yield LlmResponse(content=content, usage_metadata=_usage(llm_request, content))
+
+
+def with_model(agent, llm: BaseLlm, **update):
+    """A copy of an LlmAgent (outside any tree) that calls `llm` instead."""
+    return agent.model_copy(update={"parent_agent": None, "model": llm, **update})
+
+
+def scripted_pipeline(
+    llm: BaseLlm, rules: bool = True, skip: bool = True, dedup: bool = True
+) -> SequentialAgent:
+    """
+    LeadQualificationPipeline with every agent calling `llm`.
+
+    Args:
+        llm: The model for every agent
+        rules: Whether the validator's rule gate (check_lead_rules) runs
+        skip: Whether the scorer and recommender are skipped for a lead the
+            validator's model finds invalid (stop_invalid_lead)
+        dedup: Whether near-duplicates of leads scored recently reuse their
+            score (dedup.py)
+    """
+    sub_agents = []
+    for agent in root_agent.sub_agents:
+        update = {}
+        if agent.name == lead_validator_agent.name:
+            update["before_agent_callback"] = check_lead_rules if rules else None
+            update["after_agent_callback"] = stop_invalid_lead if skip else None
+        elif not dedup:
+            update["before_agent_callback"] = None
+            update["after_agent_callback"] = None
+        sub_agents.append(with_model(agent, llm, **update))
+    return type(root_agent)(
+        name=root_agent.name,
+        sub_agents=sub_agents,
+        description=root_agent.description,
+    )
@@ -0,0 +1,118 @@
+"""
+Validation Gate Simulation
+
+Qualifies --leads synthetic leads of mixed quality (scripted_llm.make_lead)
+three times and compares the cost per lead:
+
+- full: every lead goes through the validator, scorer and recommender, as
+  before the gate,
+- skip: the scorer and recommender are skipped for leads the validator's
+  model finds invalid (stop_invalid_lead),
+- rules+skip: leads that break a rule in lead_qualification_agent/rules.py
+  are also marked invalid without calling the validator's model.
+
+It reports model calls, tokens and latency per lead, and how often the
+rules and the model disagree on whether a lead is invalid. The
+near-duplicate index is left out, so every valid lead is scored. The model
+is scripted_llm.ScriptedLeadLlm, answering after --latency seconds, so no
+provider is called.
+
+Usage:
+    python simulate_validation_gate.py [--leads 1000] [--concurrency 50]
+                                       [--latency 0.2] [--seed 0]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import time
+
+from google.adk.runners import InMemoryRunner
+
+from batch_leads import lead_message, qualify
+from scripted_llm import ScriptedLeadLlm, make_lead, scripted_pipeline
+
+VARIANTS = {
+    "full": {"rules": False, "skip": False},
+    "skip": {"rules": False, "skip": True},
+    "rules+skip": {"rules": True, "skip": True},
+}
+
+
+def is_invalid(record):
+    return record["validation_status"].lower().startswith("invalid")
+
+
+async def run_variant(args, leads, rules, skip):
+    llm = ScriptedLeadLlm(seed=args.seed, latency=args.latency)
+    runner = InMemoryRunner(
+        agent=scripted_pipeline(llm, rules=rules, skip=skip, dedup=False),
+        app_name="validation_gate",
+    )
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def run(lead):
+        async with semaphore:
+            return await qualify(runner, lead["id"], lead_message(lead, "id"))
+
+    started = time.perf_counter()
+    # The gate prints a line per lead it stops
+    with contextlib.redirect_stdout(io.StringIO()):
+        records = await asyncio.gather(*(run(lead) for lead in leads))
+    return records, time.perf_counter() - started
+
+
+def summarize(label, records, wall_seconds):
+    def mean(key):
+        return statistics.mean(record[key] for record in records)
+
+    print(
+        f"{label:<11} model calls={mean('model_calls'):4.2f}  "
+        f"tokens={mean('tokens'):4.0f}  latency={mean('seconds'):5.3f}s  "
+        f"throughput={len(records) / wall_seconds:6.1f} leads/s  "
+        f"invalid={sum(map(is_invalid, records)) / len(records):5.1%}"
+    )
+
+
+async def main_async(args):
+    leads = [make_lead(i, args.seed) for i in range(args.leads)]
+    print(f"=== {args.leads} leads, model latency {args.latency}s ===")
+    results = {}
+    for label, options in VARIANTS.items():
+        records, wall_seconds = await run_variant(args, leads, **options)
+        failed = [record for record in records if record["status"] != "ok"]
+        if failed:
+            raise RuntimeError(f"{label}: {failed[0]['error']}")
+        summarize(label, records, wall_seconds)
+        results[label] = records
+
+    full, gated = results["full"], results["rules+skip"]
+    baseline = statistics.mean(record["model_calls"] for record in full)
+    calls = statistics.mean(record["model_calls"] for record in gated)
+    tokens = [statistics.mean(r["tokens"] for r in run) for run in (full, gated)]
+    print(
+        f"\nrules+skip vs full: model calls {1 - calls / baseline:.0%} fewer, "
+        f"tokens {1 - tokens[1] / tokens[0]:.0%} fewer"
+    )
+    # The rules only answer for leads they find invalid
+    rules_only = sum(is_invalid(g) and not is_invalid(f) for f, g in zip(full, gated))
+    model_only = sum(is_invalid(f) and not is_invalid(g) for f, g in zip(full, gated))
+    print(
+        f"invalid by the rules but valid to the model: {rules_only}; "
+        f"invalid to the model but passed by the rules: {model_only}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--leads", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
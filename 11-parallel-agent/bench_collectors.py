@@ -0,0 +1,164 @@
+"""
+Collector Agent Benchmark
+
+Compares the system monitor pipeline with LLM-based information agents
+against the deterministic collector agents, reporting end-to-end latency and
+the number of model calls per run.
+
+By default a scripted stub model with a fixed latency stands in for Gemini,
+so no API key is needed. Pass --live to use the configured Gemini model.
+
+Usage:
+    python bench_collectors.py [--runs 3] [--stub-latency 0.8] [--live]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from dotenv import load_dotenv
+from google.adk.agents import LlmAgent, ParallelAgent, SequentialAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from system_monitor_agent.agent import root_agent
+from system_monitor_agent.collector import MetricsCollectorAgent
+from system_monitor_agent.subagents.cpu_info_agent import cpu_info_llm_agent
+from system_monitor_agent.subagents.disk_info_agent import disk_info_llm_agent
+from system_monitor_agent.subagents.memory_info_agent import memory_info_llm_agent
+from system_monitor_agent.subagents.network_info_agent.agent import (
+    render_network_info,
+)
+from system_monitor_agent.subagents.network_info_agent.tools import get_network_info
+from system_monitor_agent.subagents.process_info_agent.agent import (
+    render_process_info,
+)
+from system_monitor_agent.subagents.process_info_agent.tools import get_process_info
+from system_monitor_agent.subagents.synthesizer_agent import system_report_synthesizer
+
+load_dotenv()
+
+
+class ScriptedStubLlm(BaseLlm):
+    """Calls the agent's first tool once, then answers with canned text."""
+
+    model: str = "scripted-stub"
+    latency: float = 0.8
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream=False):
+        await asyncio.sleep(self.latency)
+        last_parts = llm_request.contents[-1].parts if llm_request.contents else []
+        answered = any(part.function_response for part in last_parts or [])
+        if llm_request.tools_dict and not answered:
+            tool_name = next(iter(llm_request.tools_dict))
+            part = types.Part(function_call=types.FunctionCall(name=tool_name, args={}))
+        else:
+            part = types.Part(text="Stub report section.")
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=500, candidates_token_count=100
+            ),
+        )
+
+
+def build_llm_pipeline():
+    """The original pipeline: three LlmAgents gather, one synthesizes."""
+    # The process and network sections have no LLM variant; both pipelines
+    # use the collectors
+    process_info_agent = MetricsCollectorAgent(
+        name="ProcessInfoAgent",
+        tool=get_process_info,
+        renderer=render_process_info,
+        output_key="process_info",
+    )
+    network_info_agent = MetricsCollectorAgent(
+        name="NetworkInfoAgent",
+        tool=get_network_info,
+        renderer=render_network_info,
+        output_key="network_info",
+    )
+    synthesizer = LlmAgent(
+        name="SystemReportSynthesizer",
+        model=system_report_synthesizer.model,
+        instruction=system_report_synthesizer.instruction,
+    )
+    gatherer = ParallelAgent(
+        name="system_info_gatherer",
+        sub_agents=[
+            cpu_info_llm_agent,
+            memory_info_llm_agent,
+            disk_info_llm_agent,
+            network_info_agent,
+            process_info_agent,
+        ],
+    )
+    return SequentialAgent(
+        name="system_monitor_agent", sub_agents=[gatherer, synthesizer]
+    )
+
+
+def use_model(agent, model):
+    if isinstance(agent, LlmAgent):
+        agent.model = model
+    for sub_agent in agent.sub_agents:
+        use_model(sub_agent, model)
+
+
+async def run_once(runner):
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id="bench"
+    )
+    message = types.Content(
+        role="user", parts=[types.Part(text="Check my system health")]
+    )
+    model_calls = 0
+    gathered_at = None
+    started = time.perf_counter()
+    async for event in runner.run_async(
+        user_id="bench", session_id=session.id, new_message=message
+    ):
+        if event.usage_metadata is not None:
+            model_calls += 1
+        if event.author != "SystemReportSynthesizer":
+            gathered_at = time.perf_counter()
+    finished = time.perf_counter()
+    return finished - started, (gathered_at or finished) - started, model_calls
+
+
+async def bench(label, agent, runs):
+    runner = InMemoryRunner(agent=agent, app_name="bench")
+    results = [await run_once(runner) for _ in range(runs)]
+    total = statistics.median(r[0] for r in results)
+    gather = statistics.median(r[1] for r in results)
+    calls = statistics.mean(r[2] for r in results)
+    print(
+        f"{label:<22} end-to-end={total * 1e3:8.1f}ms  "
+        f"gather={gather * 1e3:8.1f}ms  model calls={calls:.1f}"
+    )
+
+
+async def main_async(args):
+    llm_pipeline = build_llm_pipeline()
+    if not args.live:
+        stub = ScriptedStubLlm(latency=args.stub_latency)
+        use_model(llm_pipeline, stub)
+        use_model(root_agent, stub)
+
+    print(f"=== System monitor pipeline ({args.runs} runs, median) ===")
+    await bench("LLM info agents", llm_pipeline, args.runs)
+    await bench("Collector agents", root_agent, args.runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--stub-latency", type=float, default=0.8)
+    parser.add_argument("--live", action="store_true", help="use the Gemini model")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
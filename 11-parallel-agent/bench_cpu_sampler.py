@@ -0,0 +1,89 @@
+"""
+CPU Sampler Benchmark
+
+Measures the cost of the background CPU sampler: startup and shutdown time,
+CPU time per sample, overall process overhead at several sampling rates, and
+the latency of get_cpu_info once the sampler is warm.
+
+Usage:
+    python bench_cpu_sampler.py [--seconds 5] [--calls 10000]
+"""
+
+import argparse
+import statistics
+import time
+
+import psutil
+
+from system_monitor_agent.subagents.cpu_info_agent.sampler import CpuSampler
+from system_monitor_agent.subagents.cpu_info_agent.tools import get_cpu_info
+
+
+def bench_lifecycle(interval):
+    sampler = CpuSampler(interval=interval)
+
+    started = time.perf_counter()
+    sampler.start(wait_for_first_sample=False)
+    start_cost = time.perf_counter() - started
+
+    sampler._first_sample.wait()
+    first_sample = time.perf_counter() - started
+
+    started = time.perf_counter()
+    sampler.stop()
+    stop_cost = time.perf_counter() - started
+    return start_cost, first_sample, stop_cost
+
+
+def bench_overhead(interval, seconds):
+    process = psutil.Process()
+    sampler = CpuSampler(interval=interval)
+    before = process.cpu_times()
+    sampler.start()
+    time.sleep(seconds)
+    sampler.stop()
+    after = process.cpu_times()
+    process_cpu = (after.user + after.system) - (before.user + before.system)
+    per_sample = sampler.sampling_seconds / max(sampler.samples_taken, 1)
+    return sampler.samples_taken, per_sample, process_cpu / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--calls", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print("=== Startup / shutdown ===")
+    for interval in (0.1, 0.25, 1.0):
+        start_cost, first_sample, stop_cost = bench_lifecycle(interval)
+        print(
+            f"interval={interval:>5}s  start={start_cost * 1e3:.2f}ms  "
+            f"first sample={first_sample * 1e3:.1f}ms  stop={stop_cost * 1e3:.2f}ms"
+        )
+
+    print("\n=== Sampling cost ===")
+    for interval in (0.1, 0.25, 1.0):
+        samples, per_sample, overhead = bench_overhead(interval, args.seconds)
+        print(
+            f"interval={interval:>5}s  samples={samples:>4}  "
+            f"cpu/sample={per_sample * 1e6:.0f}us  process cpu={overhead:.2%}"
+        )
+
+    print("\n=== get_cpu_info latency (warm sampler) ===")
+    get_cpu_info()
+    latencies = []
+    for _ in range(args.calls):
+        started = time.perf_counter()
+        get_cpu_info()
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    print(
+        f"calls={args.calls}  median={statistics.median(latencies) * 1e6:.1f}us  "
+        f"p99={latencies[int(len(latencies) * 0.99)] * 1e6:.1f}us"
+    )
+    print(f"cores={psutil.cpu_count(logical=True)} (previous implementation: ~2s/call)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Metrics History Benchmark
+
+Fills a MetricsHistory with 30 days of synthetic 1 Hz samples and measures
+memory footprint, append cost, and percentile, moving-average, slope and
+summary query latency over several windows, in memory and memory-mapped.
+
+Usage:
+    python bench_metrics_history.py [--days 30] [--cores 16] [--partitions 8]
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from system_monitor_agent.metrics_history import MetricsHistory
+
+WINDOWS = {"1h": 3600, "24h": 86400, "7d": 7 * 86400, "30d": 30 * 86400}
+
+
+def synthetic_data(seconds, cores, partitions, seed=0):
+    rng = np.random.default_rng(seed)
+    timestamps = time.time() - seconds + np.arange(seconds, dtype=np.float64)
+    daily = 20 * np.sin(2 * np.pi * np.arange(seconds) / 86400)[:, None]
+    cpu = np.clip(40 + daily + rng.normal(0, 10, (seconds, cores)), 0, 100)
+    memory = np.clip(
+        50 + np.linspace(0, 20, seconds) + rng.normal(0, 2, seconds), 0, 100
+    )
+    swap = np.clip(rng.normal(5, 1, seconds), 0, 100)
+    disk = 30 + np.linspace(0, 10, seconds)[:, None] + np.zeros((1, partitions))
+    return (
+        timestamps,
+        cpu.astype(np.float32),
+        memory.astype(np.float32),
+        swap.astype(np.float32),
+        disk.astype(np.float32),
+    )
+
+
+def timed(func, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def bench_queries(history):
+    for label, seconds in WINDOWS.items():
+        results = {
+            "p50/p95/p99": timed(
+                lambda: history.percentile("cpu", seconds, [50, 95, 99])
+            ),
+            "moving avg": timed(lambda: history.moving_average("memory", seconds, 300)),
+            "slope": timed(lambda: history.slope("disk", seconds)),
+            "summary": timed(lambda: history.summarize(seconds), repeat=3),
+        }
+        print(
+            f"  {label:>4}: "
+            + "  ".join(f"{name}={t * 1e3:7.2f}ms" for name, t in results.items())
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--cores", type=int, default=16)
+    parser.add_argument("--partitions", type=int, default=8)
+    args = parser.parse_args()
+
+    seconds = args.days * 86400
+    partitions = [f"/mnt/disk{i}" for i in range(args.partitions)]
+    print(f"Generating {seconds:,} samples ({args.days} days at 1 Hz)...")
+    data = synthetic_data(seconds, args.cores, args.partitions)
+
+    history = MetricsHistory(seconds, args.cores, partitions)
+    print(f"\n=== In memory ({history.nbytes / 2**20:.0f} MiB) ===")
+    started = time.perf_counter()
+    history.extend(*data)
+    print(f"  bulk load: {time.perf_counter() - started:.2f}s")
+
+    appends = 100_000
+    row = [column[-1] for column in data]
+    started = time.perf_counter()
+    for i in range(appends):
+        history.append(data[0][-1] + i + 1, row[1], row[2], row[3], row[4])
+    print(f"  append: {(time.perf_counter() - started) / appends * 1e6:.2f}us/sample")
+    bench_queries(history)
+
+    with tempfile.TemporaryDirectory() as path:
+        mapped = MetricsHistory(seconds, args.cores, partitions, path=path)
+        mapped.extend(*data)
+        print("\n=== Memory-mapped ===")
+        print(f"  flush: {timed(mapped.flush, repeat=1) * 1e3:.1f}ms")
+        del mapped
+
+        started = time.perf_counter()
+        reopened = MetricsHistory(seconds, args.cores, partitions, path=path)
+        print(
+            f"  reopen: {(time.perf_counter() - started) * 1e3:.2f}ms, samples={len(reopened):,}"
+        )
+        bench_queries(reopened)
+
+
+if __name__ == "__main__":
+    main()
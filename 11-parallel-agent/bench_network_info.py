@@ -0,0 +1,127 @@
+"""
+Network Collector Benchmark
+
+Measures get_network_info on this host and on synthetic hosts with many
+virtual interfaces (the counter and metadata reads are replaced by
+generated tables of --interfaces sizes, with traffic, errors and drops on a
+few of them):
+
+- call latency with cached interface metadata, and the cost of one
+  metadata refresh (one psutil.net_if_stats() call on this host),
+- the rendered network section's size, which only lists the top N
+  interfaces however many there are.
+
+Usage:
+    python bench_network_info.py [--interfaces 10 100 500 2000] [--calls 200]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from system_monitor_agent.subagents.network_info_agent import counters
+from system_monitor_agent.subagents.network_info_agent.agent import (
+    render_network_info,
+)
+from system_monitor_agent.subagents.network_info_agent.tools import get_network_info
+
+
+def synthetic_host(interface_count, snapshots, rng):
+    """
+    Counter and metadata readers for a host with veth-style interfaces.
+
+    The counter snapshots are generated up front, so only the tool is timed.
+    """
+    names = ["eth0", "lo"] + [f"veth{i:05x}" for i in range(interface_count - 2)]
+    busy = set(rng.sample(names, min(10, len(names))))
+    erroring = set(rng.sample(names, min(3, len(names))))
+    totals = {name: [0] * 6 for name in names}
+    generated = []
+    for _ in range(snapshots):
+        for name in busy:
+            values = totals[name]
+            values[0] += rng.randint(10**5, 10**7)
+            values[1] += rng.randint(10**5, 10**7)
+            values[2] += rng.randint(100, 10000)
+            values[3] += rng.randint(100, 10000)
+        for name in erroring:
+            totals[name][4] += rng.randint(1, 20)
+            totals[name][5] += rng.randint(1, 20)
+        generated.append({name: tuple(values) for name, values in totals.items()})
+    snapshot_iter = iter(generated)
+
+    def read_counters():
+        return next(snapshot_iter)
+
+    def read_metadata():
+        return {
+            name: counters.InterfaceInfo(
+                is_up=True,
+                speed_mbps=10000 if name == "eth0" else 0,
+                loopback=name == "lo",
+                virtual=name.startswith("veth"),
+            )
+            for name in names
+        }
+
+    return read_counters, read_metadata
+
+
+def time_calls(calls, clock):
+    timings = []
+    for _ in range(calls):
+        clock[0] += 1.0  # One second between calls, so every call is a delta
+        started = time.perf_counter()
+        data = get_network_info()
+        timings.append((time.perf_counter() - started) * 1e3)
+    return timings, data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--interfaces", type=int, nargs="+", default=[10, 100, 500, 2000]
+    )
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counters._read_metadata()
+    refresh = (time.perf_counter() - started) * 1e3
+    print("=== This host ===")
+    get_network_info()
+    time.sleep(counters.MIN_WINDOW_SECONDS)
+    timings = []
+    for _ in range(args.calls):
+        started = time.perf_counter()
+        get_network_info()
+        timings.append((time.perf_counter() - started) * 1e3)
+    print(
+        f"get_network_info median={statistics.median(timings):.3f}ms  "
+        f"metadata refresh={refresh:.3f}ms"
+    )
+
+    print("\n=== Synthetic hosts (metadata cached, refreshed every 60s) ===")
+    rng = random.Random(args.seed)
+    for count in args.interfaces:
+        read_counters, read_metadata = synthetic_host(count, args.calls + 1, rng)
+        clock = [0.0]
+        counters._counters = counters.NetworkCounters(
+            read_counters=read_counters,
+            read_metadata=read_metadata,
+            clock=lambda: clock[0],
+        )
+        get_network_info()  # Baseline
+        timings, data = time_calls(args.calls, clock)
+        section = render_network_info(data)
+        print(
+            f"{count:5d} interfaces  median={statistics.median(timings):7.3f}ms  "
+            f"max={max(timings):7.3f}ms  section={len(section):4d} chars  "
+            f"errors on {data['stats']['interfaces_with_errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Parallel Gather Benchmark
+
+Runs the CPU, memory and disk tools the way the ParallelAgent schedules them,
+once calling the synchronous functions on the event loop and once through the
+blocking-tool thread pool, and compares the gather's wall time with the
+slowest single tool.
+
+Real tool latency depends on the host, so each tool can be given extra
+blocking latency (a sleep standing in for slow syscalls) with --latency.
+
+Usage:
+    python bench_parallel_gather.py [--rounds 5] [--latency 0.2 0.1 0.5]
+"""
+
+import argparse
+import asyncio
+import functools
+import statistics
+import time
+
+from system_monitor_agent.subagents.cpu_info_agent.tools import get_cpu_info
+from system_monitor_agent.subagents.disk_info_agent.tools import get_disk_info
+from system_monitor_agent.subagents.memory_info_agent.tools import get_memory_info
+from system_monitor_agent.tool_executor import blocking_tool
+
+
+def with_latency(func, seconds):
+    @functools.wraps(func)
+    def slow_tool():
+        time.sleep(seconds)
+        return func()
+
+    return slow_tool
+
+
+async def gather_on_event_loop(tools):
+    async def call(tool):
+        return tool()
+
+    return await asyncio.gather(*(call(tool) for tool in tools))
+
+
+async def gather_in_thread_pool(tools):
+    return await asyncio.gather(*(blocking_tool(tool)() for tool in tools))
+
+
+async def timed(coroutine_factory, rounds):
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await coroutine_factory()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+async def main_async(args):
+    tools = [
+        with_latency(tool, latency)
+        for tool, latency in zip(
+            (get_cpu_info, get_memory_info, get_disk_info), args.latency
+        )
+    ]
+    # Warm up the CPU sampler and psutil caches
+    for tool in (get_cpu_info, get_memory_info, get_disk_info):
+        tool()
+
+    print("=== Single tool wall time (median) ===")
+    singles = []
+    for tool in tools:
+        elapsed = await timed(lambda: gather_on_event_loop([tool]), args.rounds)
+        singles.append(elapsed)
+        print(f"{tool.__name__:<16} {elapsed * 1e3:8.1f}ms")
+
+    on_loop = await timed(lambda: gather_on_event_loop(tools), args.rounds)
+    offloaded = await timed(lambda: gather_in_thread_pool(tools), args.rounds)
+    print("\n=== Gather of all three tools (median) ===")
+    print(f"on event loop    {on_loop * 1e3:8.1f}ms")
+    print(f"thread pool      {offloaded * 1e3:8.1f}ms")
+    print(f"slowest tool     {max(singles) * 1e3:8.1f}ms")
+    print(f"sum of tools     {sum(singles) * 1e3:8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        nargs=3,
+        default=[0.2, 0.1, 0.5],
+        metavar=("CPU", "MEMORY", "DISK"),
+        help="extra blocking seconds added to each tool",
+    )
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Metric Payload Token Benchmark
+
+Compares the CPU tool payload in the previous string format ("Core 3: 12.4%"
+per core, with the numbers repeated under "stats") against the compact
+numeric payload, on simulated machines with 8, 64 and 256 cores. It counts
+the tokens of the JSON an LLM-based agent receives as the tool response, and
+of the CPU section the synthesizer prompt renders.
+
+Token counts use the Gemini local tokenizer when it is available
+(google-genai with sentencepiece); otherwise they are estimated by counting
+digits and punctuation as one token each and words as one token per four
+letters, which is close to how the Gemini tokenizer splits numbers.
+
+Usage:
+    python bench_payload_tokens.py [--cores 8 64 256] [--busy 0.15]
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+
+from system_monitor_agent.subagents.cpu_info_agent.agent import render_cpu_info
+from system_monitor_agent.subagents.cpu_info_agent.tools import build_cpu_info
+
+TOKEN_PATTERN = re.compile(r"\d|[A-Za-z]+|[^\w\s]")
+
+
+def make_token_counter():
+    try:
+        from google.genai.local_tokenizer import LocalTokenizer
+
+        tokenizer = LocalTokenizer(model_name="gemini-2.0-flash")
+        tokenizer.count_tokens("warm up")
+        return (
+            "gemini tokenizer",
+            lambda text: tokenizer.count_tokens(text).total_tokens,
+        )
+    except Exception:
+        return "estimated", estimate_tokens
+
+
+def estimate_tokens(text):
+    return sum(
+        math.ceil(len(piece) / 4) if piece.isalpha() else 1
+        for piece in TOKEN_PATTERN.findall(text)
+    )
+
+
+def simulated_snapshot(cores, busy, seed=0):
+    """A mostly idle machine with a fraction of busy and saturated cores."""
+    rng = random.Random(seed)
+    per_core = []
+    for _ in range(cores):
+        roll = rng.random()
+        if roll < busy / 2:
+            per_core.append(100.0)
+        elif roll < busy:
+            per_core.append(rng.uniform(30, 90))
+        else:
+            per_core.append(rng.uniform(0, 3))
+    current = sum(per_core) / cores
+    return {
+        "timestamp": 0.0,
+        "current": current,
+        "per_core": per_core,
+        "averages": {1: current, 5: current * 0.97, 15: current * 0.95},
+        "peaks": {1: current, 5: current * 1.05, 15: current * 1.1},
+    }
+
+
+def legacy_cpu_response(snapshot, cores):
+    """The CPU tool response in the previous preformatted-string format."""
+    averages, peaks = snapshot["averages"], snapshot["peaks"]
+    return {
+        "result": {
+            "physical_cores": cores // 2,
+            "logical_cores": cores,
+            "cpu_usage_per_core": [
+                f"Core {i}: {percentage:.1f}%"
+                for i, percentage in enumerate(snapshot["per_core"])
+            ],
+            "avg_cpu_usage": f"{averages[1]:.1f}%",
+            "avg_cpu_usage_5s": f"{averages[5]:.1f}%",
+            "avg_cpu_usage_15s": f"{averages[15]:.1f}%",
+            "peak_cpu_usage_15s": f"{peaks[15]:.1f}%",
+        },
+        "stats": {
+            "physical_cores": cores // 2,
+            "logical_cores": cores,
+            "current_usage_percentage": snapshot["current"],
+            "avg_usage_percentage": averages[1],
+            "avg_usage_percentage_5s": averages[5],
+            "avg_usage_percentage_15s": averages[15],
+            "peak_usage_percentage_1s": peaks[1],
+            "peak_usage_percentage_5s": peaks[5],
+            "peak_usage_percentage_15s": peaks[15],
+            "high_usage_alert": False,
+        },
+        "additional_info": {
+            "data_format": "dictionary",
+            "collection_timestamp": 1700000000.0,
+            "sample_timestamp": 1700000000.0,
+            "performance_concern": None,
+        },
+    }
+
+
+def compact_cpu_response(snapshot, cores):
+    """The CPU tool response as get_cpu_info now returns it."""
+    return {
+        "result": build_cpu_info(snapshot, cores // 2, cores),
+        "stats": {"high_usage_alert": False},
+        "additional_info": {
+            "data_format": "compact_numeric",
+            "collection_timestamp": 1700000000.0,
+            "sample_timestamp": 1700000000.0,
+            "performance_concern": None,
+        },
+    }
+
+
+def legacy_cpu_section(response):
+    """The CPU section as the renderer wrote it with string payloads."""
+    result = response["result"]
+    return "\n".join(
+        [
+            "## CPU",
+            f"- Cores: {result['physical_cores']} physical, "
+            f"{result['logical_cores']} logical",
+            f"- Usage: {result['avg_cpu_usage']} (1s avg), "
+            f"{result['avg_cpu_usage_5s']} (5s avg), "
+            f"{result['avg_cpu_usage_15s']} (15s avg), "
+            f"{result['peak_cpu_usage_15s']} (15s peak)",
+            f"- Per core: {', '.join(result['cpu_usage_per_core'])}",
+            "- Concern: none (usage below 80%)",
+        ]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cores", type=int, nargs="+", default=[8, 64, 256])
+    parser.add_argument(
+        "--busy", type=float, default=0.15, help="fraction of non-idle cores"
+    )
+    args = parser.parse_args()
+
+    method, count_tokens = make_token_counter()
+    print(f"=== CPU payload tokens ({method}) ===")
+    print(
+        f"{'cores':>5}  {'tool json':>9} {'compact':>8} {'saving':>7}  "
+        f"{'section':>8} {'compact':>8} {'saving':>7}"
+    )
+    for cores in args.cores:
+        snapshot = simulated_snapshot(cores, args.busy)
+        legacy = legacy_cpu_response(snapshot, cores)
+        compact = compact_cpu_response(snapshot, cores)
+
+        legacy_json = count_tokens(json.dumps(legacy))
+        compact_json = count_tokens(json.dumps(compact))
+        legacy_section = count_tokens(legacy_cpu_section(legacy))
+        compact_section = count_tokens(render_cpu_info(compact))
+        print(
+            f"{cores:>5}  {legacy_json:>9,} {compact_json:>8,} "
+            f"{1 - compact_json / legacy_json:>7.0%}  "
+            f"{legacy_section:>8,} {compact_section:>8,} "
+            f"{1 - compact_section / legacy_section:>7.0%}"
+        )
+
+    cores = args.cores[-1]
+    print(f"\n=== Compact CPU section, {cores} cores ===")
+    print(
+        render_cpu_info(
+            compact_cpu_response(simulated_snapshot(cores, args.busy), cores)
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
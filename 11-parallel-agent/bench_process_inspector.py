@@ -0,0 +1,122 @@
+"""
+Process Inspector Benchmark
+
+Fills the process table with idle `sleep` processes up to --processes, then
+measures:
+
+- a full psutil.process_iter scan with top-N selection, which is what the
+  tool would cost if it scanned on every call,
+- the background inspector's scan and the interval it backs off to, and
+- get_process_info latency, idle and while a scan is running on the
+  inspector thread, against the 50 ms budget.
+
+Usage:
+    python bench_process_inspector.py [--processes 10000] [--calls 500]
+"""
+
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import threading
+import time
+
+import psutil
+
+from system_monitor_agent.subagents.process_info_agent import inspector
+from system_monitor_agent.subagents.process_info_agent.tools import get_process_info
+
+BUDGET_MS = 50.0
+
+
+def fill_process_table(target):
+    """Start idle processes until about `target` processes exist."""
+    missing = max(0, target - len(psutil.pids()))
+    if not missing:
+        return None
+    # One shell forks them all, which is much faster than one Popen each
+    group = subprocess.Popen(
+        ["sh", "-c", f"for i in $(seq {missing}); do sleep 3600 & done; wait"],
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + 120
+    while len(psutil.pids()) < target and time.monotonic() < deadline:
+        time.sleep(0.5)
+    return group
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def time_calls(calls, top_n):
+    timings = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        get_process_info(top_n)
+        timings.append((time.perf_counter() - started) * 1e3)
+    return timings
+
+
+def report(label, timings):
+    worst = max(timings)
+    verdict = "ok" if percentile(timings, 0.99) < BUDGET_MS else "OVER BUDGET"
+    print(
+        f"{label:<22} median={statistics.median(timings):8.3f}ms "
+        f"p99={percentile(timings, 0.99):8.3f}ms max={worst:8.3f}ms  {verdict}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--processes", type=int, default=10000)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--top-n", type=int, default=5)
+    args = parser.parse_args()
+
+    group = fill_process_table(args.processes)
+    try:
+        count = len(psutil.pids())
+        print(f"=== {count:,} processes ===")
+
+        started = time.perf_counter()
+        list(psutil.process_iter(inspector.PROCESS_ATTRS, ad_value=None))
+        naive = time.perf_counter() - started
+        print(f"full scan per call     {naive * 1e3:8.1f}ms")
+
+        # A long interval keeps the inspector thread idle; scans are run here
+        process_inspector = inspector.ProcessInspector(interval=3600)
+        process_inspector.start()
+        inspector._inspector = process_inspector
+        process_inspector.scan()
+        scan = process_inspector.last_scan_seconds
+        interval = max(inspector.SCAN_INTERVAL_SECONDS, scan / inspector.MAX_SCAN_DUTY)
+        print(f"background scan        {scan * 1e3:8.1f}ms, every {interval:.1f}s")
+        print()
+
+        report("get_process_info idle", time_calls(args.calls, args.top_n))
+
+        # Keep a scan running on another thread while the tool is called
+        stop = threading.Event()
+
+        def scan_continuously():
+            while not stop.is_set():
+                process_inspector.scan()
+
+        scanner = threading.Thread(target=scan_continuously, daemon=True)
+        scanner.start()
+        try:
+            report("get_process_info busy", time_calls(args.calls, args.top_n))
+        finally:
+            stop.set()
+            scanner.join()
+    finally:
+        if group is not None:
+            os.killpg(group.pid, signal.SIGKILL)
+            group.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Shared Metrics Benchmark
+
+Runs --readers monitor sessions as forked processes, each calling the CPU,
+memory and disk tools every --call-interval seconds, in two modes:
+
+- local: every session polls psutil itself (its own CPU sampler thread plus
+  the memory and disk calls), and
+- shared: one metrics_publisher.py loop polls psutil and every session
+  reads the shared-memory segment.
+
+For each reader count it reports the host overhead over --seconds of steady
+state, summed over all processes (publisher included): CPU time as a share
+of one core, and read syscalls per second (mostly /proc and /sys reads).
+It also times a single read of the segment.
+
+Usage:
+    python bench_shared_metrics.py [--readers 1 10 50 100] [--seconds 10]
+"""
+
+import argparse
+import gc
+import os
+import signal
+import statistics
+import threading
+import time
+
+import psutil
+
+import metrics_publisher
+from system_monitor_agent import shared_metrics
+from system_monitor_agent.subagents.cpu_info_agent.tools import get_cpu_info
+from system_monitor_agent.subagents.disk_info_agent.tools import get_disk_info
+from system_monitor_agent.subagents.memory_info_agent.tools import get_memory_info
+
+WARMUP_SECONDS = 3.0
+
+
+def run_session(mode, path, call_interval):
+    """A forked session: call the tools until killed."""
+    if mode == "shared":
+        os.environ[shared_metrics.SHARED_METRICS_ENV] = path
+    while True:
+        for tool in (get_cpu_info, get_memory_info, get_disk_info):
+            result = tool()
+            if mode == "shared" and result["additional_info"].get("source") is None:
+                os._exit(1)  # Fell back to psutil
+        time.sleep(call_interval)
+
+
+def run_publisher(path, interval):
+    metrics_publisher.publish(path, interval, threading.Event())
+
+
+def fork(target, *args):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            target(*args)
+        finally:
+            os._exit(0)
+    return pid
+
+
+def totals(processes):
+    """Summed CPU seconds and read syscalls of the live processes."""
+    cpu = reads = 0.0
+    for process in processes:
+        try:
+            with process.oneshot():
+                times = process.cpu_times()
+                cpu += times.user + times.system
+                reads += process.io_counters().read_count
+        except psutil.NoSuchProcess:
+            pass
+    return cpu, reads
+
+
+def measure(mode, readers, path, args):
+    pids = []
+    if mode == "shared":
+        pids.append(fork(run_publisher, path, args.publish_interval))
+        time.sleep(1.0)  # First frame
+    pids += [fork(run_session, mode, path, args.call_interval) for _ in range(readers)]
+    processes = [psutil.Process(pid) for pid in pids]
+    try:
+        time.sleep(WARMUP_SECONDS)
+        cpu_before, reads_before = totals(processes)
+        started = time.monotonic()
+        time.sleep(args.seconds)
+        cpu_after, reads_after = totals(processes)
+        elapsed = time.monotonic() - started
+    finally:
+        for pid in pids:
+            os.kill(pid, signal.SIGKILL)
+        failed = 0
+        for pid in pids:
+            _, status = os.waitpid(pid, 0)
+            failed += os.WIFEXITED(status) and os.WEXITSTATUS(status) != 0
+    return (
+        (cpu_after - cpu_before) / elapsed * 100,
+        (reads_after - reads_before) / elapsed,
+        failed,
+    )
+
+
+def time_reads(path, count):
+    writer = shared_metrics.SharedMetricsWriter(path)
+    os.environ.pop(shared_metrics.SHARED_METRICS_ENV, None)
+    writer.publish(metrics_publisher.collect_frame())
+    os.environ[shared_metrics.SHARED_METRICS_ENV] = path
+    timings = []
+    for _ in range(count):
+        started = time.perf_counter()
+        shared_metrics.read_shared_metrics("disk")
+        timings.append((time.perf_counter() - started) * 1e6)
+    os.environ.pop(shared_metrics.SHARED_METRICS_ENV)
+    writer.close()
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--readers", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--call-interval", type=float, default=1.0)
+    parser.add_argument("--publish-interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    # Children share the parent's pages; keep the collector from touching them
+    gc.freeze()
+    path = os.path.join(shared_metrics.SHM_DIR, f"bench_metrics_{os.getpid()}")
+    try:
+        print(f"=== Host overhead ({psutil.cpu_count()} cores, {args.seconds:g}s) ===")
+        print(f"{'readers':>7}  {'mode':<6} {'CPU % of a core':>16} {'reads/s':>10}")
+        for readers in args.readers:
+            for mode in ("local", "shared"):
+                cpu, reads, failed = measure(mode, readers, path, args)
+                note = f"  {failed} sessions fell back to psutil" if failed else ""
+                print(f"{readers:7d}  {mode:<6} {cpu:16.1f} {reads:10.0f}{note}")
+        print(f"\nsegment read (disk section): {time_reads(path, 10000):.1f}µs median")
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
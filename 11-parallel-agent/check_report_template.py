@@ -0,0 +1,275 @@
+"""
+Healthy Report Template Check
+
+Checks the templated healthy-system report against the synthesizer's LLM
+report:
+
+- structure: the template has the title and the REPORT_SECTIONS headings in
+  order, and embeds the collected sections verbatim,
+- sections: every template section is one the synthesizer instruction asks
+  for, and with --live, one that a Gemini-written report for the same
+  metrics also has,
+- gating: with real collected metrics and every concern flag forced on in
+  turn, the synthesizer answers from the template (no model call) only when
+  nothing is flagged, and
+- speed: the time to check the flags and render the report.
+
+Exits with status 1 if any check fails.
+
+Usage:
+    python check_report_template.py [--live] [--renders 10000]
+"""
+
+import argparse
+import asyncio
+import copy
+import re
+import sys
+import time
+
+from dotenv import load_dotenv
+from google.adk.agents import LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from system_monitor_agent.subagents.cpu_info_agent.agent import render_cpu_info
+from system_monitor_agent.subagents.cpu_info_agent.sampler import get_sampler
+from system_monitor_agent.subagents.cpu_info_agent.tools import get_cpu_info
+from system_monitor_agent.subagents.disk_info_agent.agent import render_disk_info
+from system_monitor_agent.subagents.disk_info_agent.tools import get_disk_info
+from system_monitor_agent.subagents.memory_info_agent.agent import (
+    render_memory_info,
+)
+from system_monitor_agent.subagents.memory_info_agent.tools import get_memory_info
+from system_monitor_agent.subagents.network_info_agent.agent import (
+    render_network_info,
+)
+from system_monitor_agent.subagents.network_info_agent.tools import get_network_info
+from system_monitor_agent.subagents.process_info_agent.agent import (
+    render_process_info,
+)
+from system_monitor_agent.subagents.process_info_agent.inspector import (
+    get_inspector,
+)
+from system_monitor_agent.subagents.process_info_agent.tools import get_process_info
+from system_monitor_agent.subagents.synthesizer_agent import (
+    system_report_synthesizer,
+)
+from system_monitor_agent.subagents.synthesizer_agent.healthy_report import (
+    COMPONENTS,
+    CONCERN_FLAGS,
+    REPORT_SECTIONS,
+    REPORT_TITLE,
+    find_concerns,
+    healthy_report_fast_path,
+    render_healthy_report,
+)
+
+load_dotenv()
+
+COLLECTORS = {
+    "cpu_data": (get_cpu_info, render_cpu_info),
+    "memory_data": (get_memory_info, render_memory_info),
+    "disk_data": (get_disk_info, render_disk_info),
+    "network_data": (get_network_info, render_network_info),
+    "process_data": (get_process_info, render_process_info),
+}
+CONCERN_NOTES = [
+    "performance_concern",
+    "swap_concern",
+    "high_usage_partitions",
+    "timed_out_partitions",
+    "unprobed_partitions",
+    "saturated_interfaces",
+]
+# Where the synthesizer instruction asks for each section
+INSTRUCTION_MARKERS = {
+    "Executive Summary": "executive summary",
+    "CPU": "{cpu_info}",
+    "Memory": "{memory_info}",
+    "Disk": "{disk_info}",
+    "Network": "{network_info}",
+    "Processes": "{process_info}",
+    "Recommendations": "recommendations",
+}
+
+
+class StubLlm(BaseLlm):
+    """Answers with a fixed report, so any model call can be counted."""
+
+    model: str = "stub"
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream=False):
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text="LLM report")]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=1000, candidates_token_count=300
+            ),
+        )
+
+
+class Checks:
+    def __init__(self):
+        self.failures = 0
+
+    def check(self, label, ok, detail=""):
+        self.failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {label}{f'  ({detail})' if detail else ''}")
+
+
+def collect_results():
+    """Run every metrics tool once, with all concern flags cleared."""
+    get_sampler()
+    get_inspector(wait_for_first_scan=True)
+    time.sleep(1.5)  # Let the CPU sampler fill its 1 second window
+    results = {}
+    for data_key, (tool, _) in COLLECTORS.items():
+        data = tool()
+        for flag in CONCERN_FLAGS[data_key]:
+            data["stats"][flag] = type(data["stats"][flag])()
+        # The notes the sections are rendered from, e.g. on a nearly full disk
+        info = data["additional_info"]
+        for note in CONCERN_NOTES:
+            if note in info:
+                info[note] = None
+        results[data_key] = data
+    return results
+
+
+def build_state(results):
+    state = {}
+    for section_key, data_key, _ in COMPONENTS:
+        state[section_key] = COLLECTORS[data_key][1](results[data_key])
+        state[data_key] = results[data_key]
+    return state
+
+
+def scenarios(results):
+    """(name, state, expect the template) per concern flag, plus failures."""
+    yield "healthy", build_state(results), True
+    for data_key, flags in CONCERN_FLAGS.items():
+        for flag in flags:
+            flagged = copy.deepcopy(results)
+            flagged[data_key]["stats"][flag] = 1
+            yield f"{data_key}.{flag}", build_state(flagged), False
+    failed = copy.deepcopy(results)
+    failed["cpu_data"] = {
+        "result": {"error": "Failed to gather CPU information: boom"},
+        "stats": {"success": False},
+        "additional_info": {"error_type": "RuntimeError"},
+    }
+    yield "cpu tool error", build_state(failed), False
+    # An LLM-based collector writes its section but no tool result
+    llm_collector = build_state(results)
+    del llm_collector["cpu_data"]
+    yield "cpu data missing (LLM collector)", llm_collector, False
+
+
+def headings(report):
+    return [match.strip() for match in re.findall(r"^#{2,3}\s+(.+)$", report, re.M)]
+
+
+def make_synthesizer(model, fast_path):
+    return LlmAgent(
+        name="SystemReportSynthesizer",
+        model=model,
+        instruction=system_report_synthesizer.instruction,
+        tools=system_report_synthesizer.tools,
+        before_model_callback=healthy_report_fast_path if fast_path else None,
+    )
+
+
+async def run_synthesizer(agent, state):
+    """Run the synthesizer on `state`; returns the report and its model calls."""
+    runner = InMemoryRunner(agent=agent, app_name="check_report_template")
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id="check", state=state
+    )
+    message = types.Content(
+        role="user", parts=[types.Part(text="Create the system health report.")]
+    )
+    report, model_calls = "", 0
+    async for event in runner.run_async(
+        user_id="check", session_id=session.id, new_message=message
+    ):
+        if event.usage_metadata is not None:
+            model_calls += 1
+        if event.is_final_response() and event.content and event.content.parts:
+            report = "".join(part.text or "" for part in event.content.parts)
+    return report, model_calls
+
+
+async def main_async(args):
+    checks = Checks()
+    results = collect_results()
+    state = build_state(results)
+    report = render_healthy_report(state)
+
+    print("=== Structure ===")
+    checks.check("title first", report.startswith(REPORT_TITLE + "\n"))
+    checks.check(
+        "sections in order",
+        headings(report) == REPORT_SECTIONS,
+        ", ".join(headings(report)),
+    )
+    for section_key, _, name in COMPONENTS:
+        checks.check(f"{name} section embedded verbatim", state[section_key] in report)
+
+    print("\n=== Sections against the LLM report ===")
+    instruction = system_report_synthesizer.instruction.lower()
+    for section in REPORT_SECTIONS:
+        checks.check(
+            f"instruction asks for {section}",
+            INSTRUCTION_MARKERS[section] in instruction,
+        )
+    if args.live:
+        llm_report, _ = await run_synthesizer(
+            make_synthesizer(system_report_synthesizer.model, fast_path=False), state
+        )
+        llm_headings = [heading.lower() for heading in headings(llm_report)]
+        print(f"LLM report headings: {', '.join(headings(llm_report))}")
+        for section in REPORT_SECTIONS:
+            checks.check(
+                f"LLM report has {section}",
+                any(section.lower() in heading for heading in llm_headings),
+            )
+
+    print("\n=== Gating (model calls per report) ===")
+    stub = StubLlm()
+    for name, scenario_state, expect_template in scenarios(results):
+        concerns = find_concerns(scenario_state)
+        text, model_calls = await run_synthesizer(
+            make_synthesizer(stub, fast_path=True), scenario_state
+        )
+        templated = model_calls == 0 and text.startswith(REPORT_TITLE)
+        checks.check(
+            f"{name:<45} {'template' if templated else 'LLM':<8} "
+            f"model calls={model_calls}",
+            templated == expect_template,
+            "; ".join(concerns),
+        )
+
+    print("\n=== Speed ===")
+    started = time.perf_counter()
+    for _ in range(args.renders):
+        if not find_concerns(state):
+            render_healthy_report(state)
+    per_report = (time.perf_counter() - started) / args.renders
+    print(f"flag check + render: {per_report * 1e6:.1f}µs per report")
+
+    print(
+        f"\n{'all checks passed' if not checks.failures else f'{checks.failures} failed'}"
+    )
+    return 1 if checks.failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--live", action="store_true", help="compare with Gemini")
+    parser.add_argument("--renders", type=int, default=10000)
+    sys.exit(asyncio.run(main_async(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Host Metrics Collector
+
+A lightweight per-host process for fleet mode. It samples CPU, memory and disk
+usage in a background thread and serves the latest snapshot over a small
+socket protocol, so a request never waits on psutil (or on a hung mount).
+
+Protocol: the client sends one JSON line, {"op": "metrics"}, and the collector
+answers with one JSON line holding a compact numeric snapshot:
+
+    {"host": "node-1", "timestamp": 1700000000.0,
+     "cpu": {"percent": 12.5, "cores": 8, "load_per_core": 0.4},
+     "memory": {"percent": 41.0, "swap_percent": 0.0, "total_gb": 31.2},
+     "disk": {"percent": 63.0, "max_partition_percent": 71.2,
+              "max_partition": "/var", "total_gb": 932.1, "timed_out": 0},
+     "age": 0.4}
+
+"age" is how many seconds ago the snapshot was taken, by the host's own
+clock. Disk usage is probed with the disk tool's deadline-bounded probe
+(system_monitor_agent/disk_probe.py), so a hung mount is counted under
+"timed_out" instead of freezing the CPU and memory samples.
+
+The collector only needs psutil; it does not import ADK or the agent package.
+With --synthetic it serves generated metrics instead, so many local collector
+processes can stand in for a fleet of hosts.
+
+Usage:
+    python host_collector.py [--bind 127.0.0.1] [--port 9450] [--name node-1]
+    python host_collector.py --port 0 --synthetic 7 [--delay 5] [--frozen-for 60]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+import psutil
+
+# --- Constants ---
+DEFAULT_PORT = 9450
+SAMPLE_INTERVAL_SECONDS = 1.0
+DISK_INTERVAL_SECONDS = 10.0
+MAX_REQUEST_BYTES = 1024
+
+
+def _load_disk_probe():
+    # Loaded by path: importing the agent package would pull in ADK
+    path = Path(__file__).with_name("system_monitor_agent") / "disk_probe.py"
+    spec = importlib.util.spec_from_file_location("disk_probe", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+disk_probe = _load_disk_probe()
+
+
+class HostSampler:
+    """Keeps the latest metrics snapshot fresh from a daemon thread."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._snapshot: Dict[str, Any] = {}
+        self._disk: Dict[str, Any] = {}
+        self._disk_sampled_at = 0.0
+        psutil.cpu_percent(interval=None)  # Prime the CPU counters
+
+    def start(self) -> None:
+        self._sample()
+        threading.Thread(target=self._run, name="host-sampler", daemon=True).start()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._snapshot
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(SAMPLE_INTERVAL_SECONDS)
+            self._sample()
+
+    def _sample(self) -> None:
+        cores = psutil.cpu_count(logical=True) or 1
+        memory = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        load_per_core = (
+            os.getloadavg()[0] / cores if hasattr(os, "getloadavg") else None
+        )
+        if time.monotonic() - self._disk_sampled_at >= DISK_INTERVAL_SECONDS:
+            self._disk = self._sample_disk()
+            self._disk_sampled_at = time.monotonic()
+
+        snapshot = {
+            "host": self.name,
+            "timestamp": time.time(),
+            "cpu": {
+                "percent": psutil.cpu_percent(interval=None),
+                "cores": cores,
+                "load_per_core": load_per_core,
+            },
+            "memory": {
+                "percent": memory.percent,
+                "swap_percent": swap.percent,
+                "total_gb": round(memory.total / (1024**3), 1),
+            },
+            "disk": self._disk,
+        }
+        with self._lock:
+            self._snapshot = snapshot
+
+    @staticmethod
+    def _sample_disk() -> Dict[str, Any]:
+        total = used = 0
+        max_percent, max_mountpoint = 0.0, None
+        usages, timed_out, unprobed = disk_probe.probe_usage(
+            [partition.mountpoint for partition in psutil.disk_partitions()]
+        )
+        for mountpoint, usage in usages.items():
+            total += usage.total
+            used += usage.used
+            if usage.percent > max_percent:
+                max_percent, max_mountpoint = usage.percent, mountpoint
+        return {
+            "percent": round(used / total * 100, 1) if total else 0.0,
+            "max_partition_percent": max_percent,
+            "max_partition": max_mountpoint,
+            "total_gb": round(total / (1024**3), 1),
+            "timed_out": len(timed_out) + len(unprobed),
+        }
+
+
+class SyntheticSampler:
+    """Serves generated metrics so local processes can stand in for hosts."""
+
+    def __init__(
+        self, name: str, seed: int, frozen_for: float = 0.0, hung_mounts: int = 0
+    ):
+        """
+        Args:
+            name: The host name to report
+            seed: Seeds the host's baseline and drift
+            frozen_for: If set, always serve the first snapshot, dated this
+                many seconds before it was taken, like a stuck sampler
+            hung_mounts: Disk mounts to report as timed out
+        """
+        self.name = name
+        self.frozen_for = frozen_for
+        self.hung_mounts = hung_mounts
+        self._frozen: Dict[str, Any] = {}
+        self._random = random.Random(seed)
+        self._cores = self._random.choice([4, 8, 16, 32, 64])
+        # Each host gets its own baseline; a few run hot
+        self._cpu = self._random.betavariate(2, 5) * 100
+        self._memory = self._random.betavariate(3, 4) * 100
+        self._disk = self._random.betavariate(4, 3) * 100
+
+    def start(self) -> None:
+        pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        if self._frozen:
+            return self._frozen
+
+        def drift(value: float, step: float) -> float:
+            return min(100.0, max(0.0, value + self._random.gauss(0, step)))
+
+        self._cpu = drift(self._cpu, 3.0)
+        self._memory = drift(self._memory, 0.5)
+        self._disk = drift(self._disk, 0.1)
+        snapshot = {
+            "host": self.name,
+            "timestamp": time.time(),
+            "cpu": {
+                "percent": round(self._cpu, 1),
+                "cores": self._cores,
+                "load_per_core": round(self._cpu / 100, 2),
+            },
+            "memory": {
+                "percent": round(self._memory, 1),
+                "swap_percent": round(max(0.0, self._memory - 80) * 2, 1),
+                "total_gb": float(self._cores * 4),
+            },
+            "disk": {
+                "percent": round(self._disk * 0.9, 1),
+                "max_partition_percent": round(self._disk, 1),
+                "max_partition": "/var",
+                "total_gb": 512.0,
+                "timed_out": self.hung_mounts,
+            },
+        }
+        if self.frozen_for:
+            snapshot["timestamp"] -= self.frozen_for
+            self._frozen = snapshot
+        return snapshot
+
+
+class MetricsRequestHandler(socketserver.StreamRequestHandler):
+    """Answers one JSON request line with one JSON response line."""
+
+    def handle(self) -> None:
+        line = self.rfile.readline(MAX_REQUEST_BYTES)
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+            if request.get("op") != "metrics":
+                raise ValueError(f"unknown op: {request.get('op')!r}")
+            if self.server.delay:
+                time.sleep(self.server.delay)
+            snapshot = self.server.sampler.snapshot()
+            response = dict(snapshot, age=round(time.time() - snapshot["timestamp"], 3))
+        except Exception as e:
+            response = {"error": f"{type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class CollectorServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, sampler, delay: float = 0.0):
+        super().__init__(address, MetricsRequestHandler)
+        self.sampler = sampler
+        self.delay = delay
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--bind", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 = any")
+    parser.add_argument("--name", default=socket.gethostname())
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        metavar="SEED",
+        help="serve generated metrics instead of this host's",
+    )
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=0.0,
+        help="seconds to stall each response (simulates a slow host)",
+    )
+    parser.add_argument(
+        "--frozen-for",
+        type=float,
+        default=0.0,
+        help="serve one synthetic snapshot this many seconds old (a stuck host)",
+    )
+    parser.add_argument(
+        "--hung-mounts",
+        type=int,
+        default=0,
+        help="synthetic disk mounts to report as timed out",
+    )
+    args = parser.parse_args()
+
+    if args.synthetic is not None:
+        sampler = SyntheticSampler(
+            args.name, args.synthetic, args.frozen_for, args.hung_mounts
+        )
+    else:
+        sampler = HostSampler(args.name)
+    sampler.start()
+
+    with CollectorServer((args.bind, args.port), sampler, args.delay) as server:
+        host, port = server.server_address[:2]
+        # The bound address is printed so launchers can use --port 0
+        print(f"listening {host}:{port}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Shared Metrics Publisher
+
+Collects the CPU, memory and disk tool results once per --interval and
+publishes them into a memory-mapped segment (see
+system_monitor_agent/shared_metrics.py). Run one publisher per host, then
+start every monitor session with SYSTEM_MONITOR_SHARED_METRICS set to the
+segment path: their tools read the latest frame instead of polling psutil.
+
+Usage:
+    python metrics_publisher.py [--path /dev/shm/system_monitor_metrics]
+                                [--interval 1.0]
+"""
+
+import argparse
+import json
+import os
+import signal
+import threading
+import time
+
+from system_monitor_agent.shared_metrics import (
+    DEFAULT_PATH,
+    SHARED_METRICS_ENV,
+    SharedMetricsWriter,
+)
+from system_monitor_agent.subagents.cpu_info_agent.sampler import get_sampler
+from system_monitor_agent.subagents.cpu_info_agent.tools import get_cpu_info
+from system_monitor_agent.subagents.disk_info_agent.tools import get_disk_info
+from system_monitor_agent.subagents.memory_info_agent.tools import get_memory_info
+
+
+def collect_frame() -> bytes:
+    """One frame: every published tool's current result, as compact JSON."""
+    frame = {
+        "cpu": get_cpu_info(),
+        "memory": get_memory_info(),
+        "disk": get_disk_info(),
+    }
+    return json.dumps(frame, separators=(",", ":")).encode()
+
+
+def publish(path, interval, stop):
+    """Publish a frame every `interval` seconds until `stop` is set."""
+    # The publisher must poll psutil itself, never read its own segment
+    os.environ.pop(SHARED_METRICS_ENV, None)
+    get_sampler()
+    writer = SharedMetricsWriter(path)
+    try:
+        next_at = time.monotonic()
+        while not stop.is_set():
+            writer.publish(collect_frame())
+            next_at += interval
+            stop.wait(max(0.0, next_at - time.monotonic()))
+    finally:
+        writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--path", default=DEFAULT_PATH)
+    parser.add_argument("--interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+    print(f"publishing to {args.path} every {args.interval:g}s", flush=True)
+    print(f"run sessions with {SHARED_METRICS_ENV}={args.path}", flush=True)
+    publish(args.path, args.interval, stop)
+
+
+if __name__ == "__main__":
+    main()
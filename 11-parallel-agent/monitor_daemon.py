@@ -0,0 +1,100 @@
+"""
+System Monitor Daemon
+
+Runs the system monitor continuously: metrics are sampled at 1 Hz and
+checked by streaming anomaly detectors, and the report is only
+re-synthesized when a metric crosses a threshold, spikes or drifts. The
+latest report is written to --report-path each time it changes.
+
+Model calls per hour and detection latency are printed every --stats-every
+seconds and on exit (Ctrl-C).
+
+Usage:
+    python monitor_daemon.py [--report-path report.md]
+                             [--min-report-interval 60] [--stats-every 300]
+"""
+
+import argparse
+import asyncio
+import signal
+import time
+
+from dotenv import load_dotenv
+
+from system_monitor_agent.agent import system_monitor_agent
+from system_monitor_agent.daemon import MonitorDaemon, create_pipeline_synthesizer
+from system_monitor_agent.metrics_history import get_recorder
+
+load_dotenv()
+
+
+def print_stats(daemon):
+    stats = daemon.stats()
+    line = (
+        f"[stats] {stats['uptime_hours']:.2f}h, {stats['samples']} samples, "
+        f"{stats['syntheses']} reports, {stats['model_calls']} model calls "
+        f"({stats['model_calls_per_hour']:.1f}/h)"
+    )
+    if stats["synthesis_failures"]:
+        line += f", {stats['synthesis_failures']} failed syntheses"
+    detection = stats["detection_latency_seconds"]
+    if detection:
+        line += (
+            f", detection latency median {detection['median']:.1f}s "
+            f"max {detection['max']:.1f}s"
+        )
+    report = stats["report_latency_seconds"]
+    if report:
+        line += f", report latency median {report['median']:.1f}s"
+    print(line, flush=True)
+
+
+def make_report_writer(path):
+    def write_report(daemon):
+        reasons = ", ".join(t.detail for t in daemon.report_triggers) or "first report"
+        print(f"[{time.strftime('%H:%M:%S')}] New report ({reasons})", flush=True)
+        if path:
+            with open(path, "w") as f:
+                f.write(daemon.report)
+
+    return write_report
+
+
+async def main_async(args):
+    recorder = get_recorder()
+    daemon = MonitorDaemon(
+        create_pipeline_synthesizer(system_monitor_agent),
+        min_report_interval=args.min_report_interval,
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    async def report_stats():
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), args.stats_every)
+            except asyncio.TimeoutError:
+                print_stats(daemon)
+
+    stats_task = asyncio.create_task(report_stats())
+    await daemon.run(
+        recorder.history, stop=stop, on_report=make_report_writer(args.report_path)
+    )
+    await stats_task
+    print_stats(daemon)
+    recorder.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--report-path", default="system_report.md")
+    parser.add_argument("--min-report-interval", type=float, default=60.0)
+    parser.add_argument("--stats-every", type=float, default=300.0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Fleet Mode Simulation
+
+Starts many local host_collector.py processes serving synthetic metrics as
+stand-ins for hosts (a few of them deliberately too slow to answer in time,
+a few serving a stuck, stale snapshot, a few with a hung disk mount, and a
+few addresses with nothing listening), then runs the fleet coordinator
+against them and prints the section the fleet synthesizer would receive.
+
+It also compares the size of that section with the raw per-host snapshots,
+which is what the synthesizer would otherwise have to read.
+
+Usage:
+    python simulate_fleet.py [--hosts 200] [--slow 5] [--frozen 2] [--hung 2]
+                             [--dead 3] [--concurrency 64] [--timeout 2.0]
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from system_monitor_agent.fleet import (
+    aggregate_fleet,
+    fetch_host_metrics,
+    poll_fleet,
+    render_fleet_info,
+)
+
+COLLECTOR = Path(__file__).with_name("host_collector.py")
+
+
+def start_collectors(count, slow, delay, frozen, hung):
+    """
+    Start `count` synthetic collectors.
+
+    The last `slow` stall each response; the `frozen` before them serve a
+    snapshot a minute old, and the `hung` before those report a disk mount
+    that timed out.
+    """
+    processes = []
+    for i in range(count):
+        command = [
+            sys.executable,
+            str(COLLECTOR),
+            "--port",
+            "0",
+            "--name",
+            f"node-{i:04d}",
+            "--synthetic",
+            str(i),
+        ]
+        if i >= count - slow:
+            command += ["--delay", str(delay)]
+        elif i >= count - slow - frozen:
+            command += ["--frozen-for", "60"]
+        elif i >= count - slow - frozen - hung:
+            command += ["--hung-mounts", "1"]
+        processes.append(subprocess.Popen(command, stdout=subprocess.PIPE, text=True))
+
+    hosts = []
+    for process in processes:
+        # Each collector prints "listening host:port" once it is bound
+        address = process.stdout.readline().split()[-1]
+        host, _, port = address.rpartition(":")
+        hosts.append((host, int(port)))
+    return processes, hosts
+
+
+def unused_ports(count):
+    """Addresses with nothing listening, standing in for hosts that are down."""
+    sockets = [socket.socket() for _ in range(count)]
+    for s in sockets:
+        s.bind(("127.0.0.1", 0))
+    ports = [s.getsockname()[1] for s in sockets]
+    for s in sockets:
+        s.close()
+    return [("127.0.0.1", port) for port in ports]
+
+
+async def main_async(args, hosts):
+    started = time.perf_counter()
+    snapshots, failures = await poll_fleet(hosts, args.concurrency, args.timeout)
+    poll_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    fleet = aggregate_fleet(snapshots, failures)
+    aggregate_ms = (time.perf_counter() - started) * 1e3
+    section = render_fleet_info({"result": fleet})
+
+    # A single round trip, for reference
+    started = time.perf_counter()
+    await fetch_host_metrics(*hosts[0])
+    round_trip_ms = (time.perf_counter() - started) * 1e3
+
+    print(section)
+    raw = json.dumps(snapshots)
+    print("\n=== Fleet poll ===")
+    print(f"hosts            {len(hosts)}")
+    print(f"reachable        {len(snapshots)}")
+    print(f"stale            {fleet['stale']}")
+    print(f"hung mounts      {fleet['hosts_with_hung_mounts']}")
+    print(f"unreachable      {len(failures)}")
+    print(f"poll wall time   {poll_seconds:.2f}s (timeout {args.timeout:.1f}s)")
+    print(f"single request   {round_trip_ms:.2f}ms")
+    print(f"aggregation      {aggregate_ms:.2f}ms")
+    print(f"raw snapshots    {len(raw):,} chars")
+    print(f"synthesizer gets {len(section):,} chars")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--hosts", type=int, default=200)
+    parser.add_argument("--slow", type=int, default=5, help="collectors that stall")
+    parser.add_argument("--frozen", type=int, default=2, help="stuck collectors")
+    parser.add_argument("--hung", type=int, default=2, help="hosts with a hung mount")
+    parser.add_argument("--dead", type=int, default=3, help="addresses that refuse")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--timeout", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"Starting {args.hosts} collectors...")
+    processes, hosts = start_collectors(
+        args.hosts, args.slow, args.timeout * 3, args.frozen, args.hung
+    )
+    try:
+        asyncio.run(main_async(args, hosts + unused_ports(args.dead)))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,23 +4,87 @@ System Monitor Root Agent
 This module defines the root agent for the system monitoring application.
 It uses a parallel agent for system information gathering and a sequential
 pipeline for the overall flow.
+
+Setting SYSTEM_MONITOR_FLEET_HOSTS (e.g. "node-1:9450,node-2:9450") and/or
+SYSTEM_MONITOR_FLEET_HOSTS_FILE (one host:port per line) switches the root
+agent to fleet mode, which polls a host_collector.py process on every host
+and reports on the aggregate.
 """
 
+import os
+from typing import Optional
+
 from google.adk.agents import ParallelAgent, SequentialAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
 
+from .collector import MetricsCollectorAgent
+from .fleet import create_fleet_tool, load_fleet_hosts, render_fleet_info
+from .metrics_history import get_recorder
 from .subagents.cpu_info_agent import cpu_info_agent
 from .subagents.disk_info_agent import disk_info_agent
+from .subagents.fleet_synthesizer_agent import fleet_report_synthesizer
 from .subagents.memory_info_agent import memory_info_agent
+from .subagents.network_info_agent import network_info_agent
+from .subagents.process_info_agent import process_info_agent
+from .subagents.process_info_agent.inspector import get_inspector
 from .subagents.synthesizer_agent import system_report_synthesizer
 
+
+def start_metrics_history(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Make sure the 1 Hz metrics recorder is running before the first report."""
+    get_recorder()
+    return None
+
+
+def start_process_inspector(
+    callback_context: CallbackContext,
+) -> Optional[types.Content]:
+    """Start the background process scans without waiting for the first one."""
+    get_inspector(wait_for_first_scan=False)
+    return None
+
+
 # --- 1. Create Parallel Agent to gather information concurrently ---
 system_info_gatherer = ParallelAgent(
     name="system_info_gatherer",
-    sub_agents=[cpu_info_agent, memory_info_agent, disk_info_agent],
+    sub_agents=[
+        cpu_info_agent,
+        memory_info_agent,
+        disk_info_agent,
+        network_info_agent,
+        process_info_agent,
+    ],
 )
 
 # --- 2. Create Sequential Pipeline to gather info in parallel, then synthesize ---
-root_agent = SequentialAgent(
+system_monitor_agent = SequentialAgent(
     name="system_monitor_agent",
     sub_agents=[system_info_gatherer, system_report_synthesizer],
+    before_agent_callback=[start_metrics_history, start_process_inspector],
+)
+
+
+def create_fleet_monitor_agent(hosts) -> SequentialAgent:
+    """Build the fleet pipeline: poll and aggregate all hosts, then synthesize."""
+    fleet_info_agent = MetricsCollectorAgent(
+        name="FleetInfoAgent",
+        description="Polls every host collector and aggregates fleet metrics",
+        tool=create_fleet_tool(hosts),
+        renderer=render_fleet_info,
+        output_key="fleet_info",
+    )
+    return SequentialAgent(
+        name="fleet_monitor_agent",
+        sub_agents=[fleet_info_agent, fleet_report_synthesizer],
+    )
+
+
+# --- 3. Pick local or fleet mode ---
+FLEET_HOSTS = load_fleet_hosts(
+    os.environ.get("SYSTEM_MONITOR_FLEET_HOSTS"),
+    os.environ.get("SYSTEM_MONITOR_FLEET_HOSTS_FILE"),
+)
+root_agent = (
+    create_fleet_monitor_agent(FLEET_HOSTS) if FLEET_HOSTS else system_monitor_agent
 )
@@ -0,0 +1,215 @@
+"""
+Streaming Anomaly Detection
+
+Per-metric detectors for the continuous monitoring daemon. Each metric keeps
+an exponentially weighted moving average (EWMA) and variance, updated in O(1)
+per sample, and raises a trigger when:
+
+- threshold: the value stays past the metric's concern threshold for
+  PERSISTENCE_SAMPLES consecutive samples (or back below it, with
+  hysteresis), so one-second blips and values hovering at the line do not
+  flap,
+- spike: the z-score against the EWMA stays beyond Z_THRESHOLD for
+  PERSISTENCE_SAMPLES consecutive samples, or
+- drift: outside a spike, the EWMA has moved DRIFT_POINTS away from its value
+  at the last report, which catches slow changes that never look like a spike.
+
+Outlying samples move the EWMA by at most Z_THRESHOLD standard deviations
+and leave the variance alone, so an anomaly does not inflate the variance
+and hide itself.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# --- Constants ---
+# Concern thresholds match the single-host tools
+THRESHOLDS = {"cpu": 80.0, "memory": 80.0, "swap": 80.0, "disk": 85.0}
+HYSTERESIS_POINTS = 5.0
+EWMA_ALPHA = 0.05
+WARMUP_SAMPLES = 30
+Z_THRESHOLD = 4.0
+PERSISTENCE_SAMPLES = 3
+DRIFT_POINTS = 10.0
+# Samples after a spike before drift is measured again (about 3 time constants)
+SETTLE_SAMPLES = int(3 / EWMA_ALPHA)
+# Floor for the standard deviation, in percentage points, so a flat metric
+# does not turn a 0.5-point wobble into a huge z-score
+MIN_STD = 1.0
+
+
+@dataclass
+class Trigger:
+    """A reason to synthesize a new report."""
+
+    metric: str
+    kind: str
+    """"threshold", "recovered", "spike" or "drift"."""
+    value: float
+    detail: str
+    timestamp: float
+    """When the trigger fired (timestamp of the sample that completed it)."""
+    onset: float
+    """When the condition started, e.g. the first sample of a spike."""
+
+
+class EwmaDetector:
+    """EWMA mean and variance of one metric, with z-scores for new samples."""
+
+    def __init__(
+        self,
+        alpha: float = EWMA_ALPHA,
+        warmup: int = WARMUP_SAMPLES,
+        clip: float = Z_THRESHOLD,
+    ):
+        self.alpha = alpha
+        self.warmup = warmup
+        self.clip = clip
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+
+    def update(self, value: float) -> Optional[float]:
+        """
+        Add a sample and return its z-score against the state before it.
+
+        Returns None while warming up.
+        """
+        self.count += 1
+        if self.count == 1:
+            self.mean = value
+            return None
+        diff = value - self.mean
+        std = max(math.sqrt(self.variance), MIN_STD)
+        z_score = diff / std if self.count > self.warmup else None
+        if z_score is not None and abs(z_score) >= self.clip:
+            # Follow an outlier at a bounded pace and keep the variance as it
+            # was, so a level shift stays visible until the mean catches up
+            self.mean += self.alpha * math.copysign(self.clip * std, diff)
+            return z_score
+        increment = self.alpha * diff
+        self.mean += increment
+        self.variance = (1 - self.alpha) * (self.variance + diff * increment)
+        return z_score
+
+
+class AnomalyDetector:
+    """Runs threshold, spike and drift checks over a stream of samples."""
+
+    def __init__(
+        self,
+        thresholds: Optional[Dict[str, float]] = None,
+        z_threshold: float = Z_THRESHOLD,
+        persistence: int = PERSISTENCE_SAMPLES,
+        drift_points: float = DRIFT_POINTS,
+    ):
+        self.thresholds = dict(THRESHOLDS if thresholds is None else thresholds)
+        self.z_threshold = z_threshold
+        self.persistence = persistence
+        self.drift_points = drift_points
+
+        self._ewma: Dict[str, EwmaDetector] = {}
+        self._above: Dict[str, bool] = {}
+        # Consecutive samples that disagree with _above, and when they started
+        self._crossing: Dict[str, Tuple[float, int]] = {}
+        # Consecutive anomalous samples, when they started and if reported
+        self._spike: Dict[str, Tuple[float, int, bool]] = {}
+        self._baseline: Dict[str, float] = {}
+        self._settling: Dict[str, int] = {}
+
+    def observe(self, timestamp: float, values: Dict[str, float]) -> List[Trigger]:
+        """Feed one sample of every metric; returns the triggers it fired."""
+        triggers = []
+        for metric, value in values.items():
+            ewma = self._ewma.get(metric)
+            if ewma is None:
+                ewma = self._ewma[metric] = EwmaDetector(clip=self.z_threshold)
+            z_score = ewma.update(value)
+
+            trigger = self._check_threshold(metric, value, timestamp)
+            if trigger is not None:
+                triggers.append(trigger)
+
+            if z_score is not None and abs(z_score) >= self.z_threshold:
+                onset, length, reported = self._spike.get(metric, (timestamp, 0, False))
+                length += 1
+                if length >= self.persistence and not reported:
+                    reported = True
+                    triggers.append(
+                        Trigger(
+                            metric,
+                            "spike",
+                            value,
+                            f"{metric} {value:.1f}% is {z_score:+.1f} sd from "
+                            f"its average {ewma.mean:.1f}%",
+                            timestamp,
+                            onset,
+                        )
+                    )
+                self._spike[metric] = (onset, length, reported)
+                continue
+
+            spike = self._spike.pop(metric, None)
+            if spike is not None and spike[2]:
+                # The shift was reported as a spike; let the average settle on
+                # the new level before measuring drift again
+                self._settling[metric] = SETTLE_SAMPLES
+            if ewma.count <= ewma.warmup or self._settling.get(metric):
+                if self._settling.get(metric):
+                    self._settling[metric] -= 1
+                self._baseline[metric] = ewma.mean
+                continue
+
+            baseline = self._baseline.setdefault(metric, ewma.mean)
+            if abs(ewma.mean - baseline) >= self.drift_points:
+                # Re-baseline so the same drift is reported once
+                self._baseline[metric] = ewma.mean
+                triggers.append(
+                    Trigger(
+                        metric,
+                        "drift",
+                        value,
+                        f"{metric} average drifted from {baseline:.1f}% "
+                        f"to {ewma.mean:.1f}%",
+                        timestamp,
+                        timestamp,
+                    )
+                )
+        return triggers
+
+    def _check_threshold(
+        self, metric: str, value: float, timestamp: float
+    ) -> Optional[Trigger]:
+        threshold = self.thresholds.get(metric)
+        if threshold is None:
+            return None
+        above = self._above.get(metric, False)
+        if above:
+            crossing = value < threshold - HYSTERESIS_POINTS
+        else:
+            crossing = value > threshold
+        if not crossing:
+            self._crossing.pop(metric, None)
+            return None
+
+        onset, length = self._crossing.get(metric, (timestamp, 0))
+        length += 1
+        if length < self.persistence:
+            self._crossing[metric] = (onset, length)
+            return None
+
+        del self._crossing[metric]
+        self._above[metric] = not above
+        if above:
+            kind, detail = "recovered", f"back below {threshold:.0f}%"
+        else:
+            kind, detail = "threshold", f"above {threshold:.0f}%"
+        return Trigger(
+            metric, kind, value, f"{metric} {value:.1f}% {detail}", timestamp, onset
+        )
+
+    def mark_reported(self) -> None:
+        """Measure future drift from the current averages."""
+        for metric, ewma in self._ewma.items():
+            self._baseline[metric] = ewma.mean
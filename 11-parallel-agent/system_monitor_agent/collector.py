@@ -0,0 +1,59 @@
+"""
+Metrics Collector Agent
+
+This module defines a deterministic agent that runs one metrics tool, renders
+its result into a compact report section from a template and writes it to
+the session state under its output_key. It makes no model call, so it is a
+drop-in replacement for an LlmAgent whose only job is to call a tool and
+reformat the dictionary it returns.
+"""
+
+import inspect
+from typing import Any, AsyncGenerator, Callable, Dict, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+
+class MetricsCollectorAgent(BaseAgent):
+    """Runs a metrics tool and stores a templated section under output_key."""
+
+    tool: Callable[[], Any]
+    """The metrics tool, synchronous or async (e.g. wrapped by blocking_tool)."""
+
+    renderer: Callable[[Dict[str, Any]], str]
+    """Turns the tool's result dictionary into a report section."""
+
+    output_key: str
+    """The session state key the rendered section is written to."""
+
+    data_key: Optional[str] = None
+    """If set, the tool's result dictionary is also written to this state key,
+    for code that needs its flags and numbers rather than the rendered text."""
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        result = self.tool()
+        if inspect.isawaitable(result):
+            result = await result
+        section = self.renderer(result)
+        state_delta = {self.output_key: section}
+        if self.data_key:
+            state_delta[self.data_key] = result
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=section)]),
+            actions=EventActions(state_delta=state_delta),
+        )
+
+
+def render_error(title: str, result: Dict[str, Any]) -> str:
+    """Render the section for a tool that returned an error result."""
+    error = result.get("result", {}).get("error", "unknown error")
+    return f"## {title}\n- Error: {error}"
@@ -0,0 +1,238 @@
+"""
+Continuous Monitoring Daemon
+
+Running the system monitor on a schedule pays for a full LLM synthesis every
+time, even when nothing changed. The daemon instead reads the 1 Hz metrics
+recorder continuously and runs the streaming anomaly detectors (anomaly.py)
+in code. The report pipeline, and with it the synthesizer, only runs when a
+detector fires or no report exists yet; otherwise the cached report is
+served.
+
+If a synthesis fails (a 429 or 503 from the provider, a runner error), its
+triggers go back to the pending list and the daemon retries with
+exponential backoff, serving the last report meanwhile.
+
+It keeps model calls per hour and detection latency (from the start of a
+condition to the trigger) and report latency (to the refreshed report).
+"""
+
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from .anomaly import AnomalyDetector, Trigger
+from .metrics_history import MetricsHistory
+
+# --- Constants ---
+APP_NAME = "system_monitor_daemon"
+DAEMON_USER_ID = "monitor_daemon"
+POLL_INTERVAL_SECONDS = 1.0
+# Triggers that arrive sooner than this after a report wait for the next one
+MIN_REPORT_INTERVAL_SECONDS = 60.0
+# Backoff after a failed synthesis: doubles per failure in a row, up to the max
+RETRY_BACKOFF_SECONDS = 5.0
+MAX_RETRY_BACKOFF_SECONDS = 300.0
+
+# Takes the triggers behind a refresh; returns the report and its model calls
+Synthesizer = Callable[[List[Trigger]], Awaitable[Tuple[str, int]]]
+
+
+class MonitorDaemon:
+    """Feeds samples to the detectors and re-synthesizes only on change."""
+
+    def __init__(
+        self,
+        synthesize: Synthesizer,
+        detector: Optional[AnomalyDetector] = None,
+        min_report_interval: float = MIN_REPORT_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            synthesize: Produces a report for a list of triggers
+            detector: The anomaly detector; a default one when None
+            min_report_interval: Minimum seconds between two syntheses
+            clock: Time source, replaceable for simulations
+        """
+        self.synthesize = synthesize
+        self.detector = detector or AnomalyDetector()
+        self.min_report_interval = min_report_interval
+        self.clock = clock
+
+        self.report: Optional[str] = None
+        self.report_timestamp = 0.0
+        self.report_triggers: List[Trigger] = []
+        self.pending: List[Trigger] = []
+        self.consecutive_failures = 0
+        self.retry_at = 0.0
+
+        self.started_at = clock()
+        self.samples = 0
+        self.syntheses = 0
+        self.model_calls = 0
+        self.synthesis_failures = 0
+        self.cache_hits = 0
+        self.detection_latencies: List[float] = []
+        self.report_latencies: List[float] = []
+
+    async def observe(self, timestamp: float, values: Dict[str, float]) -> bool:
+        """Feed one sample; returns True if it led to a new report."""
+        self.samples += 1
+        now = self.clock()
+        for trigger in self.detector.observe(timestamp, values):
+            self.detection_latencies.append(now - trigger.onset)
+            self.pending.append(trigger)
+
+        if self.report is not None:
+            if not self.pending:
+                return False
+            if now - self.report_timestamp < self.min_report_interval:
+                return False
+        if now < self.retry_at:
+            return False
+        await self.refresh()
+        return True
+
+    async def refresh(self) -> str:
+        """
+        Synthesize a new report for the pending triggers and cache it.
+
+        If the synthesis raises, the triggers are pending again, the next
+        attempt is put off until retry_at, and the error is re-raised.
+        """
+        triggers, self.pending = self.pending, []
+        try:
+            report, model_calls = await self.synthesize(triggers)
+        except Exception:
+            self.pending = triggers + self.pending
+            self.synthesis_failures += 1
+            self.consecutive_failures += 1
+            backoff = min(
+                MAX_RETRY_BACKOFF_SECONDS,
+                RETRY_BACKOFF_SECONDS * 2 ** (self.consecutive_failures - 1),
+            )
+            self.retry_at = self.clock() + backoff
+            raise
+        now = self.clock()
+        self.consecutive_failures = 0
+        self.retry_at = 0.0
+
+        self.report = report
+        self.report_timestamp = now
+        self.report_triggers = triggers
+        self.syntheses += 1
+        self.model_calls += model_calls
+        if triggers:
+            self.report_latencies.append(now - min(t.onset for t in triggers))
+        self.detector.mark_reported()
+        return report
+
+    def get_report(self) -> Optional[str]:
+        """Return the cached report without calling the model."""
+        self.cache_hits += 1
+        return self.report
+
+    def stats(self) -> Dict[str, Any]:
+        """Model usage and latency figures since the daemon started."""
+        hours = max(self.clock() - self.started_at, 1e-9) / 3600
+
+        def describe(latencies: List[float]) -> Optional[Dict[str, float]]:
+            if not latencies:
+                return None
+            return {
+                "median": statistics.median(latencies),
+                "max": max(latencies),
+                "count": len(latencies),
+            }
+
+        return {
+            "uptime_hours": hours,
+            "samples": self.samples,
+            "syntheses": self.syntheses,
+            "model_calls": self.model_calls,
+            "model_calls_per_hour": self.model_calls / hours,
+            "synthesis_failures": self.synthesis_failures,
+            "cache_hits": self.cache_hits,
+            "detection_latency_seconds": describe(self.detection_latencies),
+            "report_latency_seconds": describe(self.report_latencies),
+        }
+
+    async def run(
+        self,
+        history: MetricsHistory,
+        poll_interval: float = POLL_INTERVAL_SECONDS,
+        stop: Optional[asyncio.Event] = None,
+        on_report: Optional[Callable[["MonitorDaemon"], None]] = None,
+    ) -> None:
+        """
+        Follow the metrics history until `stop` is set.
+
+        A failed synthesis is logged and retried after its backoff; it does
+        not end the loop.
+        """
+        stop = stop or asyncio.Event()
+        last_timestamp = None
+        while not stop.is_set():
+            sample = history.latest()
+            if sample is not None and sample["timestamp"] != last_timestamp:
+                last_timestamp = sample.pop("timestamp")
+                try:
+                    reported = await self.observe(last_timestamp, sample)
+                except Exception as e:
+                    print(
+                        f"[DAEMON] Synthesis failed ({type(e).__name__}: {e}); "
+                        f"{len(self.pending)} triggers pending, retrying in "
+                        f"{self.retry_at - self.clock():.1f}s",
+                        flush=True,
+                    )
+                    reported = False
+                if reported and on_report:
+                    on_report(self)
+            try:
+                await asyncio.wait_for(stop.wait(), poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+def create_pipeline_synthesizer(agent: BaseAgent) -> Synthesizer:
+    """
+    Build a synthesize function that runs the report pipeline `agent`.
+
+    Each report runs in a fresh session, deleted afterwards, so the prompt
+    does not grow with the daemon's uptime.
+    """
+    runner = InMemoryRunner(agent=agent, app_name=APP_NAME)
+
+    async def synthesize(triggers: List[Trigger]) -> Tuple[str, int]:
+        text = "Create the system health report."
+        if triggers:
+            text += " Metrics that changed since the last report:\n" + "\n".join(
+                f"- {trigger.detail}" for trigger in triggers
+            )
+        session = await runner.session_service.create_session(
+            app_name=APP_NAME, user_id=DAEMON_USER_ID
+        )
+        report, model_calls = "", 0
+        try:
+            async for event in runner.run_async(
+                user_id=DAEMON_USER_ID,
+                session_id=session.id,
+                new_message=types.Content(role="user", parts=[types.Part(text=text)]),
+            ):
+                if event.usage_metadata is not None:
+                    model_calls += 1
+                if event.is_final_response() and event.content and event.content.parts:
+                    # The synthesizer runs last, so its reply is the last one
+                    report = "".join(part.text or "" for part in event.content.parts)
+        finally:
+            await runner.session_service.delete_session(
+                app_name=APP_NAME, user_id=DAEMON_USER_ID, session_id=session.id
+            )
+        return report, model_calls
+
+    return synthesize
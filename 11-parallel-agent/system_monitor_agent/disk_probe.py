@@ -0,0 +1,233 @@
+"""
+Deadline-Bounded Disk Usage Probes
+
+psutil.disk_usage() blocks in the kernel on a hung NFS or FUSE mount, and
+no thread can interrupt it. probe_usage() runs the probes on a pool of
+daemon threads and waits for all of them under one shared deadline:
+
+- a mount that misses the deadline is reported as timed out, and is not
+  probed again until its hung probe returns,
+- a hung probe keeps its thread, so the pool starts another for the next
+  probe instead of queueing it, up to MAX_PROBE_WORKERS; mounts no thread
+  was free for are reported apart from the ones that timed out.
+
+PartitionTable caches psutil.disk_partitions() until the mount table
+changes (watched through /proc/self/mountinfo on Linux); the disk tool and
+the metrics recorder share one through get_partitions().
+
+The module only needs psutil, so host_collector.py loads it without the
+agent package.
+"""
+
+import os
+import queue
+import select
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import psutil
+
+# --- Constants ---
+MOUNT_TIMEOUT_SECONDS = 2.0
+# Workers kept when idle, and the most the pool grows to around hung probes
+PROBE_WORKERS = 16
+MAX_PROBE_WORKERS = 256
+PROBE_IDLE_SECONDS = 30.0
+MOUNTINFO_PATH = "/proc/self/mountinfo"
+# Fallback refresh interval where the mount table cannot be watched
+PARTITION_TABLE_TTL_SECONDS = 60.0
+
+
+class ProbePoolExhausted(RuntimeError):
+    """No probe thread was free, and the pool is at its largest."""
+
+
+class ProbePool:
+    """
+    A pool of daemon worker threads that grows while its workers are busy.
+
+    Unlike ThreadPoolExecutor, the workers are daemon threads, so a probe stuck
+    in an uninterruptible syscall never blocks interpreter shutdown. A probe
+    never queues behind a busy worker: a new worker starts for it, up to
+    max_workers, past which probes fail with ProbePoolExhausted. Workers
+    beyond `workers` exit after idle_seconds without work. Workers start on
+    the first probe, and again in a forked child, which inherits no threads.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_workers: int = MAX_PROBE_WORKERS,
+        idle_seconds: float = PROBE_IDLE_SECONDS,
+    ):
+        self.workers = workers
+        self.max_workers = max_workers
+        self.idle_seconds = idle_seconds
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._tasks: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = 0
+        # Workers waiting for a task that no submitted task is meant for
+        self._idle = 0
+
+    @property
+    def threads(self) -> int:
+        return self._threads
+
+    def submit(self, func: Callable, *args) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._idle:
+                self._idle -= 1
+            elif self._threads < self.max_workers:
+                self._threads += 1
+                threading.Thread(
+                    target=self._work,
+                    args=(self._tasks,),
+                    name=f"disk-probe-{self._threads}",
+                    daemon=True,
+                ).start()
+            else:
+                future.set_exception(
+                    ProbePoolExhausted(f"all {self.max_workers} probe threads busy")
+                )
+                return future
+            self._tasks.put((future, func, args))
+        return future
+
+    def _work(self, tasks: "queue.Queue") -> None:
+        while True:
+            try:
+                future, func, args = tasks.get(timeout=self.idle_seconds)
+            except queue.Empty:
+                with self._lock:
+                    if tasks is not self._tasks:
+                        return
+                    if self._idle and self._threads > self.workers:
+                        self._idle -= 1
+                        self._threads -= 1
+                        return
+                continue
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func(*args))
+                except BaseException as e:
+                    future.set_exception(e)
+            with self._lock:
+                if tasks is not self._tasks:
+                    return
+                self._idle += 1
+
+
+_probe_pool = ProbePool(PROBE_WORKERS)
+# Latest probe per mountpoint; a hung probe is not resubmitted until it returns
+_probes: Dict[str, Future] = {}
+_probes_lock = threading.Lock()
+
+
+def _reset_probes() -> None:
+    """A forked child has none of its parent's probe threads running."""
+    global _probes_lock
+    _probes.clear()
+    _probes_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_probes)
+
+
+def _probe(mountpoint: str) -> Tuple[Future, bool]:
+    """Start a usage probe; returns the probe and whether it was already hung."""
+    with _probes_lock:
+        previous = _probes.get(mountpoint)
+        if previous is not None and not previous.done():
+            return previous, True
+        future = _probe_pool.submit(psutil.disk_usage, mountpoint)
+        _probes[mountpoint] = future
+        return future, False
+
+
+def probe_usage(
+    mountpoints: Sequence[str], timeout: float = MOUNT_TIMEOUT_SECONDS
+) -> Tuple[Dict[str, Any], List[str], List[str]]:
+    """
+    psutil.disk_usage() of each mountpoint, all within one deadline.
+
+    Mounts that raise PermissionError or FileNotFoundError are left out.
+
+    Returns:
+        Tuple[Dict[str, Any], List[str], List[str]]: The usage of each mount
+        that answered in time, the mounts that timed out (or are still hung
+        from an earlier probe), and the mounts no probe thread was free for
+    """
+    probes = [(mountpoint, *_probe(mountpoint)) for mountpoint in mountpoints]
+    deadline = time.monotonic() + timeout
+    usages, timed_out, unprobed = {}, [], []
+    for mountpoint, probe, hung in probes:
+        try:
+            # Mounts still hung from an earlier call are not waited on again
+            wait = 0.0 if hung else max(0.0, deadline - time.monotonic())
+            usages[mountpoint] = probe.result(timeout=wait)
+        except FutureTimeoutError:
+            timed_out.append(mountpoint)
+        except ProbePoolExhausted:
+            unprobed.append(mountpoint)
+        except (PermissionError, FileNotFoundError):
+            # Some partitions may not be accessible
+            continue
+    return usages, timed_out, unprobed
+
+
+class PartitionTable:
+    """Caches psutil.disk_partitions() until the mount table changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._partitions: Optional[List[Any]] = None
+        self._loaded_at = 0.0
+        self._poller = None
+        self._mountinfo = None
+        if hasattr(select, "poll") and os.path.exists(MOUNTINFO_PATH):
+            # The kernel flags mountinfo with POLLPRI/POLLERR on mount changes
+            self._mountinfo = open(MOUNTINFO_PATH, "rb")
+            self._poller = select.poll()
+            self._poller.register(self._mountinfo, select.POLLPRI | select.POLLERR)
+        os.register_at_fork(after_in_child=self._reset_lock)
+
+    def _reset_lock(self) -> None:
+        # A thread of the parent may have held it at the fork
+        self._lock = threading.Lock()
+
+    def _changed(self) -> bool:
+        if self._poller is None:
+            return time.monotonic() - self._loaded_at > PARTITION_TABLE_TTL_SECONDS
+        if not self._poller.poll(0):
+            return False
+        # Re-read to acknowledge the event, otherwise poll keeps firing
+        self._mountinfo.seek(0)
+        self._mountinfo.read()
+        return True
+
+    def get(self) -> List[Any]:
+        """Return the cached partitions, refreshing them if mounts changed."""
+        with self._lock:
+            if self._partitions is None or self._changed():
+                if self._mountinfo is not None:
+                    self._mountinfo.seek(0)
+                    self._mountinfo.read()
+                self._partitions = psutil.disk_partitions()
+                self._loaded_at = time.monotonic()
+            return self._partitions
+
+
+_partition_table = PartitionTable()
+
+
+def get_partitions() -> List[Any]:
+    """psutil.disk_partitions(), cached until the mount table changes."""
+    return _partition_table.get()
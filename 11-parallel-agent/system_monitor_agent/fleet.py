@@ -0,0 +1,329 @@
+"""
+Fleet Metrics Coordinator
+
+Fleet mode polls a host_collector.py process on every host, fanning out with
+bounded concurrency and a timeout per host. The snapshots are aggregated
+numerically (fleet percentiles, top offenders, hosts over thresholds), and
+only that aggregate goes to the synthesizer, so the prompt stays the same
+size whether the fleet has ten hosts or a thousand.
+
+A host whose collector answers with a snapshot older than STALE_AFTER_SECONDS
+(its sampler is stuck) is listed as stale and left out of the statistics. A
+host reporting disk mounts that timed out (a hung NFS or FUSE mount) is a
+concern, ranked among the outliers like a full disk. Hosts are told apart by
+the endpoint they were polled at, since two collectors may share a --name.
+"""
+
+import asyncio
+import contextlib
+import heapq
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# --- Constants ---
+DEFAULT_PORT = 9450
+MAX_CONCURRENT_HOSTS = 64
+HOST_TIMEOUT_SECONDS = 2.0
+MAX_RESPONSE_BYTES = 64 * 1024
+TOP_N = 5
+MAX_OUTLIERS = 10
+MAX_UNREACHABLE_LISTED = 10
+# Collectors sample every second; a few missed samples make a snapshot stale
+STALE_AFTER_SECONDS = 5.0
+# Outlier severity of a host with hung mounts: that of a disk at 100%
+HUNG_MOUNT_SEVERITY = 15.0
+PERCENTILES = (50, 90, 99)
+
+# Metric name -> (section, field, concern threshold); thresholds match the
+# single-host tools
+FLEET_METRICS = {
+    "cpu_percent": ("cpu", "percent", 80.0),
+    "memory_percent": ("memory", "percent", 80.0),
+    "swap_percent": ("memory", "swap_percent", 80.0),
+    "disk_percent": ("disk", "max_partition_percent", 85.0),
+}
+
+Host = Tuple[str, int]
+
+
+def parse_hosts(spec: str) -> List[Host]:
+    """
+    Parse a host list such as "node-1:9450, node-2" (commas or whitespace).
+
+    Hosts without a port use DEFAULT_PORT.
+    """
+    hosts = []
+    for entry in spec.replace(",", " ").split():
+        host, _, port = entry.rpartition(":")
+        if not host:
+            host, port = port, str(DEFAULT_PORT)
+        hosts.append((host, int(port)))
+    return hosts
+
+
+async def fetch_host_metrics(host: str, port: int) -> Dict[str, Any]:
+    """Request one metrics snapshot from a host collector."""
+    reader, writer = await asyncio.open_connection(host, port, limit=MAX_RESPONSE_BYTES)
+    try:
+        writer.write(b'{"op": "metrics"}\n')
+        await writer.drain()
+        line = await reader.readline()
+    finally:
+        writer.close()
+        with contextlib.suppress(OSError):
+            await writer.wait_closed()
+    if not line:
+        raise ConnectionError("collector closed the connection")
+    snapshot = json.loads(line)
+    if "error" in snapshot:
+        raise RuntimeError(snapshot["error"])
+    return snapshot
+
+
+async def poll_fleet(
+    hosts: List[Host],
+    concurrency: int = MAX_CONCURRENT_HOSTS,
+    timeout: float = HOST_TIMEOUT_SECONDS,
+) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """
+    Fetch a snapshot from every host with bounded concurrency.
+
+    Returns:
+        The snapshots that arrived, each with the "endpoint" ("host:port") it
+        came from, and a map of "host:port" to the reason for every host that
+        failed or timed out
+    """
+    slots = asyncio.Semaphore(concurrency)
+
+    async def poll(host: str, port: int):
+        async with slots:
+            try:
+                return await asyncio.wait_for(fetch_host_metrics(host, port), timeout)
+            except asyncio.TimeoutError:
+                return TimeoutError(f"no response within {timeout:.1f}s")
+            except Exception as e:
+                return e
+
+    results = await asyncio.gather(*(poll(host, port) for host, port in hosts))
+
+    snapshots, failures = [], {}
+    for (host, port), result in zip(hosts, results):
+        if isinstance(result, Exception):
+            failures[f"{host}:{port}"] = f"{type(result).__name__}: {result}"
+        else:
+            result["endpoint"] = f"{host}:{port}"
+            snapshots.append(result)
+    return snapshots, failures
+
+
+def snapshot_age(snapshot: Dict[str, Any], now: Optional[float] = None) -> float:
+    """
+    Seconds since the host took `snapshot`.
+
+    Uses the "age" the collector reports by its own clock, which clock skew
+    between hosts does not affect, and falls back to the timestamp.
+    """
+    age = snapshot.get("age")
+    if isinstance(age, (int, float)):
+        return float(age)
+    timestamp = _number(snapshot.get("timestamp"))
+    return (time.time() if now is None else now) - timestamp
+
+
+def aggregate_fleet(
+    snapshots: List[Dict[str, Any]],
+    failures: Dict[str, str],
+    stale_after: float = STALE_AFTER_SECONDS,
+) -> Dict[str, Any]:
+    """Reduce per-host snapshots to fleet statistics, top offenders and outliers."""
+    now = time.time()
+    fresh, stale = [], {}
+    for snapshot in snapshots:
+        age = snapshot_age(snapshot, now)
+        # A snapshot without a usable timestamp is stale too (NaN compares False)
+        if age <= stale_after:
+            fresh.append(snapshot)
+        else:
+            stale[_endpoint(snapshot)] = f"{snapshot.get('host', '?')}, " + (
+                f"snapshot {age:.0f}s old" if age == age else "snapshot undated"
+            )
+    snapshots = fresh
+    names = [snapshot.get("host", "?") for snapshot in snapshots]
+    # Concerns are keyed by endpoint, so hosts sharing a name are not merged
+    endpoints = [_endpoint(snapshot) for snapshot in snapshots]
+    metrics: Dict[str, Any] = {}
+    top_offenders: Dict[str, List[Tuple[str, float]]] = {}
+    concerns: Dict[str, List[str]] = {}
+    severity: Dict[str, float] = {}
+
+    for metric, (section, field, threshold) in FLEET_METRICS.items():
+        values = np.array(
+            [_number(snapshot.get(section, {}).get(field)) for snapshot in snapshots],
+            dtype=np.float64,
+        )
+        reported = ~np.isnan(values)
+        if not reported.any():
+            continue
+        present = values[reported]
+        stats = {"hosts": int(present.size), "mean": float(present.mean())}
+        for percentile, value in zip(PERCENTILES, np.percentile(present, PERCENTILES)):
+            stats[f"p{percentile}"] = float(value)
+        stats["max"] = float(present.max())
+        metrics[metric] = stats
+
+        indexed = [(float(values[i]), names[i]) for i in np.flatnonzero(reported)]
+        top_offenders[metric] = [
+            (name, value) for value, name in heapq.nlargest(TOP_N, indexed)
+        ]
+        for i in np.flatnonzero(values > threshold):
+            concerns.setdefault(endpoints[i], []).append(f"{metric} {values[i]:.1f}%")
+            severity[endpoints[i]] = max(
+                severity.get(endpoints[i], 0.0), values[i] - threshold
+            )
+
+    hung_mounts = 0
+    for snapshot, endpoint in zip(snapshots, endpoints):
+        timed_out = _number(snapshot.get("disk", {}).get("timed_out"))
+        if timed_out > 0:
+            hung_mounts += 1
+            concerns.setdefault(endpoint, []).append(
+                f"disk mounts timed out {timed_out:.0f}"
+            )
+            severity[endpoint] = max(severity.get(endpoint, 0.0), HUNG_MOUNT_SEVERITY)
+
+    worst = heapq.nlargest(MAX_OUTLIERS, severity, key=severity.get)
+    labels = dict(zip(endpoints, names))
+    return {
+        "host_count": len(snapshots) + len(stale) + len(failures),
+        "reachable": len(snapshots) + len(stale),
+        "stale": len(stale),
+        "stale_hosts": dict(list(stale.items())[:MAX_UNREACHABLE_LISTED]),
+        "unreachable": len(failures),
+        "unreachable_hosts": dict(list(failures.items())[:MAX_UNREACHABLE_LISTED]),
+        "metrics": metrics,
+        "top_offenders": top_offenders,
+        "hosts_over_threshold": len(concerns),
+        "hosts_with_hung_mounts": hung_mounts,
+        "outliers": [
+            {
+                "host": labels[endpoint],
+                "endpoint": endpoint,
+                "concerns": concerns[endpoint],
+            }
+            for endpoint in worst
+        ],
+    }
+
+
+def _endpoint(snapshot: Dict[str, Any]) -> str:
+    # Snapshots not from poll_fleet() only have the name they report
+    return snapshot.get("endpoint") or snapshot.get("host", "?")
+
+
+def _number(value: Any) -> float:
+    return float(value) if isinstance(value, (int, float)) else np.nan
+
+
+def create_fleet_tool(
+    hosts: List[Host],
+    concurrency: int = MAX_CONCURRENT_HOSTS,
+    timeout: float = HOST_TIMEOUT_SECONDS,
+) -> Callable[[], Any]:
+    """Build the async tool that polls `hosts` and returns the fleet aggregate."""
+
+    async def get_fleet_info() -> Dict[str, Any]:
+        """
+        Poll every host collector in the fleet and aggregate their metrics.
+
+        Returns:
+            Dict[str, Any]: Dictionary with fleet information structured for ADK
+        """
+        started = time.perf_counter()
+        try:
+            snapshots, failures = await poll_fleet(hosts, concurrency, timeout)
+            fleet = aggregate_fleet(snapshots, failures)
+            return {
+                "result": fleet,
+                "stats": {
+                    "host_count": fleet["host_count"],
+                    "reachable": fleet["reachable"],
+                    "unreachable": fleet["unreachable"],
+                    "stale": fleet["stale"],
+                    "hosts_over_threshold": fleet["hosts_over_threshold"],
+                    "hosts_with_hung_mounts": fleet["hosts_with_hung_mounts"],
+                    "poll_seconds": time.perf_counter() - started,
+                },
+                "additional_info": {
+                    "data_format": "dictionary",
+                    "collection_timestamp": time.time(),
+                    "host_timeout_seconds": timeout,
+                },
+            }
+        except Exception as e:
+            return {
+                "result": {"error": f"Failed to gather fleet information: {str(e)}"},
+                "stats": {"success": False},
+                "additional_info": {"error_type": str(type(e).__name__)},
+            }
+
+    return get_fleet_info
+
+
+def render_fleet_info(data: Dict[str, Any]) -> str:
+    """Render the fleet aggregate as a compact report section."""
+    fleet = data["result"]
+    if "error" in fleet:
+        return f"## Fleet\n- Error: {fleet['error']}"
+
+    lines = [
+        "## Fleet",
+        f"- Hosts: {fleet['reachable'] - fleet['stale']} of {fleet['host_count']} "
+        f"reporting current metrics, {fleet['hosts_over_threshold']} over threshold",
+    ]
+    if fleet["hosts_with_hung_mounts"]:
+        lines.append(
+            f"- Hung disk mounts: {fleet['hosts_with_hung_mounts']} hosts have "
+            "mounts not responding"
+        )
+    for metric, stats in fleet["metrics"].items():
+        percentiles = ", ".join(f"p{p} {stats[f'p{p}']:.1f}" for p in PERCENTILES)
+        offenders = ", ".join(
+            f"{host} {value:.1f}" for host, value in fleet["top_offenders"][metric]
+        )
+        lines.append(
+            f"- {metric} (%): {percentiles}, max {stats['max']:.1f}, "
+            f"mean {stats['mean']:.1f}; top: {offenders}"
+        )
+    if fleet["outliers"]:
+        lines.append("- Outliers:")
+        lines.extend(
+            f"  - {outlier['host']} ({outlier['endpoint']}): "
+            f"{', '.join(outlier['concerns'])}"
+            for outlier in fleet["outliers"]
+        )
+        hidden = fleet["hosts_over_threshold"] - len(fleet["outliers"])
+        if hidden > 0:
+            lines.append(f"  - ...and {hidden} more hosts over threshold")
+    if fleet["stale"]:
+        listed = "; ".join(
+            f"{host} ({reason})" for host, reason in fleet["stale_hosts"].items()
+        )
+        lines.append(f"- Stale ({fleet['stale']}): {listed}")
+    if fleet["unreachable"]:
+        listed = "; ".join(
+            f"{host} ({reason})" for host, reason in fleet["unreachable_hosts"].items()
+        )
+        lines.append(f"- Unreachable ({fleet['unreachable']}): {listed}")
+    return "\n".join(lines)
+
+
+def load_fleet_hosts(spec: Optional[str], hosts_file: Optional[str]) -> List[Host]:
+    """Read the fleet host list from a spec string and/or a file of host:port lines."""
+    hosts = parse_hosts(spec or "")
+    if hosts_file:
+        with open(hosts_file) as f:
+            hosts.extend(parse_hosts(f.read()))
+    return hosts
@@ -0,0 +1,583 @@
+"""
+Metrics History Store
+
+This module keeps a compact time series of system metrics in preallocated
+NumPy ring buffers (per-core CPU, memory, swap and per-partition disk usage)
+and answers vectorized percentile, moving-average and slope queries over a
+time window. The buffers can be backed by memory-mapped files so history
+survives restarts.
+
+A MetricsRecorder thread feeds the store at 1 Hz; the synthesizer reads it
+through the get_metric_trends tool to tell a spike from a trend. Disk usage
+is probed under a deadline (disk_probe.py): a mount that does not answer in
+time is recorded as missing (NaN) for that sample, and the tracked
+partitions follow the mount table. The shared history keeps HISTORY_SECONDS
+of samples, fewer on hosts where that would take more than
+METRICS_HISTORY_MAX_BYTES.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import psutil
+
+from .disk_probe import get_partitions, probe_usage
+
+# --- Constants ---
+SAMPLE_INTERVAL_SECONDS = 1.0
+HISTORY_SECONDS = 7 * 24 * 3600
+HISTORY_PATH_ENV = "METRICS_HISTORY_PATH"
+HISTORY_MAX_BYTES = 128 * 2**20
+HISTORY_MAX_BYTES_ENV = "METRICS_HISTORY_MAX_BYTES"
+# Share of each 1 Hz sample the disk probes may take
+DISK_PROBE_TIMEOUT_SECONDS = 0.5
+
+# Slopes smaller than this (percentage points per hour) count as stable
+STABLE_SLOPE_PER_HOUR = 1.0
+
+METRICS = ("cpu", "cpu_per_core", "memory", "swap", "disk")
+
+
+def moving_average(values: np.ndarray, span: int) -> np.ndarray:
+    """Trailing moving average over `span` samples along the first axis."""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) < span:
+        return values.mean(axis=0, keepdims=True) if len(values) else values
+    cumulative = np.cumsum(values, axis=0)
+    cumulative[span:] = cumulative[span:] - cumulative[:-span]
+    return cumulative[span - 1 :] / span
+
+
+def slope_per_hour(timestamps: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Least-squares slope of `values` against `timestamps`, in units per hour."""
+    values = np.asarray(values, dtype=np.float64)
+    if len(timestamps) < 2:
+        return np.zeros(values.shape[1:])
+    t = timestamps - timestamps.mean()
+    denominator = np.dot(t, t)
+    if denominator == 0:
+        return np.zeros(values.shape[1:])
+    return (
+        np.tensordot(t, values - values.mean(axis=0), axes=(0, 0)) / denominator * 3600
+    )
+
+
+def sample_bytes(n_cores: int, n_partitions: int) -> int:
+    """Bytes one sample takes across the ring buffers."""
+    # float64 timestamp, float32 per core, memory, swap and per partition
+    return 8 + 4 * (n_cores + 2 + n_partitions)
+
+
+def history_capacity(n_cores: int, n_partitions: int, max_bytes: int) -> int:
+    """Samples to keep: HISTORY_SECONDS at the sampling rate, within max_bytes."""
+    samples = int(HISTORY_SECONDS / SAMPLE_INTERVAL_SECONDS)
+    return max(1, min(samples, max_bytes // sample_bytes(n_cores, n_partitions)))
+
+
+def _layout(capacity: int, n_cores: int, n_partitions: int) -> Dict[str, Any]:
+    return {
+        "timestamps": ((capacity,), np.float64),
+        "cpu_per_core": ((capacity, n_cores), np.float32),
+        "memory": ((capacity,), np.float32),
+        "swap": ((capacity,), np.float32),
+        "disk": ((capacity, n_partitions), np.float32),
+        # Write position and sample count, persisted with the data
+        "cursor": ((2,), np.int64),
+    }
+
+
+class MetricsHistory:
+    """
+    Fixed-capacity ring buffer of metric samples backed by NumPy arrays.
+
+    Disk usage a probe could not read is stored as NaN and left out of the
+    statistics of its partition.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        n_cores: int,
+        partitions: Sequence[str],
+        path: Optional[str] = None,
+    ):
+        """
+        Args:
+            capacity: Number of samples kept before the oldest are overwritten
+            n_cores: Number of logical CPU cores
+            partitions: Mountpoints tracked for disk usage, in column order
+            path: Directory for memory-mapped storage; in-memory when None
+        """
+        self.capacity = capacity
+        self.n_cores = n_cores
+        self.partitions = list(partitions)
+        self.path = path
+
+        layout = _layout(capacity, n_cores, len(self.partitions))
+        if path is None:
+            self._arrays = {
+                name: np.zeros(shape, dtype) for name, (shape, dtype) in layout.items()
+            }
+        else:
+            self._arrays = self._open_memmaps(path, layout)
+        self._cursor = self._arrays["cursor"]
+        self._lock = threading.Lock()
+
+    def _meta(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "n_cores": self.n_cores,
+            "partitions": self.partitions,
+        }
+
+    def _open_memmaps(
+        self, path: str, layout: Dict[str, Any], suffix: str = ""
+    ) -> Dict[str, Any]:
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, "meta.json")
+        meta = self._meta()
+
+        # Reuse existing files only if they were created with the same layout
+        reuse = False
+        if not suffix and os.path.exists(meta_path):
+            with open(meta_path) as f:
+                reuse = json.load(f) == meta
+        if not reuse and not suffix:
+            with open(meta_path, "w") as f:
+                json.dump(meta, f)
+
+        return {
+            name: np.memmap(
+                os.path.join(path, f"{name}.bin{suffix}"),
+                dtype=dtype,
+                mode="r+" if reuse else "w+",
+                shape=shape,
+            )
+            for name, (shape, dtype) in layout.items()
+        }
+
+    def set_partitions(
+        self, partitions: Sequence[str], capacity: Optional[int] = None
+    ) -> None:
+        """
+        Track `partitions` from now on, keeping the newest samples.
+
+        Mounts still tracked keep their history; new ones start with none.
+        With `capacity`, the ring is resized as well, dropping the oldest
+        samples when it shrinks.
+        """
+        partitions = list(partitions)
+        capacity = capacity or self.capacity
+        layout = _layout(capacity, self.n_cores, len(partitions))
+        with self._lock:
+            end, count = int(self._cursor[0]), int(self._cursor[1])
+            keep = min(count, capacity)
+            # Ring positions of the newest `keep` samples, oldest first
+            order = (end - keep + np.arange(keep)) % self.capacity
+            if self.path is None:
+                arrays = {
+                    name: np.zeros(shape, dtype)
+                    for name, (shape, dtype) in layout.items()
+                }
+            else:
+                # Written beside the current files, then swapped in
+                arrays = self._open_memmaps(self.path, layout, suffix=".new")
+            for name in ("timestamps", "cpu_per_core", "memory", "swap"):
+                arrays[name][:keep] = self._arrays[name][order]
+            arrays["disk"][:] = np.nan
+            columns = {mountpoint: i for i, mountpoint in enumerate(self.partitions)}
+            for column, mountpoint in enumerate(partitions):
+                if mountpoint in columns:
+                    arrays["disk"][:keep, column] = self._arrays["disk"][
+                        order, columns[mountpoint]
+                    ]
+            arrays["cursor"][:] = (keep % capacity, keep)
+
+            self.capacity = capacity
+            self.partitions = partitions
+            self._arrays = arrays
+            self._cursor = arrays["cursor"]
+            if self.path is not None:
+                self.flush()
+                for name in layout:
+                    target = os.path.join(self.path, f"{name}.bin")
+                    os.replace(target + ".new", target)
+                with open(os.path.join(self.path, "meta.json"), "w") as f:
+                    json.dump(self._meta(), f)
+
+    def __len__(self) -> int:
+        return int(self._cursor[1])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self._arrays.values())
+
+    def append(
+        self,
+        timestamp: float,
+        cpu_per_core: Sequence[float],
+        memory: float,
+        swap: float,
+        disk: Sequence[float],
+    ) -> None:
+        """Record one sample, overwriting the oldest when full."""
+        with self._lock:
+            index = int(self._cursor[0])
+            self._arrays["timestamps"][index] = timestamp
+            self._arrays["cpu_per_core"][index] = cpu_per_core
+            self._arrays["memory"][index] = memory
+            self._arrays["swap"][index] = swap
+            self._arrays["disk"][index] = disk
+            self._cursor[0] = (index + 1) % self.capacity
+            self._cursor[1] = min(int(self._cursor[1]) + 1, self.capacity)
+
+    def extend(
+        self,
+        timestamps: np.ndarray,
+        cpu_per_core: np.ndarray,
+        memory: np.ndarray,
+        swap: np.ndarray,
+        disk: np.ndarray,
+    ) -> None:
+        """Record many samples at once (e.g. a backfill), oldest first."""
+        count = len(timestamps)
+        if count > self.capacity:
+            keep = slice(count - self.capacity, count)
+            timestamps, cpu_per_core = timestamps[keep], cpu_per_core[keep]
+            memory, swap, disk = memory[keep], swap[keep], disk[keep]
+            count = self.capacity
+        with self._lock:
+            start = int(self._cursor[0])
+            indices = (start + np.arange(count)) % self.capacity
+            self._arrays["timestamps"][indices] = timestamps
+            self._arrays["cpu_per_core"][indices] = cpu_per_core
+            self._arrays["memory"][indices] = memory
+            self._arrays["swap"][indices] = swap
+            self._arrays["disk"][indices] = disk
+            self._cursor[0] = (start + count) % self.capacity
+            self._cursor[1] = min(int(self._cursor[1]) + count, self.capacity)
+
+    def flush(self) -> None:
+        """Write memory-mapped buffers to disk."""
+        for array in self._arrays.values():
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    def _window(self, seconds: float) -> Tuple[Dict[str, Any], List[str], List[slice]]:
+        """
+        The arrays and partitions in use, and the slices covering the last
+        `seconds` of samples, oldest first.
+
+        The three are read together, so set_partitions() cannot swap the
+        arrays between them.
+        """
+        with self._lock:
+            arrays, partitions, capacity = self._arrays, self.partitions, self.capacity
+            end, count = int(self._cursor[0]), int(self._cursor[1])
+        if count == 0:
+            return arrays, partitions, []
+
+        # The ring holds two chronologically sorted runs: [end:] then [:end]
+        timestamps = arrays["timestamps"]
+        cutoff = timestamps[(end - 1) % capacity] - seconds
+        runs = (
+            [slice(end, capacity), slice(0, end)]
+            if count == capacity
+            else [slice(0, end)]
+        )
+        slices = []
+        for run in runs:
+            start = run.start + int(
+                np.searchsorted(timestamps[run], cutoff, side="right")
+            )
+            if start < run.stop:
+                slices.append(slice(start, run.stop))
+        return arrays, partitions, slices
+
+    @staticmethod
+    def _gather(array: np.ndarray, slices: List[slice]) -> np.ndarray:
+        if not slices:
+            return array[:0]
+        if len(slices) == 1:
+            return np.asarray(array[slices[0]])
+        return np.concatenate([array[s] for s in slices])
+
+    def latest(self) -> Optional[Dict[str, float]]:
+        """
+        Return the newest sample as scalars, or None if the history is empty.
+
+        "cpu" is the average over cores and "disk" the fullest partition
+        that answered its probe, left out if none did.
+        """
+        with self._lock:
+            end, count = int(self._cursor[0]), int(self._cursor[1])
+            if count == 0:
+                return None
+            index = (end - 1) % self.capacity
+            disk = self._arrays["disk"][index]
+            disk = disk[~np.isnan(disk)]
+            sample = {
+                "timestamp": float(self._arrays["timestamps"][index]),
+                "cpu": float(self._arrays["cpu_per_core"][index].mean()),
+                "memory": float(self._arrays["memory"][index]),
+                "swap": float(self._arrays["swap"][index]),
+            }
+            if disk.size:
+                sample["disk"] = float(disk.max())
+            return sample
+
+    def series(self, metric: str, seconds: float) -> Dict[str, np.ndarray]:
+        """
+        Return timestamps and values for `metric` over the last `seconds`.
+
+        Metrics: "cpu" (average of all cores), "cpu_per_core", "memory",
+        "swap" and "disk" (one column per partition, NaN where missing).
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        arrays, _, slices = self._window(seconds)
+        source = "cpu_per_core" if metric == "cpu" else metric
+        timestamps = self._gather(arrays["timestamps"], slices)
+        values = self._gather(arrays[source], slices)
+        if metric == "cpu":
+            values = values.mean(axis=1)
+        return {"timestamps": timestamps, "values": values}
+
+    def percentile(self, metric: str, seconds: float, q: Sequence[float]) -> np.ndarray:
+        """Percentiles `q` (0-100) of `metric` over the window, per column."""
+        values = self.series(metric, seconds)["values"]
+        if len(values) == 0:
+            return np.full((len(q),) + values.shape[1:], np.nan)
+        return np.percentile(values, q, axis=0)
+
+    def moving_average(self, metric: str, seconds: float, span: int) -> np.ndarray:
+        """Trailing moving average of `metric` over `span` samples."""
+        return moving_average(self.series(metric, seconds)["values"], span)
+
+    def slope(self, metric: str, seconds: float) -> np.ndarray:
+        """Least-squares slope of `metric` over the window, in units per hour."""
+        data = self.series(metric, seconds)
+        return slope_per_hour(data["timestamps"], data["values"])
+
+    def summarize(self, seconds: float, span: int = 300) -> Dict[str, Any]:
+        """
+        Summarize CPU, memory, swap and disk usage over the window.
+
+        Args:
+            seconds: Window length, counted back from the newest sample
+            span: Samples in the trailing moving average
+
+        Returns:
+            Dict[str, Any]: Per metric: current, p50, p95, max, moving average,
+            slope per hour and a rising/falling/stable trend label. A
+            partition with missing samples is summarized over the others,
+            with their count under "missing_samples"; its "current" is None
+            when the newest sample is missing.
+        """
+        summary: Dict[str, Any] = {"window_seconds": seconds}
+        arrays, partitions, slices = self._window(seconds)
+        timestamps = self._gather(arrays["timestamps"], slices)
+        summary["samples"] = int(len(timestamps))
+        if summary["samples"] == 0:
+            return summary
+
+        disk = self._gather(arrays["disk"], slices)
+        missing = np.isnan(disk)
+        gaps = missing.any(axis=0)
+        # One vectorized pass per statistic over every complete column at once
+        columns = np.column_stack(
+            [
+                self._gather(arrays["cpu_per_core"], slices).mean(axis=1),
+                self._gather(arrays["memory"], slices),
+                self._gather(arrays["swap"], slices),
+                disk[:, ~gaps],
+            ]
+        )
+        described = _describe_columns(timestamps, columns, span)
+        summary["cpu_percent"] = described[0]
+        summary["memory_percent"] = described[1]
+        summary["swap_percent"] = described[2]
+
+        complete = iter(described[3:])
+        summary["disk_percent"] = {}
+        for column, mountpoint in enumerate(partitions):
+            if not gaps[column]:
+                summary["disk_percent"][mountpoint] = next(complete)
+                continue
+            valid = ~missing[:, column]
+            if valid.any():
+                described_column = _describe_columns(
+                    timestamps[valid], disk[valid, column][:, None], span
+                )[0]
+            else:
+                described_column = {}
+            if missing[-1, column]:
+                described_column["current"] = None
+            described_column["missing_samples"] = int(missing[:, column].sum())
+            summary["disk_percent"][mountpoint] = described_column
+        return summary
+
+
+def _describe_columns(
+    timestamps: np.ndarray, columns: np.ndarray, span: int
+) -> List[Dict[str, Any]]:
+    """The summary statistics of each column, as MetricsHistory.summarize gives."""
+    p50, p95 = np.percentile(columns, [50, 95], axis=0)
+    peaks = columns.max(axis=0)
+    averages = moving_average(columns, span)[-1]
+    slopes = slope_per_hour(timestamps, columns)
+
+    def describe(column: int) -> Dict[str, Any]:
+        slope = float(slopes[column])
+        if abs(slope) < STABLE_SLOPE_PER_HOUR:
+            trend = "stable"
+        else:
+            trend = "rising" if slope > 0 else "falling"
+        return {
+            "current": round(float(columns[-1, column]), 1),
+            "p50": round(float(p50[column]), 1),
+            "p95": round(float(p95[column]), 1),
+            "max": round(float(peaks[column]), 1),
+            "moving_average": round(float(averages[column]), 1),
+            "slope_per_hour": round(slope, 2),
+            "trend": trend,
+        }
+
+    return [describe(column) for column in range(columns.shape[1])]
+
+
+def _busy_and_total(times) -> tuple:
+    # Guest time is already counted in user time; idle and iowait are not busy
+    total = sum(times) - getattr(times, "guest", 0) - getattr(times, "guest_nice", 0)
+    return total - times.idle - getattr(times, "iowait", 0), total
+
+
+class CpuTimesDelta:
+    """
+    Per-core CPU utilization since the previous read, from psutil.cpu_times.
+
+    psutil.cpu_percent(interval=None) measures from the last call made by
+    anyone in the process, so the CpuSampler reading it every 0.25s would
+    shorten the recorder's window to whatever it left. Each CpuTimesDelta
+    keeps a baseline of its own.
+    """
+
+    def __init__(self):
+        self._last = [_busy_and_total(t) for t in psutil.cpu_times(percpu=True)]
+
+    def read(self) -> List[float]:
+        """Percent busy per core since the last read (or construction)."""
+        now = [_busy_and_total(t) for t in psutil.cpu_times(percpu=True)]
+        percents = []
+        for (busy, total), (last_busy, last_total) in zip(now, self._last):
+            elapsed = total - last_total
+            percent = (busy - last_busy) / elapsed * 100 if elapsed > 0 else 0.0
+            percents.append(min(100.0, max(0.0, percent)))
+        self._last = now
+        return percents
+
+
+class MetricsRecorder:
+    """Samples system metrics into a MetricsHistory on a daemon thread."""
+
+    def __init__(
+        self,
+        history: MetricsHistory,
+        interval: float = SAMPLE_INTERVAL_SECONDS,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Args:
+            history: The history to sample into
+            interval: Seconds between samples
+            max_bytes: When the partitions change, resize the history to
+                history_capacity() within this many bytes; None keeps its
+                capacity
+        """
+        self.history = history
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self._cpu: Optional[CpuTimesDelta] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        # Establish the baseline for the first CPU reading
+        self._cpu = CpuTimesDelta()
+        self._thread = threading.Thread(
+            target=self._run, name="metrics-recorder", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.history.flush()
+
+    def sample(self) -> None:
+        """Take one sample of every metric."""
+        # The disk tool's cached partition table, re-read on mount changes
+        partitions = [partition.mountpoint for partition in get_partitions()]
+        if partitions != self.history.partitions:
+            capacity = None
+            if self.max_bytes is not None:
+                capacity = history_capacity(
+                    self.history.n_cores, len(partitions), self.max_bytes
+                )
+            self.history.set_partitions(partitions, capacity)
+        usages, _, _ = probe_usage(partitions, DISK_PROBE_TIMEOUT_SECONDS)
+        # Mounts that timed out, or could not be read, are missing this time
+        disk = [
+            usages[mountpoint].percent if mountpoint in usages else np.nan
+            for mountpoint in partitions
+        ]
+        if self._cpu is None:
+            self._cpu = CpuTimesDelta()
+        self.history.append(
+            time.time(),
+            self._cpu.read(),
+            psutil.virtual_memory().percent,
+            psutil.swap_memory().percent,
+            disk,
+        )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+
+_recorder: Optional[MetricsRecorder] = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder() -> MetricsRecorder:
+    """Return the shared recorder, starting it on first use."""
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None:
+            n_cores = psutil.cpu_count(logical=True)
+            partitions = [partition.mountpoint for partition in get_partitions()]
+            max_bytes = int(os.getenv(HISTORY_MAX_BYTES_ENV, HISTORY_MAX_BYTES))
+            history = MetricsHistory(
+                capacity=history_capacity(n_cores, len(partitions), max_bytes),
+                n_cores=n_cores,
+                partitions=partitions,
+                path=os.getenv(HISTORY_PATH_ENV),
+            )
+            _recorder = MetricsRecorder(history, max_bytes=max_bytes)
+        if not _recorder.running:
+            _recorder.start()
+    return _recorder
@@ -0,0 +1,95 @@
+"""
+Compact Metric Payloads
+
+Helpers for the numeric payloads the metrics tools return. Values are plain
+numbers with their units stated once in a "units" entry, tables are column
+names plus rows, and per-core series can be quantized and run-length encoded,
+so a 256-core CPU costs a few dozen tokens instead of thousands.
+
+An encoded series is a dict:
+
+    {"step": 5, "rle": [10, [0, 12], 45]}
+
+"step" is the quantization step (omitted when values are only rounded), and
+"rle" holds plain values or [value, count] pairs for runs of equal values.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+# Runs shorter than this stay as plain values; [v, 2] is no shorter than v, v
+MIN_RUN_LENGTH = 3
+
+Number = Union[int, float]
+
+
+def quantize(values: Iterable[float], step: Optional[float] = None) -> List[Number]:
+    """
+    Round values to a multiple of `step`, or to one decimal without a step.
+
+    Whole steps produce ints, which serialize shorter than floats.
+    """
+    if step is None:
+        return [round(value, 1) for value in values]
+    if float(step).is_integer():
+        step = int(step)
+        return [int(round(value / step)) * step for value in values]
+    return [round(round(value / step) * step, 6) for value in values]
+
+
+def run_length_encode(values: Sequence[Number]) -> List[Any]:
+    """Replace runs of MIN_RUN_LENGTH or more equal values with [value, count]."""
+    encoded: List[Any] = []
+    i = 0
+    while i < len(values):
+        j = i
+        while j < len(values) and values[j] == values[i]:
+            j += 1
+        if j - i >= MIN_RUN_LENGTH:
+            encoded.append([values[i], j - i])
+        else:
+            encoded.extend(values[i:j])
+        i = j
+    return encoded
+
+
+def encode_series(values: Iterable[float], step: Optional[float] = None) -> Dict:
+    """Quantize and run-length encode a series such as per-core usage."""
+    encoded: Dict[str, Any] = {}
+    if step is not None:
+        encoded["step"] = int(step) if float(step).is_integer() else step
+    encoded["rle"] = run_length_encode(quantize(values, step))
+    return encoded
+
+
+def decode_series(encoded: Dict[str, Any]) -> List[Number]:
+    """Expand an encoded series back into one value per element."""
+    values: List[Number] = []
+    for item in encoded["rle"]:
+        if isinstance(item, list):
+            values.extend([item[0]] * item[1])
+        else:
+            values.append(item)
+    return values
+
+
+def format_series(encoded: Dict[str, Any]) -> str:
+    """Render an encoded series for a prompt, e.g. "10 0×12 45"."""
+    return " ".join(
+        f"{item[0]}×{item[1]}" if isinstance(item, list) else str(item)
+        for item in encoded["rle"]
+    )
+
+
+def gigabytes(num_bytes: float) -> float:
+    """Convert bytes to GB rounded to two decimals."""
+    return round(num_bytes / (1024**3), 2)
+
+
+def table(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> Dict[str, Any]:
+    """Build a columnar table: column names once, then one array per row."""
+    return {"columns": list(columns), "rows": [list(row) for row in rows]}
+
+
+def table_records(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Expand a columnar table into one dict per row."""
+    return [dict(zip(data["columns"], row)) for row in data["rows"]]
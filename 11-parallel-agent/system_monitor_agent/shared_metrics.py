@@ -0,0 +1,186 @@
+"""
+Shared-Memory Metrics Segment
+
+When many monitor sessions run on one host, each would poll psutil on its
+own (a CPU sampler thread, memory and disk calls). Instead, one publisher
+process (metrics_publisher.py) collects the CPU, memory and disk tool results
+once per interval and writes them as a frame into a memory-mapped file, and
+every session's tools read the latest frame from it. Reading takes a few
+memory loads and no syscall, so the host's polling cost stays that of one
+session however many sessions there are.
+
+The segment is a fixed header followed by the frame (the tool results as
+JSON). Writes are protected by a sequence lock: the writer makes the
+sequence number odd, writes the frame, then makes it even again, and a
+reader retries if the number was odd or changed while it copied the frame.
+There is a single writer, so no lock is shared between processes. This
+relies on stores and loads not being reordered around the sequence number,
+which x86 guarantees; elsewhere a torn frame would fail to parse as JSON and
+the tool would fall back to psutil for that call.
+
+Tools read the segment when SYSTEM_MONITOR_SHARED_METRICS names its path and
+the frame is younger than MAX_FRAME_AGE_SECONDS; otherwise they fall back to
+psutil, so a stopped publisher only costs the savings. A frame is copied out
+of the segment once per new frame; reads of an unchanged frame copy nothing.
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+# --- Constants ---
+SHARED_METRICS_ENV = "SYSTEM_MONITOR_SHARED_METRICS"
+SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+DEFAULT_PATH = os.path.join(SHM_DIR, "system_monitor_metrics")
+DEFAULT_CAPACITY = 1 << 20
+MAX_FRAME_AGE_SECONDS = 5.0
+MAX_READ_ATTEMPTS = 1000
+
+MAGIC = b"SMM1"
+# magic, frame capacity, sequence number, frame timestamp, frame length
+HEADER = struct.Struct("<4sIQdI")
+SEQUENCE = struct.Struct("<Q")
+SEQUENCE_OFFSET = 8
+FRAME_INFO = struct.Struct("<dI")
+FRAME_INFO_OFFSET = 16
+HEADER_SIZE = 32  # HEADER.size rounded up, so the frame starts aligned
+
+
+class SharedMetricsWriter:
+    """The single writer of a metrics segment."""
+
+    def __init__(self, path: str = DEFAULT_PATH, capacity: int = DEFAULT_CAPACITY):
+        """
+        Args:
+            path: File to map, ideally on a tmpfs such as /dev/shm
+            capacity: Largest frame in bytes
+        """
+        self.path = path
+        self.capacity = capacity
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, HEADER_SIZE + capacity)
+            self._map = mmap.mmap(fd, HEADER_SIZE + capacity)
+        finally:
+            os.close(fd)
+        # A restarted publisher continues the sequence, so readers never
+        # mistake a new frame for the one they cached
+        magic, _, sequence, _, _ = HEADER.unpack_from(self._map, 0)
+        self._sequence = (sequence + 1) & ~1 if magic == MAGIC else 0
+        HEADER.pack_into(self._map, 0, MAGIC, capacity, self._sequence, 0.0, 0)
+
+    def publish(self, frame: bytes, timestamp: Optional[float] = None) -> None:
+        """Replace the frame; readers never see a partial write."""
+        if len(frame) > self.capacity:
+            raise ValueError(
+                f"Frame of {len(frame)} bytes exceeds the segment capacity "
+                f"of {self.capacity} bytes"
+            )
+        timestamp = time.time() if timestamp is None else timestamp
+        # Odd while writing; an aligned 8-byte store is never torn
+        SEQUENCE.pack_into(self._map, SEQUENCE_OFFSET, self._sequence + 1)
+        FRAME_INFO.pack_into(self._map, FRAME_INFO_OFFSET, timestamp, len(frame))
+        self._map[HEADER_SIZE : HEADER_SIZE + len(frame)] = frame
+        self._sequence += 2
+        SEQUENCE.pack_into(self._map, SEQUENCE_OFFSET, self._sequence)
+
+    def close(self) -> None:
+        self._map.close()
+
+
+class SharedMetricsReader:
+    """Reads consistent frames from a metrics segment without locking."""
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            self._map = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+        magic, self.capacity, _, _, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a metrics segment")
+        # The last frame read, so an unchanged frame is not copied again
+        self._cached: Tuple[int, float, bytes] = (-1, 0.0, b"")
+        # Each reader is used from several tool threads at once
+        self._lock = threading.Lock()
+
+    def read(self) -> Optional[Tuple[float, bytes]]:
+        """
+        Return the latest frame and its timestamp, or None before the first.
+
+        Raises:
+            TimeoutError: The writer kept the frame busy for every attempt
+        """
+        with self._lock:
+            for _ in range(MAX_READ_ATTEMPTS):
+                _, _, sequence, timestamp, length = HEADER.unpack_from(self._map, 0)
+                if sequence & 1:
+                    time.sleep(0)  # Mid-write; let the writer finish
+                    continue
+                if sequence == self._cached[0]:
+                    return self._cached[1:] if sequence else None
+                frame = self._map[HEADER_SIZE : HEADER_SIZE + length]
+                if SEQUENCE.unpack_from(self._map, SEQUENCE_OFFSET)[0] != sequence:
+                    continue  # Overwritten while copying
+                self._cached = (sequence, timestamp, frame)
+                return (timestamp, frame) if sequence else None
+        raise TimeoutError("Metrics segment stayed busy while reading")
+
+    def close(self) -> None:
+        self._map.close()
+
+
+_reader: Optional[SharedMetricsReader] = None
+_reader_path: Optional[str] = None
+_reader_lock = threading.Lock()
+
+
+def _get_reader() -> Optional[SharedMetricsReader]:
+    """The reader for the configured segment, or None if there is none yet."""
+    global _reader, _reader_path
+    path = os.environ.get(SHARED_METRICS_ENV)
+    if not path:
+        return None
+    with _reader_lock:
+        if _reader is None or _reader_path != path:
+            try:
+                _reader = SharedMetricsReader(path)
+                _reader_path = path
+            except (OSError, ValueError):
+                return None  # Publisher not started yet; try again next call
+        return _reader
+
+
+def read_shared_metrics(section: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the published tool result for `section` ("cpu", "memory", "disk").
+
+    Returns None when no segment is configured, it has no fresh frame or the
+    frame lacks the section; the caller then collects the metrics itself.
+    """
+    reader = _get_reader()
+    if reader is None:
+        return None
+    try:
+        latest = reader.read()
+    except TimeoutError:
+        return None
+    if latest is None:
+        return None
+    timestamp, frame = latest
+    if time.time() - timestamp > MAX_FRAME_AGE_SECONDS:
+        return None
+    try:
+        result = json.loads(frame).get(section)
+    except ValueError:
+        return None
+    if result is not None:
+        result.setdefault("additional_info", {})["source"] = "shared_metrics"
+    return result
@@ -1,3 +1,11 @@
 """Subagents for the system monitor pipeline."""
 
-from . import cpu_info_agent, disk_info_agent, memory_info_agent, synthesizer_agent
+from . import (
+    cpu_info_agent,
+    disk_info_agent,
+    fleet_synthesizer_agent,
+    memory_info_agent,
+    network_info_agent,
+    process_info_agent,
+    synthesizer_agent,
+)
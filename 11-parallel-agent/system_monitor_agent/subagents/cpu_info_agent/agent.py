@@ -2,17 +2,26 @@
 CPU Information Agent
 
 This agent is responsible for gathering and analyzing CPU information.
+
+`cpu_info_agent` is a deterministic collector that renders the tool result
+from a template without a model call. The original LLM-based agent is kept
+as `cpu_info_llm_agent`.
 """
 
+from typing import Any, Dict
+
 from google.adk.agents import LlmAgent
 
+from ...collector import MetricsCollectorAgent, render_error
+from ...payload import format_series
+from ...tool_executor import blocking_tool
 from .tools import get_cpu_info
 
 # --- Constants ---
 GEMINI_MODEL = "gemini-2.0-flash"
 
-# CPU Information Agent
-cpu_info_agent = LlmAgent(
+# CPU Information Agent (LLM-based)
+cpu_info_llm_agent = LlmAgent(
     name="CpuInfoAgent",
     model=GEMINI_MODEL,
     instruction="""You are a CPU Information Agent.
@@ -27,6 +36,10 @@ cpu_info_agent = LlmAgent(
     - stats: Key statistical data about CPU usage
     - additional_info: Context about the data collection
     
+    Values are numbers in the units listed under result.units. The per-core
+    usage is run-length encoded: a [value, count] pair means `count`
+    consecutive cores at `value`.
+    
     Format your response as a well-structured report section with:
     - CPU core information (physical vs logical)
     - CPU usage statistics
@@ -35,6 +48,39 @@ cpu_info_agent = LlmAgent(
     IMPORTANT: You MUST call the get_cpu_info tool. Do not make up information.
     """,
     description="Gathers and analyzes CPU information",
-    tools=[get_cpu_info],
+    tools=[blocking_tool(get_cpu_info)],
+    output_key="cpu_info",
+)
+
+
+def render_cpu_info(data: Dict[str, Any]) -> str:
+    """Render the CPU section of the system report."""
+    if data.get("stats", {}).get("success") is False:
+        return render_error("CPU", data)
+    result = data["result"]
+    usage = result["usage"]
+    per_core = result["per_core_usage"]
+    step = f", {per_core['step']}% steps" if per_core.get("step", 1) != 1 else ""
+    concern = data["additional_info"]["performance_concern"]
+    return "\n".join(
+        [
+            "## CPU",
+            f"- Cores: {result['physical_cores']} physical, "
+            f"{result['logical_cores']} logical",
+            f"- Usage (%): {usage['avg_1s']} 1s avg, {usage['avg_5s']} 5s avg, "
+            f"{usage['avg_15s']} 15s avg, {usage['peak_15s']} 15s peak",
+            f"- Per core (%{step}, v×n = n cores at v): {format_series(per_core)}",
+            f"- Concern: {concern or 'none (usage below 80%)'}",
+        ]
+    )
+
+
+# CPU Information Agent (deterministic collector, no model call)
+cpu_info_agent = MetricsCollectorAgent(
+    name="CpuInfoAgent",
+    description="Gathers CPU information",
+    tool=blocking_tool(get_cpu_info),
+    renderer=render_cpu_info,
     output_key="cpu_info",
+    data_key="cpu_data",
 )
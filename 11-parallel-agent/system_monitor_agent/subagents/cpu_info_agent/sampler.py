@@ -0,0 +1,151 @@
+"""
+Background CPU Sampler
+
+This module provides a background thread that samples per-core and aggregate
+CPU utilization at a fixed rate into a preallocated ring buffer. Readers get
+the current value and 1/5/15-second averages and peaks without sleeping, so
+get_cpu_info no longer blocks for two seconds per call.
+"""
+
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import psutil
+
+# --- Constants ---
+SAMPLE_INTERVAL_SECONDS = 0.25
+HISTORY_SECONDS = 15
+WINDOWS_SECONDS = (1, 5, 15)
+
+
+class CpuSampler:
+    """Samples CPU utilization on a daemon thread into a fixed-size ring buffer."""
+
+    def __init__(
+        self,
+        interval: float = SAMPLE_INTERVAL_SECONDS,
+        history_seconds: float = HISTORY_SECONDS,
+    ):
+        """
+        Args:
+            interval: Seconds between samples
+            history_seconds: How much history the ring buffer keeps
+        """
+        self.interval = interval
+        self.capacity = math.ceil(history_seconds / interval) + 1
+
+        # Preallocated ring buffer, written only by the sampling thread
+        self._timestamps: List[float] = [0.0] * self.capacity
+        self._aggregate: List[float] = [0.0] * self.capacity
+        self._per_core: List[Optional[List[float]]] = [None] * self.capacity
+        self._next = 0
+        self._count = 0
+
+        self._lock = threading.Lock()
+        self._first_sample = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Sampling cost: CPU time the sampling thread spent taking samples
+        self.samples_taken = 0
+        self.sampling_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, wait_for_first_sample: bool = True) -> None:
+        """Start sampling; optionally block until the first sample exists."""
+        if self.running:
+            return
+        self._stop.clear()
+        # The first call only establishes the baseline psutil diffs against
+        psutil.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None, percpu=True)
+        self._thread = threading.Thread(
+            target=self._run, name="cpu-sampler", daemon=True
+        )
+        self._thread.start()
+        if wait_for_first_sample:
+            self._first_sample.wait(timeout=self.interval * 4)
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop the sampling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            started = time.thread_time()
+            aggregate = psutil.cpu_percent(interval=None)
+            per_core = psutil.cpu_percent(interval=None, percpu=True)
+            with self._lock:
+                self._timestamps[self._next] = time.time()
+                self._aggregate[self._next] = aggregate
+                self._per_core[self._next] = per_core
+                self._next = (self._next + 1) % self.capacity
+                self._count = min(self._count + 1, self.capacity)
+            self.samples_taken += 1
+            self.sampling_seconds += time.thread_time() - started
+            self._first_sample.set()
+
+    def snapshot(self, windows: Sequence[float] = WINDOWS_SECONDS) -> Dict[str, Any]:
+        """
+        Read the latest sample plus averages and peaks over `windows`.
+
+        Returns:
+            Dict[str, Any]: current aggregate and per-core usage, and per-window
+            aggregate averages and peaks. Empty if no sample was taken yet.
+        """
+        with self._lock:
+            count = self._count
+            if count == 0:
+                return {}
+            latest = (self._next - 1) % self.capacity
+            timestamp = self._timestamps[latest]
+            current = self._aggregate[latest]
+            per_core = self._per_core[latest]
+
+            # Walk backwards from the latest sample, once for the widest window
+            widest = max(windows)
+            recent = []
+            for offset in range(count):
+                index = (latest - offset) % self.capacity
+                age = timestamp - self._timestamps[index]
+                if age >= widest:
+                    break
+                recent.append((age, self._aggregate[index]))
+
+        averages = {}
+        peaks = {}
+        for window in windows:
+            values = [value for age, value in recent if age < window]
+            averages[window] = sum(values) / len(values)
+            peaks[window] = max(values)
+
+        return {
+            "timestamp": timestamp,
+            "current": current,
+            "per_core": per_core,
+            "averages": averages,
+            "peaks": peaks,
+        }
+
+
+_sampler: Optional[CpuSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler() -> CpuSampler:
+    """Return the shared sampler, starting it on first use."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = CpuSampler()
+        if not _sampler.running:
+            _sampler.start()
+    return _sampler
@@ -2,6 +2,10 @@
 CPU Information Tool
 
 This module provides a tool for gathering CPU information.
+
+The result is a compact numeric payload (see payload.py): usage values are
+plain numbers in the units given under "units", and per-core usage is a
+quantized, run-length encoded series.
 """
 
 import time
@@ -9,44 +13,78 @@ from typing import Any, Dict
 
 import psutil
 
+from ...payload import encode_series
+from ...shared_metrics import read_shared_metrics
+from .sampler import get_sampler
+
+# Core counts never change while the process runs
+PHYSICAL_CORES = psutil.cpu_count(logical=False)
+LOGICAL_CORES = psutil.cpu_count(logical=True)
+
+# Per-core usage is rounded to whole percent, or to 5% steps on large machines,
+# so idle and saturated cores collapse into runs
+MANY_CORES = 32
+
+
+def build_cpu_info(
+    snapshot: Dict[str, Any], physical_cores: int, logical_cores: int
+) -> Dict[str, Any]:
+    """Build the compact CPU payload from a sampler snapshot."""
+    averages = snapshot["averages"]
+    peaks = snapshot["peaks"]
+    step = 5 if (logical_cores or 0) > MANY_CORES else 1
+    return {
+        "units": {"usage": "%"},
+        "physical_cores": physical_cores,
+        "logical_cores": logical_cores,
+        "usage": {
+            "current": round(snapshot["current"], 1),
+            "avg_1s": round(averages[1], 1),
+            "avg_5s": round(averages[5], 1),
+            "avg_15s": round(averages[15], 1),
+            "peak_1s": round(peaks[1], 1),
+            "peak_5s": round(peaks[5], 1),
+            "peak_15s": round(peaks[15], 1),
+        },
+        "per_core_usage": encode_series(snapshot["per_core"], step),
+    }
+
 
 def get_cpu_info() -> Dict[str, Any]:
     """
     Gather CPU information including core count and usage.
 
+    Usage is read from the background sampler, so this returns immediately.
+
+    When a metrics publisher is running (see shared_metrics.py), its latest
+    result is returned instead of polling psutil.
+
     Returns:
         Dict[str, Any]: Dictionary with CPU information structured for ADK
     """
+    shared = read_shared_metrics("cpu")
+    if shared is not None:
+        return shared
+
     try:
+        snapshot = get_sampler().snapshot()
+        if not snapshot:
+            raise RuntimeError("CPU sampler has not produced a sample yet")
+
         # Get CPU information
-        cpu_info = {
-            "physical_cores": psutil.cpu_count(logical=False),
-            "logical_cores": psutil.cpu_count(logical=True),
-            "cpu_usage_per_core": [
-                f"Core {i}: {percentage:.1f}%"
-                for i, percentage in enumerate(
-                    psutil.cpu_percent(interval=1, percpu=True)
-                )
-            ],
-            "avg_cpu_usage": f"{psutil.cpu_percent(interval=1):.1f}%",
-        }
+        cpu_info = build_cpu_info(snapshot, PHYSICAL_CORES, LOGICAL_CORES)
 
         # Calculate some stats for the result summary
-        avg_usage = float(cpu_info["avg_cpu_usage"].strip("%"))
-        high_usage = avg_usage > 80
+        high_usage = snapshot["averages"][1] > 80
 
         # Format for ADK tool return structure
         return {
             "result": cpu_info,
-            "stats": {
-                "physical_cores": cpu_info["physical_cores"],
-                "logical_cores": cpu_info["logical_cores"],
-                "avg_usage_percentage": avg_usage,
-                "high_usage_alert": high_usage,
-            },
+            "stats": {"high_usage_alert": high_usage},
             "additional_info": {
-                "data_format": "dictionary",
+                "data_format": "compact_numeric",
                 "collection_timestamp": time.time(),
+                "sample_timestamp": snapshot["timestamp"],
                 "performance_concern": (
                     "High CPU usage detected" if high_usage else None
                 ),
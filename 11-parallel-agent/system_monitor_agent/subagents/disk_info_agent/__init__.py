@@ -1,3 +1,3 @@
 """Disk info agent for system monitoring."""
 
-from .agent import disk_info_agent
+from .agent import disk_info_agent, disk_info_llm_agent
@@ -2,17 +2,26 @@
 Disk Information Agent
 
 This agent is responsible for gathering and analyzing disk information.
+
+`disk_info_agent` is a deterministic collector that renders the tool result
+from a template without a model call. The original LLM-based agent is kept
+as `disk_info_llm_agent`.
 """
 
+from typing import Any, Dict
+
 from google.adk.agents import LlmAgent
 
+from ...collector import MetricsCollectorAgent, render_error
+from ...payload import table_records
+from ...tool_executor import blocking_tool
 from .tools import get_disk_info
 
 # --- Constants ---
 GEMINI_MODEL = "gemini-2.0-flash"
 
-# Disk Information Agent
-disk_info_agent = LlmAgent(
+# Disk Information Agent (LLM-based)
+disk_info_llm_agent = LlmAgent(
     name="DiskInfoAgent",
     model=GEMINI_MODEL,
     instruction="""You are a Disk Information Agent.
@@ -27,6 +36,9 @@ disk_info_agent = LlmAgent(
     - stats: Key statistical data about storage usage
     - additional_info: Context about the data collection
     
+    Values are numbers in the units listed under result.units. Partitions are
+    a table: result.partitions.columns names the fields of each row.
+    
     Format your response as a well-structured report section with:
     - Partition information
     - Storage capacity and usage
@@ -35,6 +47,52 @@ disk_info_agent = LlmAgent(
     IMPORTANT: You MUST call the get_disk_info tool. Do not make up information.
     """,
     description="Gathers and analyzes disk information",
-    tools=[get_disk_info],
+    tools=[blocking_tool(get_disk_info)],
+    output_key="disk_info",
+)
+
+
+def render_disk_info(data: Dict[str, Any]) -> str:
+    """Render the disk section of the system report."""
+    if data.get("stats", {}).get("success") is False:
+        return render_error("Disk", data)
+    result = data["result"]
+    total = result["total"]
+    high_usage = data["additional_info"]["high_usage_partitions"]
+    lines = [
+        "## Disk",
+        f"- Total: {total['used']} GB used of {total['total']} GB "
+        f"({total['usage']}%) across {data['stats']['partition_count']} partitions",
+    ]
+    for partition in table_records(result["partitions"]):
+        lines.append(
+            f"- {partition['mountpoint']} ({partition['device']}, "
+            f"{partition['fstype']}): {partition['used']} GB used of "
+            f"{partition['total']} GB ({partition['usage']}%)"
+        )
+    timed_out = data["additional_info"].get("timed_out_partitions")
+    if timed_out:
+        lines.append(f"- Timed out (not responding): {', '.join(timed_out)}")
+    unprobed = data["additional_info"].get("unprobed_partitions")
+    if unprobed:
+        lines.append(f"- Not probed (probe threads exhausted): {', '.join(unprobed)}")
+    lines.append(
+        "- Concern: "
+        + (
+            f"high usage on {', '.join(high_usage)}"
+            if high_usage
+            else "none (all partitions below 85%)"
+        )
+    )
+    return "\n".join(lines)
+
+
+# Disk Information Agent (deterministic collector, no model call)
+disk_info_agent = MetricsCollectorAgent(
+    name="DiskInfoAgent",
+    description="Gathers disk information",
+    tool=blocking_tool(get_disk_info),
+    renderer=render_disk_info,
     output_key="disk_info",
+    data_key="disk_data",
 )
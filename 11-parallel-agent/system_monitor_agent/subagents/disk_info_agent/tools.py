@@ -2,78 +2,123 @@
 Disk Information Tool
 
 This module provides a tool for gathering disk information.
+
+The partition table is cached and only re-read when the mount table changes,
+and usage probes fan out across a pool of daemon threads under one deadline
+shared by all mounts (see disk_probe.py), so a hung NFS or FUSE mount is
+reported as timed out instead of blocking the tool.
+
+The result is a compact numeric payload (see payload.py): partitions are a
+table of column names plus one row per partition, in the units given under
+"units".
 """
 
 import time
 from typing import Any, Dict
 
-import psutil
+from ...disk_probe import get_partitions, probe_usage
+from ...payload import gigabytes, table
+from ...shared_metrics import read_shared_metrics
+
+# --- Constants ---
+PARTITION_COLUMNS = (
+    "mountpoint",
+    "device",
+    "fstype",
+    "total",
+    "used",
+    "free",
+    "usage",
+)
 
 
 def get_disk_info() -> Dict[str, Any]:
     """
     Gather disk information including partitions and usage.
 
+    When a metrics publisher is running (see shared_metrics.py), its latest
+    result is returned instead of polling psutil.
+
     Returns:
         Dict[str, Any]: Dictionary with disk information structured for ADK
     """
+    shared = read_shared_metrics("disk")
+    if shared is not None:
+        return shared
+
     try:
         # Get disk information
-        disk_info = {"partitions": []}
+        rows = []
         partitions_over_threshold = []
         total_space = 0
         used_space = 0
 
-        for partition in psutil.disk_partitions():
-            try:
-                partition_usage = psutil.disk_usage(partition.mountpoint)
-
-                # Track high usage partitions
-                if partition_usage.percent > 85:
-                    partitions_over_threshold.append(
-                        f"{partition.mountpoint} ({partition_usage.percent:.1f}%)"
-                    )
-
-                # Add to totals
-                total_space += partition_usage.total
-                used_space += partition_usage.used
-
-                disk_info["partitions"].append(
-                    {
-                        "device": partition.device,
-                        "mountpoint": partition.mountpoint,
-                        "filesystem_type": partition.fstype,
-                        "total_size": f"{partition_usage.total / (1024 ** 3):.2f} GB",
-                        "used": f"{partition_usage.used / (1024 ** 3):.2f} GB",
-                        "free": f"{partition_usage.free / (1024 ** 3):.2f} GB",
-                        "percentage": f"{partition_usage.percent:.1f}%",
-                    }
-                )
-            except (PermissionError, FileNotFoundError):
-                # Some partitions may not be accessible
-                pass
+        partitions = get_partitions()
+        usages, timed_out_partitions, unprobed_partitions = probe_usage(
+            [partition.mountpoint for partition in partitions]
+        )
+
+        for partition in partitions:
+            partition_usage = usages.get(partition.mountpoint)
+            if partition_usage is None:
+                continue
+
+            # Track high usage partitions
+            if partition_usage.percent > 85:
+                partitions_over_threshold.append(partition.mountpoint)
+
+            # Add to totals
+            total_space += partition_usage.total
+            used_space += partition_usage.used
+
+            rows.append(
+                [
+                    partition.mountpoint,
+                    partition.device,
+                    partition.fstype,
+                    gigabytes(partition_usage.total),
+                    gigabytes(partition_usage.used),
+                    gigabytes(partition_usage.free),
+                    partition_usage.percent,
+                ]
+            )
 
         # Calculate overall disk stats
         overall_usage_percent = (
             (used_space / total_space * 100) if total_space > 0 else 0
         )
 
+        disk_info = {
+            "units": {"size": "GB", "usage": "%"},
+            "total": {
+                "total": gigabytes(total_space),
+                "used": gigabytes(used_space),
+                "usage": round(overall_usage_percent, 1),
+            },
+            "partitions": table(PARTITION_COLUMNS, rows),
+        }
+
         # Format for ADK tool return structure
         return {
             "result": disk_info,
             "stats": {
-                "partition_count": len(disk_info["partitions"]),
-                "total_space_gb": total_space / (1024**3),
-                "used_space_gb": used_space / (1024**3),
-                "overall_usage_percent": overall_usage_percent,
+                "partition_count": len(rows),
                 "partitions_with_high_usage": len(partitions_over_threshold),
+                "partitions_timed_out": len(timed_out_partitions),
+                "partitions_not_probed": len(unprobed_partitions),
             },
             "additional_info": {
-                "data_format": "dictionary",
+                "data_format": "compact_numeric",
                 "collection_timestamp": time.time(),
                 "high_usage_partitions": (
                     partitions_over_threshold if partitions_over_threshold else None
                 ),
+                "timed_out_partitions": (
+                    timed_out_partitions if timed_out_partitions else None
+                ),
+                "unprobed_partitions": (
+                    unprobed_partitions if unprobed_partitions else None
+                ),
             },
         }
     except Exception as e:
@@ -0,0 +1,3 @@
+"""Fleet report synthesizer agent for system monitoring."""
+
+from .agent import fleet_report_synthesizer
@@ -0,0 +1,38 @@
+"""
+Fleet Report Synthesizer Agent
+
+This agent is responsible for turning the aggregated fleet metrics into a
+fleet health report. It only sees fleet-wide statistics and outliers, never
+the per-host snapshots.
+"""
+
+from google.adk.agents import LlmAgent
+
+# --- Constants ---
+GEMINI_MODEL = "gemini-2.0-flash"
+
+# Fleet Report Synthesizer Agent
+fleet_report_synthesizer = LlmAgent(
+    name="FleetReportSynthesizer",
+    model=GEMINI_MODEL,
+    instruction="""You are a Fleet Report Synthesizer.
+    
+    Your task is to create a fleet health report from these aggregated metrics:
+    {fleet_info}
+    
+    The metrics are fleet-wide percentiles across all reporting hosts, the top
+    offenders per metric, the hosts over their thresholds or with disk mounts
+    not responding, and any hosts that did not respond or whose snapshot is
+    stale.
+    
+    Create a well-formatted report with:
+    1. An executive summary with the overall fleet health status
+    2. A section on fleet-wide utilization (typical host vs. the tail)
+    3. A section on outliers, and on stale and unreachable hosts
+    4. Recommendations, separating fleet-wide issues from single-host issues
+    
+    Use markdown formatting to make the report readable and professional.
+    Do not invent per-host values that are not in the metrics above.
+    """,
+    description="Synthesizes aggregated fleet metrics into a fleet health report",
+)
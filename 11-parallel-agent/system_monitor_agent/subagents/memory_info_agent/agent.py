@@ -2,17 +2,25 @@
 Memory Information Agent
 
 This agent is responsible for gathering and analyzing memory information.
+
+`memory_info_agent` is a deterministic collector that renders the tool result
+from a template without a model call. The original LLM-based agent is kept
+as `memory_info_llm_agent`.
 """
 
+from typing import Any, Dict
+
 from google.adk.agents import LlmAgent
 
+from ...collector import MetricsCollectorAgent, render_error
+from ...tool_executor import blocking_tool
 from .tools import get_memory_info
 
 # --- Constants ---
 GEMINI_MODEL = "gemini-2.0-flash"
 
-# Memory Information Agent
-memory_info_agent = LlmAgent(
+# Memory Information Agent (LLM-based)
+memory_info_llm_agent = LlmAgent(
     name="MemoryInfoAgent",
     model=GEMINI_MODEL,
     instruction="""You are a Memory Information Agent.
@@ -27,6 +35,8 @@ memory_info_agent = LlmAgent(
     - stats: Key statistical data about memory usage
     - additional_info: Context about the data collection
     
+    Values are numbers in the units listed under result.units.
+    
     Format your response as a well-structured report section with:
     - Total and available memory
     - Memory usage statistics
@@ -36,6 +46,37 @@ memory_info_agent = LlmAgent(
     IMPORTANT: You MUST call the get_memory_info tool. Do not make up information.
     """,
     description="Gathers and analyzes memory information",
-    tools=[get_memory_info],
+    tools=[blocking_tool(get_memory_info)],
+    output_key="memory_info",
+)
+
+
+def render_memory_info(data: Dict[str, Any]) -> str:
+    """Render the memory section of the system report."""
+    if data.get("stats", {}).get("success") is False:
+        return render_error("Memory", data)
+    ram = data["result"]["ram"]
+    swap = data["result"]["swap"]
+    info = data["additional_info"]
+    concerns = [c for c in (info["performance_concern"], info["swap_concern"]) if c]
+    return "\n".join(
+        [
+            "## Memory",
+            f"- RAM: {ram['used']} GB used of {ram['total']} GB "
+            f"({ram['usage']}%), {ram['available']} GB available",
+            f"- Swap: {swap['used']} GB used of {swap['total']} GB "
+            f"({swap['usage']}%)",
+            f"- Concern: {'; '.join(concerns) or 'none (usage below 80%)'}",
+        ]
+    )
+
+
+# Memory Information Agent (deterministic collector, no model call)
+memory_info_agent = MetricsCollectorAgent(
+    name="MemoryInfoAgent",
+    description="Gathers memory information",
+    tool=blocking_tool(get_memory_info),
+    renderer=render_memory_info,
     output_key="memory_info",
+    data_key="memory_data",
 )
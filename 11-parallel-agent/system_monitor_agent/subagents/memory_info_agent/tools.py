@@ -2,6 +2,9 @@
 Memory Information Tool
 
 This module provides a tool for gathering memory information.
+
+The result is a compact numeric payload (see payload.py) with its units
+given under "units".
 """
 
 import time
@@ -9,46 +12,57 @@ from typing import Any, Dict
 
 import psutil
 
+from ...payload import gigabytes
+from ...shared_metrics import read_shared_metrics
+
 
 def get_memory_info() -> Dict[str, Any]:
     """
     Gather memory information including RAM and swap usage.
 
+    When a metrics publisher is running (see shared_metrics.py), its latest
+    result is returned instead of polling psutil.
+
     Returns:
         Dict[str, Any]: Dictionary with memory information structured for ADK
     """
+    shared = read_shared_metrics("memory")
+    if shared is not None:
+        return shared
+
     try:
         # Get memory information
         memory = psutil.virtual_memory()
         swap = psutil.swap_memory()
 
         memory_info = {
-            "total_memory": f"{memory.total / (1024 ** 3):.2f} GB",
-            "available_memory": f"{memory.available / (1024 ** 3):.2f} GB",
-            "used_memory": f"{memory.used / (1024 ** 3):.2f} GB",
-            "memory_percentage": f"{memory.percent:.1f}%",
-            "swap_total": f"{swap.total / (1024 ** 3):.2f} GB",
-            "swap_used": f"{swap.used / (1024 ** 3):.2f} GB",
-            "swap_percentage": f"{swap.percent:.1f}%",
+            "units": {"size": "GB", "usage": "%"},
+            "ram": {
+                "total": gigabytes(memory.total),
+                "used": gigabytes(memory.used),
+                "available": gigabytes(memory.available),
+                "usage": memory.percent,
+            },
+            "swap": {
+                "total": gigabytes(swap.total),
+                "used": gigabytes(swap.used),
+                "usage": swap.percent,
+            },
         }
 
         # Calculate stats
-        memory_usage = memory.percent
-        swap_usage = swap.percent
-        high_memory_usage = memory_usage > 80
-        high_swap_usage = swap_usage > 80
+        high_memory_usage = memory.percent > 80
+        high_swap_usage = swap.percent > 80
 
         # Format for ADK tool return structure
         return {
             "result": memory_info,
             "stats": {
-                "memory_usage_percentage": memory_usage,
-                "swap_usage_percentage": swap_usage,
-                "total_memory_gb": memory.total / (1024**3),
-                "available_memory_gb": memory.available / (1024**3),
+                "high_memory_usage": high_memory_usage,
+                "high_swap_usage": high_swap_usage,
             },
             "additional_info": {
-                "data_format": "dictionary",
+                "data_format": "compact_numeric",
                 "collection_timestamp": time.time(),
                 "performance_concern": (
                     "High memory usage detected" if high_memory_usage else None
@@ -0,0 +1,3 @@
+"""Network info agent for system monitoring."""
+
+from .agent import network_info_agent
@@ -0,0 +1,93 @@
+"""
+Network Information Agent
+
+This agent is responsible for gathering per-interface network throughput,
+packet, error and drop rates. It is a deterministic collector without a model
+call.
+"""
+
+from typing import Any, Dict
+
+from ...collector import MetricsCollectorAgent, render_error
+from ...payload import table_records
+from ...tool_executor import blocking_tool
+from .tools import ERROR_RATE_THRESHOLD, SATURATION_PERCENT, get_network_info
+
+# Interfaces that are down are named up to this many, then counted
+MAX_LISTED_DOWN = 5
+
+
+def _format_busiest(data: Dict[str, Any]) -> str:
+    interfaces = table_records(data)
+    if not interfaces:
+        return "all idle"
+    return ", ".join(
+        f"{interface['interface']} {interface['rx']}/{interface['tx']}"
+        + (
+            f" ({interface['utilization']}% of link)"
+            if interface["utilization"] is not None
+            else ""
+        )
+        for interface in interfaces
+    )
+
+
+def render_network_info(data: Dict[str, Any]) -> str:
+    """Render the network section of the system report."""
+    if data.get("stats", {}).get("success") is False:
+        return render_error("Network", data)
+    result = data["result"]
+    total = result["total"]
+    window = result["window_seconds"]
+    basis = "averaged since boot" if window is None else f"over the last {window}s"
+    down = result["interfaces_down"]
+    listed_down = ", ".join(down[:MAX_LISTED_DOWN])
+    if len(down) > MAX_LISTED_DOWN:
+        listed_down += f" and {len(down) - MAX_LISTED_DOWN} more"
+    lines = [
+        "## Network",
+        f"- {result['interface_count']} interfaces "
+        f"({result['virtual_interfaces']} virtual, {len(down)} down"
+        + (f": {listed_down}" if down else "")
+        + f"); rates {basis}",
+        f"- Total: {total['rx']} KB/s in, {total['tx']} KB/s out, "
+        f"{total['rx_packets']}/{total['tx_packets']} packets/s in/out, "
+        f"{total['errors']} errors/s, {total['drops']} drops/s",
+        f"- Busiest (KB/s in/out): {_format_busiest(result['top_interfaces'])}",
+    ]
+    for interface in table_records(result["error_interfaces"]):
+        lines.append(
+            f"- {interface['interface']}: {interface['errors']} errors/s, "
+            f"{interface['drops']} drops/s"
+        )
+
+    concerns = []
+    saturated = data["additional_info"]["saturated_interfaces"]
+    if saturated:
+        concerns.append(
+            f"above {SATURATION_PERCENT}% of link speed on {', '.join(saturated)}"
+        )
+    if data["stats"]["interfaces_with_errors"]:
+        concerns.append(
+            f"errors or drops on {data['stats']['interfaces_with_errors']} interfaces"
+        )
+    lines.append(
+        "- Concern: "
+        + (
+            "; ".join(concerns)
+            or f"none (links below {SATURATION_PERCENT}%, errors and drops below "
+            f"{ERROR_RATE_THRESHOLD:g}/s)"
+        )
+    )
+    return "\n".join(lines)
+
+
+# Network Information Agent (deterministic collector, no model call)
+network_info_agent = MetricsCollectorAgent(
+    name="NetworkInfoAgent",
+    description="Gathers per-interface network throughput, errors and drops",
+    tool=blocking_tool(get_network_info),
+    renderer=render_network_info,
+    output_key="network_info",
+    data_key="network_data",
+)
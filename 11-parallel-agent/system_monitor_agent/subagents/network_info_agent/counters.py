@@ -0,0 +1,187 @@
+"""
+Network Counter Deltas
+
+This module keeps the previous psutil.net_io_counters(pernic=True) snapshot
+and turns the next one into per-interface bytes, packets, errors and drops
+per second, so a call never has to sleep to measure a rate. The first call
+has no previous snapshot and reports averages since boot instead.
+
+Interface metadata (link state, speed, whether the interface is virtual)
+changes rarely but costs a call per interface to read, so it is cached for
+METADATA_TTL_SECONDS and only refreshed early when a new interface appears.
+One counters read is a single parse of /proc/net/dev on Linux, which keeps a
+call cheap on hosts with hundreds of virtual interfaces, most of them idle:
+an interface whose counters did not move costs one tuple comparison.
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+import psutil
+
+# --- Constants ---
+METADATA_TTL_SECONDS = 60.0
+# A new baseline is only taken once this much time has passed, so two calls
+# in quick succession do not measure rates over a few milliseconds
+MIN_WINDOW_SECONDS = 1.0
+VIRTUAL_NET_DIR = "/sys/devices/virtual/net"
+
+
+class InterfaceRates(NamedTuple):
+    """Per-second rates of one interface."""
+
+    rx_bytes: float
+    tx_bytes: float
+    rx_packets: float
+    tx_packets: float
+    errors: float
+    drops: float
+
+
+# Shared by every interface whose counters did not move, which lets callers
+# skip idle interfaces with an identity check
+IDLE = InterfaceRates(0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+
+class InterfaceInfo(NamedTuple):
+    """Cached metadata of one interface."""
+
+    is_up: bool
+    speed_mbps: int
+    """Link speed in Mb/s; 0 when unknown (common for virtual interfaces)."""
+    loopback: bool
+    virtual: bool
+
+
+def _totals(counters) -> Tuple[int, ...]:
+    return (
+        counters.bytes_recv,
+        counters.bytes_sent,
+        counters.packets_recv,
+        counters.packets_sent,
+        counters.errin + counters.errout,
+        counters.dropin + counters.dropout,
+    )
+
+
+def _read_metadata() -> Dict[str, InterfaceInfo]:
+    virtual = (
+        set(os.listdir(VIRTUAL_NET_DIR)) if os.path.isdir(VIRTUAL_NET_DIR) else set()
+    )
+    return {
+        name: InterfaceInfo(
+            is_up=stats.isup,
+            speed_mbps=stats.speed,
+            loopback="loopback" in getattr(stats, "flags", "") or name == "lo",
+            virtual=name in virtual,
+        )
+        for name, stats in psutil.net_if_stats().items()
+    }
+
+
+class NetworkCounters:
+    """Turns consecutive interface counter snapshots into rates."""
+
+    def __init__(
+        self,
+        read_counters: Optional[Callable[[], Dict[str, Tuple[int, ...]]]] = None,
+        read_metadata: Callable[[], Dict[str, InterfaceInfo]] = _read_metadata,
+        metadata_ttl: float = METADATA_TTL_SECONDS,
+        min_window: float = MIN_WINDOW_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            read_counters: Returns per-interface totals in InterfaceRates
+                order; psutil's counters when None
+            read_metadata: Returns per-interface metadata
+            metadata_ttl: Seconds the metadata is cached
+            min_window: Minimum seconds between two baselines
+            clock: Time source, replaceable for benchmarks
+        """
+        self.read_counters = read_counters or self._read_psutil_counters
+        self.read_metadata = read_metadata
+        self.metadata_ttl = metadata_ttl
+        self.min_window = min_window
+        self.clock = clock
+
+        self._baseline: Dict[str, Tuple[int, ...]] = {}
+        self._baseline_at: Optional[float] = None
+        self._metadata: Dict[str, InterfaceInfo] = {}
+        self._metadata_at: Optional[float] = None
+        # Names known at the last refresh, including any without metadata
+        self._known_names: frozenset = frozenset()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _read_psutil_counters() -> Dict[str, Tuple[int, ...]]:
+        return {
+            name: _totals(counters)
+            for name, counters in psutil.net_io_counters(pernic=True).items()
+        }
+
+    def rates(self) -> Tuple[Dict[str, InterfaceRates], Optional[float]]:
+        """
+        Return per-interface rates and the window they cover in seconds.
+
+        The window is None when the rates are averages since boot.
+        """
+        counters = self.read_counters()
+        now = self.clock()
+        with self._lock:
+            if self._baseline_at is None:
+                baseline = dict.fromkeys(counters, (0,) * len(InterfaceRates._fields))
+                window = None
+                elapsed = max(time.time() - psutil.boot_time(), 1.0)
+            else:
+                baseline = self._baseline
+                window = elapsed = max(now - self._baseline_at, 1e-3)
+            if window is None or window >= self.min_window:
+                self._baseline = counters
+                self._baseline_at = now
+
+        rates = {}
+        for name, totals in counters.items():
+            previous = baseline.get(name)
+            if previous is None:
+                continue  # Appeared since the baseline; measured from the next call
+            if totals == previous:
+                rates[name] = IDLE
+                continue
+            deltas = [current - before for current, before in zip(totals, previous)]
+            if min(deltas) < 0:
+                continue  # Counters reset (interface recreated or wrapped)
+            rates[name] = InterfaceRates(*(delta / elapsed for delta in deltas))
+        return rates, window
+
+    def metadata(self, names) -> Dict[str, InterfaceInfo]:
+        """Return cached metadata, refreshed when stale or a name is unknown."""
+        now = self.clock()
+        with self._lock:
+            stale = (
+                self._metadata_at is None
+                or now - self._metadata_at >= self.metadata_ttl
+                or not self._known_names.issuperset(names)
+            )
+        if stale:
+            metadata = self.read_metadata()
+            with self._lock:
+                self._metadata = metadata
+                self._metadata_at = now
+                self._known_names = frozenset(names) | frozenset(metadata)
+        return self._metadata
+
+
+_counters: Optional[NetworkCounters] = None
+_counters_lock = threading.Lock()
+
+
+def get_counters() -> NetworkCounters:
+    """Return the shared counter tracker."""
+    global _counters
+    with _counters_lock:
+        if _counters is None:
+            _counters = NetworkCounters()
+    return _counters
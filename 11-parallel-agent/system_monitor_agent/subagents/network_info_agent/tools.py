@@ -0,0 +1,171 @@
+"""
+Network Information Tool
+
+This module provides a tool for gathering per-interface network throughput,
+packet, error and drop rates. Rates come from the deltas between consecutive
+counter snapshots (see counters.py), so the tool returns immediately.
+
+The result is a compact numeric payload (see payload.py): totals over all
+non-loopback interfaces, plus tables of the busiest interfaces and of the
+interfaces with errors or drops, in the units given under "units". Hosts
+with hundreds of virtual interfaces only list the top N.
+"""
+
+import heapq
+import time
+from typing import Any, Dict
+
+from ...payload import table
+from .counters import IDLE, InterfaceInfo, InterfaceRates, get_counters
+
+INTERFACE_COLUMNS = (
+    "interface",
+    "rx",
+    "tx",
+    "rx_packets",
+    "tx_packets",
+    "errors",
+    "drops",
+    "utilization",
+)
+MAX_TOP_N = 25
+# A link is saturated above this share of its speed, in either direction
+SATURATION_PERCENT = 80
+# Errors plus drops per second at which an interface is a concern
+ERROR_RATE_THRESHOLD = 1.0
+
+UNKNOWN_INTERFACE = InterfaceInfo(
+    is_up=True, speed_mbps=0, loopback=False, virtual=False
+)
+
+
+def _utilization(rates: InterfaceRates, info: InterfaceInfo):
+    """Busiest direction as a percentage of the link speed, if known."""
+    if not info.speed_mbps:
+        return None
+    busiest_bits = max(rates.rx_bytes, rates.tx_bytes) * 8
+    return busiest_bits / (info.speed_mbps * 1e6) * 100
+
+
+def _row(name: str, rates: InterfaceRates, utilization) -> list:
+    return [
+        name,
+        round(rates.rx_bytes / 1024, 1),
+        round(rates.tx_bytes / 1024, 1),
+        round(rates.rx_packets, 1),
+        round(rates.tx_packets, 1),
+        round(rates.errors, 2),
+        round(rates.drops, 2),
+        round(utilization, 1) if utilization is not None else None,
+    ]
+
+
+def get_network_info(top_n: int = 5) -> Dict[str, Any]:
+    """
+    Gather per-interface network throughput, packets, errors and drops.
+
+    Args:
+        top_n: How many interfaces to list by throughput and by errors (at most 25)
+
+    Returns:
+        Dict[str, Any]: Dictionary with network information structured for ADK
+    """
+    try:
+        counters = get_counters()
+        rates, window = counters.rates()
+        metadata = counters.metadata(rates)
+        top_n = max(1, min(int(top_n), MAX_TOP_N))
+
+        # Loopback traffic never leaves the host
+        interfaces = {
+            name: (interface_rates, metadata.get(name, UNKNOWN_INTERFACE))
+            for name, interface_rates in rates.items()
+            if not metadata.get(name, UNKNOWN_INTERFACE).loopback
+        }
+        # Only interfaces with traffic can be busy, saturated or erroring
+        active = [
+            name
+            for name, (interface_rates, _) in interfaces.items()
+            if interface_rates is not IDLE
+        ]
+        utilization = dict.fromkeys(interfaces)
+        for name in active:
+            utilization[name] = _utilization(*interfaces[name])
+
+        def throughput(name):
+            return interfaces[name][0].rx_bytes + interfaces[name][0].tx_bytes
+
+        def error_rate(name):
+            return interfaces[name][0].errors + interfaces[name][0].drops
+
+        busiest = heapq.nlargest(top_n, active, key=throughput)
+        erroring = [name for name in active if error_rate(name) >= ERROR_RATE_THRESHOLD]
+        worst_errors = heapq.nlargest(top_n, erroring, key=error_rate)
+        saturated = sorted(
+            name
+            for name in active
+            if utilization[name] is not None and utilization[name] > SATURATION_PERCENT
+        )
+
+        sums = [0.0] * len(InterfaceRates._fields)
+        for name in active:
+            sums = [a + b for a, b in zip(sums, interfaces[name][0])]
+        total = InterfaceRates(*sums)
+
+        def rows(names):
+            return (
+                _row(name, interfaces[name][0], utilization[name]) for name in names
+            )
+
+        # Get network information
+        network_info = {
+            "units": {
+                "rx": "KB/s",
+                "tx": "KB/s",
+                "packets": "per second",
+                "errors": "per second",
+                "drops": "per second",
+                "utilization": "% of link speed",
+            },
+            "interface_count": len(interfaces),
+            "virtual_interfaces": sum(info.virtual for _, info in interfaces.values()),
+            "interfaces_down": sorted(
+                name for name, (_, info) in interfaces.items() if not info.is_up
+            ),
+            "window_seconds": round(window, 1) if window is not None else None,
+            "total": {
+                "rx": round(total.rx_bytes / 1024, 1),
+                "tx": round(total.tx_bytes / 1024, 1),
+                "rx_packets": round(total.rx_packets, 1),
+                "tx_packets": round(total.tx_packets, 1),
+                "errors": round(total.errors, 2),
+                "drops": round(total.drops, 2),
+            },
+            "top_interfaces": table(INTERFACE_COLUMNS, rows(busiest)),
+            "error_interfaces": table(INTERFACE_COLUMNS, rows(worst_errors)),
+        }
+
+        # Format for ADK tool return structure
+        return {
+            "result": network_info,
+            "stats": {
+                "interfaces_with_errors": len(erroring),
+                "saturated_interfaces": len(saturated),
+            },
+            "additional_info": {
+                "data_format": "compact_numeric",
+                "collection_timestamp": time.time(),
+                "rate_basis": (
+                    "delta since previous call"
+                    if window is not None
+                    else "average since boot"
+                ),
+                "saturated_interfaces": saturated or None,
+            },
+        }
+    except Exception as e:
+        return {
+            "result": {"error": f"Failed to gather network information: {str(e)}"},
+            "stats": {"success": False},
+            "additional_info": {"error_type": str(type(e).__name__)},
+        }
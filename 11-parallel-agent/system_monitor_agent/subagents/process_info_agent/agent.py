@@ -0,0 +1,58 @@
+"""
+Process Information Agent
+
+This agent is responsible for listing the processes that use the most CPU,
+memory and I/O, so a report that shows high usage can say which process is
+responsible. It is a deterministic collector without a model call.
+"""
+
+from typing import Any, Dict
+
+from ...collector import MetricsCollectorAgent, render_error
+from ...payload import table_records
+from ...tool_executor import blocking_tool
+from .tools import get_process_info
+
+
+def _format_top(data: Dict[str, Any], field: str) -> str:
+    processes = table_records(data)
+    if not processes:
+        return "not available"
+    return ", ".join(
+        f"{process['name']} ({process['pid']}) {process[field]}"
+        for process in processes
+    )
+
+
+def render_process_info(data: Dict[str, Any]) -> str:
+    """Render the top processes section of the system report."""
+    if data.get("stats", {}).get("success") is False:
+        return render_error("Processes", data)
+    result = data["result"]
+    window = result["cpu_window_seconds"]
+    if window is None:
+        basis = "averaged since start"
+    else:
+        basis = f"over the last {window}s"
+    lines = [
+        "## Processes",
+        f"- {result['process_count']} processes; CPU {basis}",
+        f"- Top CPU (% of one core): {_format_top(result['top_cpu'], 'cpu')}",
+        f"- Top memory (MB RSS): {_format_top(result['top_memory'], 'rss')}",
+        f"- Top I/O (KB/s): {_format_top(result['top_io'], 'io')}",
+    ]
+    hidden = data["stats"]["processes_without_io_access"]
+    if hidden:
+        lines.append(f"- I/O not readable for {hidden} processes (no permission)")
+    return "\n".join(lines)
+
+
+# Process Information Agent (deterministic collector, no model call)
+process_info_agent = MetricsCollectorAgent(
+    name="ProcessInfoAgent",
+    description="Lists the top processes by CPU, memory and I/O",
+    tool=blocking_tool(get_process_info),
+    renderer=render_process_info,
+    output_key="process_info",
+    data_key="process_data",
+)
@@ -0,0 +1,187 @@
+"""
+Background Process Inspector
+
+This module provides a background thread that scans the process table with
+psutil.process_iter and a batched attrs list (read under oneshot(), so each
+process's /proc files are read once per scan). CPU and I/O rates come from
+the deltas between consecutive scans, so no call has to sleep, and the top-N
+processes by CPU, RSS and I/O are selected with a heap once per scan.
+
+Readers only copy the latest selection, which keeps get_process_info well
+under a millisecond even when a scan of a 10k-process host takes far longer.
+"""
+
+import heapq
+import threading
+import time
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
+
+import psutil
+
+# --- Constants ---
+SCAN_INTERVAL_SECONDS = 5.0
+# Scans back off so they use at most this share of one core
+MAX_SCAN_DUTY = 0.1
+MAX_TOP_N = 25
+FIRST_SCAN_TIMEOUT_SECONDS = 10.0
+PROCESS_ATTRS = [
+    "pid",
+    "name",
+    "create_time",
+    "cpu_times",
+    "memory_info",
+    "io_counters",
+]
+
+# A selected process: (pid, name, cpu percent, rss bytes, io bytes per second)
+ProcessRow = Tuple[int, str, float, int, Optional[float]]
+
+
+class ProcessInspector:
+    """Scans processes on a daemon thread and keeps the top-N per resource."""
+
+    def __init__(self, interval: float = SCAN_INTERVAL_SECONDS, top_n: int = MAX_TOP_N):
+        """
+        Args:
+            interval: Seconds between scans (longer if a scan is slow)
+            top_n: How many processes to keep per resource
+        """
+        self.interval = interval
+        self.top_n = top_n
+
+        # CPU and I/O totals from the previous scan, keyed by (pid, create_time)
+        # so a reused pid is not diffed against another process
+        self._previous: Dict[Tuple[int, float], Tuple[float, Optional[int]]] = {}
+        self._previous_at = 0.0
+        self._snapshot: Dict[str, Any] = {}
+
+        self._lock = threading.Lock()
+        self._first_scan = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.scans_taken = 0
+        self.last_scan_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(
+        self,
+        wait_for_first_scan: bool = True,
+        timeout: float = FIRST_SCAN_TIMEOUT_SECONDS,
+    ) -> None:
+        """Start scanning; optionally block until the first scan is done."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="process-inspector", daemon=True
+        )
+        self._thread.start()
+        if wait_for_first_scan:
+            self.wait_until_ready(timeout)
+
+    def wait_until_ready(self, timeout: float = FIRST_SCAN_TIMEOUT_SECONDS) -> bool:
+        """Block until the first scan is done; returns False on timeout."""
+        return self._first_scan.wait(timeout)
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop the scanning thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            self.scan()
+            self._first_scan.set()
+            delay = max(self.interval, self.last_scan_seconds / MAX_SCAN_DUTY)
+            if self._stop.wait(delay):
+                return
+
+    def scan(self) -> Dict[str, Any]:
+        """Scan the process table once and publish the new top-N selection."""
+        started = time.perf_counter()
+        now = time.monotonic()
+        wall = time.time()
+        elapsed = now - self._previous_at if self._previous else None
+
+        current = {}
+        rows: List[ProcessRow] = []
+        for process in psutil.process_iter(PROCESS_ATTRS, ad_value=None):
+            info = process.info
+            cpu_times = info["cpu_times"]
+            if cpu_times is None:
+                continue
+            cpu_total = cpu_times.user + cpu_times.system
+            io = info["io_counters"]
+            io_total = io.read_bytes + io.write_bytes if io is not None else None
+            create_time = info["create_time"] or wall
+            key = (info["pid"], create_time)
+            current[key] = (cpu_total, io_total)
+
+            before = self._previous.get(key)
+            if before is not None:
+                span = elapsed
+                cpu_total -= before[0]
+                if io_total is not None and before[1] is not None:
+                    io_total -= before[1]
+            else:
+                # First scan, or a process started since: average over its life
+                span = max(wall - create_time, 1e-3)
+
+            memory = info["memory_info"]
+            rows.append(
+                (
+                    info["pid"],
+                    info["name"] or "?",
+                    cpu_total / span * 100,
+                    memory.rss if memory is not None else 0,
+                    io_total / span if io_total is not None else None,
+                )
+            )
+
+        with_io = [row for row in rows if row[4] is not None]
+        snapshot = {
+            "timestamp": wall,
+            "process_count": len(rows),
+            "processes_without_io_access": len(rows) - len(with_io),
+            "cpu_window_seconds": elapsed,
+            "top_cpu": heapq.nlargest(self.top_n, rows, key=itemgetter(2)),
+            "top_memory": heapq.nlargest(self.top_n, rows, key=itemgetter(3)),
+            "top_io": heapq.nlargest(self.top_n, with_io, key=itemgetter(4)),
+        }
+        self._previous = current
+        self._previous_at = now
+        self.last_scan_seconds = time.perf_counter() - started
+        snapshot["scan_seconds"] = self.last_scan_seconds
+        self.scans_taken += 1
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the latest selection; empty if no scan has finished yet."""
+        with self._lock:
+            return self._snapshot
+
+
+_inspector: Optional[ProcessInspector] = None
+_inspector_lock = threading.Lock()
+
+
+def get_inspector(wait_for_first_scan: bool = True) -> ProcessInspector:
+    """Return the shared inspector, starting it on first use."""
+    global _inspector
+    with _inspector_lock:
+        if _inspector is None:
+            _inspector = ProcessInspector()
+        if not _inspector.running:
+            _inspector.start(wait_for_first_scan=False)
+    if wait_for_first_scan:
+        _inspector.wait_until_ready()
+    return _inspector
@@ -0,0 +1,84 @@
+"""
+Process Information Tool
+
+This module provides a tool for finding the processes that use the most CPU,
+memory and I/O. It reads the latest scan of the background process inspector.
+
+The result is a compact numeric payload (see payload.py): each top-N list is
+a table of column names plus one row per process, in the units given under
+"units".
+"""
+
+import time
+from typing import Any, Dict
+
+from ...payload import table
+from .inspector import MAX_TOP_N, ProcessRow, get_inspector
+
+PROCESS_COLUMNS = ("pid", "name", "cpu", "rss", "io")
+
+
+def _row(process: ProcessRow) -> list:
+    pid, name, cpu, rss, io = process
+    return [
+        pid,
+        name,
+        round(cpu, 1),
+        round(rss / (1024**2), 1),
+        round(io / 1024, 1) if io is not None else None,
+    ]
+
+
+def get_process_info(top_n: int = 5) -> Dict[str, Any]:
+    """
+    Find the top processes by CPU usage, resident memory and disk I/O.
+
+    Args:
+        top_n: How many processes to list per resource (at most 25)
+
+    Returns:
+        Dict[str, Any]: Dictionary with process information structured for ADK
+    """
+    try:
+        snapshot = get_inspector().snapshot()
+        if not snapshot:
+            raise RuntimeError("Process inspector has not completed a scan yet")
+        top_n = max(1, min(int(top_n), MAX_TOP_N))
+        window = snapshot["cpu_window_seconds"]
+
+        # Get process information
+        process_info = {
+            "units": {"cpu": "% of one core", "rss": "MB", "io": "KB/s"},
+            "process_count": snapshot["process_count"],
+            "cpu_window_seconds": round(window, 1) if window is not None else None,
+            "top_cpu": table(PROCESS_COLUMNS, map(_row, snapshot["top_cpu"][:top_n])),
+            "top_memory": table(
+                PROCESS_COLUMNS, map(_row, snapshot["top_memory"][:top_n])
+            ),
+            "top_io": table(PROCESS_COLUMNS, map(_row, snapshot["top_io"][:top_n])),
+        }
+
+        # Format for ADK tool return structure
+        return {
+            "result": process_info,
+            "stats": {
+                "scan_seconds": snapshot["scan_seconds"],
+                "processes_without_io_access": snapshot["processes_without_io_access"],
+            },
+            "additional_info": {
+                "data_format": "compact_numeric",
+                "collection_timestamp": time.time(),
+                "sample_timestamp": snapshot["timestamp"],
+                "cpu_basis": (
+                    "delta since previous scan"
+                    if window is not None
+                    else "average since start"
+                ),
+            },
+        }
+    except Exception as e:
+        return {
+            "result": {"error": f"Failed to gather process information: {str(e)}"},
+            "stats": {"success": False},
+            "additional_info": {"error_type": str(type(e).__name__)},
+        }
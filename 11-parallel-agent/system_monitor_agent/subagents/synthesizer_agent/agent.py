@@ -3,10 +3,16 @@ System Report Synthesizer Agent
 
 This agent is responsible for synthesizing information from other agents
 to create a comprehensive system health report.
+
+When no collector flagged a concern, the healthy report is rendered from a
+template instead (see healthy_report.py) and the model is not called.
 """
 
 from google.adk.agents import LlmAgent
 
+from .healthy_report import healthy_report_fast_path
+from .tools import get_metric_trends
+
 # --- Constants ---
 GEMINI_MODEL = "gemini-2.0-flash"
 
@@ -20,6 +26,15 @@ system_report_synthesizer = LlmAgent(
     - CPU information: {cpu_info}
     - Memory information: {memory_info}
     - Disk information: {disk_info}
+    - Network information: {network_info}
+    - Top processes: {process_info}
+    
+    Call the 'get_metric_trends' tool (default window: 60 minutes) to see how
+    these metrics have moved over time. Use the trend labels and slopes to tell
+    a short spike from a sustained trend, and mention the trend in each section.
+    
+    When CPU, memory or disk I/O is high, name the top processes responsible.
+    When a network link is saturated or has errors or drops, name the interface.
     
     Create a well-formatted report with:
     1. An executive summary at the top with overall system health status
@@ -30,4 +45,6 @@ system_report_synthesizer = LlmAgent(
     Highlight any concerning values and provide practical recommendations.
     """,
     description="Synthesizes all system information into a comprehensive report",
+    tools=[get_metric_trends],
+    before_model_callback=healthy_report_fast_path,
 )
@@ -0,0 +1,128 @@
+"""
+Healthy System Report Template
+
+Most runs find a healthy machine, and the report for one is always the same
+shape. This module renders that report from the collected sections without
+a model call, and the synthesizer's before_model_callback serves it whenever
+no concern flag is set in the collectors' results. The LLM only writes the
+report when there is something to explain.
+
+The template follows the structure the synthesizer instruction asks for (see
+REPORT_SECTIONS): an executive summary, one section per component and
+recommendations.
+"""
+
+from typing import Any, List, Mapping, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+# --- Constants ---
+REPORT_TITLE = "# System Health Report"
+# Headings of the report, in order; the component sections come from the collectors
+REPORT_SECTIONS = [
+    "Executive Summary",
+    "CPU",
+    "Memory",
+    "Disk",
+    "Network",
+    "Processes",
+    "Recommendations",
+]
+# (state key of the rendered section, state key of the tool result, name)
+COMPONENTS = [
+    ("cpu_info", "cpu_data", "CPU"),
+    ("memory_info", "memory_data", "Memory"),
+    ("disk_info", "disk_data", "Disk"),
+    ("network_info", "network_data", "Network"),
+    ("process_info", "process_data", "Processes"),
+]
+# Concern flags in each tool's stats; disk counts are concerns when non-zero
+CONCERN_FLAGS = {
+    "cpu_data": ["high_usage_alert"],
+    "memory_data": ["high_memory_usage", "high_swap_usage"],
+    "disk_data": [
+        "partitions_with_high_usage",
+        "partitions_timed_out",
+        "partitions_not_probed",
+    ],
+    "network_data": ["saturated_interfaces", "interfaces_with_errors"],
+    "process_data": [],
+}
+
+
+def find_concerns(state: Mapping[str, Any]) -> List[str]:
+    """
+    List the reasons the report needs the LLM synthesizer.
+
+    A component counts as a concern when a concern flag is set, its tool
+    failed, or its result is missing (e.g. an LLM-based collector ran).
+    """
+    concerns = []
+    for section_key, data_key, name in COMPONENTS:
+        data = state.get(data_key)
+        if not data or section_key not in state:
+            concerns.append(f"{name}: no collected data")
+            continue
+        stats = data.get("stats", {})
+        if stats.get("success") is False:
+            concerns.append(f"{name}: collection failed")
+            continue
+        concerns.extend(
+            f"{name}: {flag}" for flag in CONCERN_FLAGS[data_key] if stats.get(flag)
+        )
+    return concerns
+
+
+def render_healthy_report(state: Mapping[str, Any]) -> str:
+    """Render the report for a system with no concern flags set."""
+    cpu = state["cpu_data"]["result"]["usage"]
+    ram = state["memory_data"]["result"]["ram"]
+    swap = state["memory_data"]["result"]["swap"]
+    disk = state["disk_data"]["result"]
+    usage_column = disk["partitions"]["columns"].index("usage")
+    fullest = max(
+        (row[usage_column] for row in disk["partitions"]["rows"]),
+        default=disk["total"]["usage"],
+    )
+    sections = [
+        REPORT_TITLE,
+        "\n".join(
+            [
+                "## Executive Summary",
+                "**Overall status: Healthy.** All metrics are below their alert "
+                "thresholds: CPU at "
+                f"{cpu['avg_1s']}% (1s avg, threshold 80%), memory at "
+                f"{ram['usage']}% and swap at {swap['usage']}% (threshold 80%), "
+                f"fullest partition at {fullest}% (threshold 85%). "
+                "No partition timed out, and no network link is saturated or "
+                "has errors or drops.",
+            ]
+        ),
+    ]
+    sections.extend(state[section_key] for section_key, _, _ in COMPONENTS)
+    sections.append(
+        "\n".join(
+            [
+                "## Recommendations",
+                "- No action needed; keep monitoring as usual.",
+                "- This report was rendered from a template because no concern "
+                "was flagged; trends are not analyzed here.",
+            ]
+        )
+    )
+    return "\n\n".join(sections)
+
+
+def healthy_report_fast_path(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """Answer with the templated report instead of calling the model when healthy."""
+    state = callback_context.state
+    if find_concerns(state):
+        return None
+    report = render_healthy_report(state)
+    return LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text=report)])
+    )
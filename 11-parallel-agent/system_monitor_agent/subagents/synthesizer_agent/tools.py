@@ -0,0 +1,52 @@
+"""
+Metric Trend Tool
+
+This module provides a tool that reads the metrics history so the synthesizer
+can tell a short spike from a sustained trend.
+"""
+
+import time
+from typing import Any, Dict
+
+from ...metrics_history import get_recorder
+
+
+def get_metric_trends(window_minutes: int = 60) -> Dict[str, Any]:
+    """
+    Summarize CPU, memory, swap and disk usage over a recent time window.
+
+    Args:
+        window_minutes: How many minutes of history to summarize
+
+    Returns:
+        Dict[str, Any]: Per metric: current value, median (p50), p95, max,
+        moving average, slope in percentage points per hour and a
+        rising/falling/stable trend label
+    """
+    try:
+        history = get_recorder().history
+        summary = history.summarize(window_minutes * 60)
+        samples = summary.pop("samples")
+        summary.pop("window_seconds")
+
+        return {
+            "result": summary,
+            "stats": {
+                "samples": samples,
+                "window_minutes": window_minutes,
+                "history_samples": len(history),
+            },
+            "additional_info": {
+                "data_format": "dictionary",
+                "collection_timestamp": time.time(),
+                "note": (
+                    "Not enough history yet to compute trends" if samples < 2 else None
+                ),
+            },
+        }
+    except Exception as e:
+        return {
+            "result": {"error": f"Failed to compute metric trends: {str(e)}"},
+            "stats": {"success": False},
+            "additional_info": {"error_type": str(type(e).__name__)},
+        }
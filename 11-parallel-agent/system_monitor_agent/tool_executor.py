@@ -0,0 +1,94 @@
+"""
+Blocking Tool Executor
+
+ADK calls synchronous tool functions directly on the event loop, so blocking
+psutil calls inside the ParallelAgent's sub-agents run one after another.
+This module wraps tools that are declared blocking so they run in a bounded
+thread pool instead, with a timeout per tool and a cap on how many run at once.
+"""
+
+import asyncio
+import functools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+# --- Constants ---
+MAX_WORKERS = 8
+MAX_CONCURRENT_TOOLS = 8
+DEFAULT_TIMEOUT_SECONDS = 10.0
+
+_executor = ThreadPoolExecutor(
+    max_workers=MAX_WORKERS, thread_name_prefix="blocking-tool"
+)
+# One semaphore per event loop: an asyncio.Semaphore only works on the loop
+# it was first used on
+_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_slots() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slots = _slots.get(loop)
+    if slots is None:
+        slots = _slots[loop] = asyncio.Semaphore(MAX_CONCURRENT_TOOLS)
+    return slots
+
+
+def _timed_out(name: str, error: str) -> Dict[str, Any]:
+    return {
+        "result": {"error": f"{name} {error}"},
+        "stats": {"success": False},
+        "additional_info": {"error_type": "TimeoutError"},
+    }
+
+
+def blocking_tool(
+    func: Callable[..., Dict[str, Any]],
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+) -> Callable[..., Any]:
+    """
+    Declare a synchronous tool as blocking and run it off the event loop.
+
+    The returned coroutine function keeps the tool's name, docstring and
+    signature, so ADK builds the same function declaration for the model.
+
+    A tool holds its slot until its thread returns, even after the caller
+    has stopped waiting for it, so hung tools cannot queue work behind the
+    pool's busy workers. Waiting for a slot counts against the timeout.
+
+    Args:
+        func: The synchronous tool function
+        timeout: Seconds to wait for the tool before reporting a timeout
+
+    Returns:
+        An async tool function that runs `func` in the shared thread pool
+    """
+
+    @functools.wraps(func)
+    async def run_in_thread_pool(*args, **kwargs) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        slots = _get_slots()
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout)
+        except asyncio.TimeoutError:
+            return _timed_out(
+                func.__name__, f"found no free worker within {timeout:.1f}s"
+            )
+        future = loop.run_in_executor(
+            _executor, functools.partial(func, *args, **kwargs)
+        )
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            # Shielded: cancelling the wait must not free the slot early
+            return await asyncio.wait_for(
+                asyncio.shield(future), max(0.0, deadline - loop.time())
+            )
+        except asyncio.TimeoutError:
+            # The worker thread cannot be interrupted; only the wait ends
+            return _timed_out(func.__name__, f"timed out after {timeout:.1f}s")
+
+    run_in_thread_pool.is_blocking_tool = True
+    return run_in_thread_pool
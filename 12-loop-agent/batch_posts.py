@@ -0,0 +1,316 @@
+"""
+Batch Post Generation
+
+Runs the post pipeline (generate, then review and refine) for every topic
+in a JSONL file, each topic in its own session, and streams one JSONL
+result per topic as it finishes:
+
+- each input line is {"topic": "..."}, optionally with an "id",
+- --concurrency topics run at once,
+- a topic whose model call fails with a transient error (429, 5xx, a
+  timeout or a dropped connection) or is rejected by admission control
+  (linkedin_post_agent/admission.py) is retried up to --max-attempts times,
+  with exponential backoff and jitter; a retry resumes from the checkpoint
+  of the failed attempt (linkedin_post_agent/checkpoint.py), so the stages
+  it completed are not paid for again,
+- results are written in the order they finish and flushed line by line,
+  and the session of each topic is deleted once its result is written,
+- a rerun with the same --output skips the topics that already have a
+  result there, matched by id, so a batch that died picks up where it
+  stopped. Topics that failed are tried again.
+
+At the end it reports the throughput and the per-topic latency (from the
+first attempt to the result, backoff included) on stderr, where the agents'
+progress lines go too. With --scripted the pipeline runs on
+scripted_llm.ScriptedPostLlm instead of Gemini, with --error-rate of its
+calls failing with a 503, to measure the runner without a provider. With
+Gemini, each topic runs as a user of its own, so it gets the per-user
+admission control budget and the batch as a whole the global one.
+
+Usage:
+    python batch_posts.py topics.jsonl [--output posts.jsonl]
+                          [--concurrency 8] [--max-attempts 4]
+    python batch_posts.py --scripted --topics 200 [--latency 0.2]
+                          [--error-rate 0.02]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+from typing import Any, Dict, Iterator, Set
+
+from dotenv import load_dotenv
+from google.adk.runners import InMemoryRunner
+from google.genai import errors
+
+from linkedin_post_agent.admission import REJECTED_TEXT
+from linkedin_post_agent.agent import root_agent
+from linkedin_post_agent.budget import STOP_REASON_KEY
+from linkedin_post_agent.checkpoint import (
+    CheckpointStore,
+    get_checkpoint_store,
+    resume_session,
+    set_checkpoint_store,
+)
+from linkedin_post_agent.rules import post_penalty
+
+load_dotenv()
+
+# --- Constants ---
+PROMPT = "Generate a LinkedIn post about {topic}"
+# 408 Request Timeout, 429 Too Many Requests and the server errors
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 30.0
+# Bytes read at a time when looking for the end of the last complete line
+TAIL_BLOCK = 64 * 1024
+SCRIPTED_TOPICS = [
+    "what I've learned from @aiwithbrandon's Agent Development Kit tutorial",
+    "building multi-agent workflows with @aiwithbrandon's ADK course",
+    "the agent patterns in @aiwithbrandon's Agent Development Kit tutorial",
+]
+
+
+class AdmissionRejected(Exception):
+    """Admission control answered a model call in place of the model."""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether `error` is transient, so the same request may succeed later."""
+    if isinstance(error, AdmissionRejected):
+        return True
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_STATUS
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+def backoff(attempt: int) -> float:
+    """Seconds to wait before retrying after `attempt` failed attempts."""
+    ceiling = min(MAX_BACKOFF_SECONDS, BACKOFF_SECONDS * 2 ** (attempt - 1))
+    # Jitter spreads out the retries of topics that failed together
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def read_topics(args) -> Iterator[Dict[str, Any]]:
+    """The topics to run, from the input file or generated for --scripted."""
+    if args.input is None:
+        for i in range(args.topics):
+            topic = SCRIPTED_TOPICS[i % len(SCRIPTED_TOPICS)]
+            yield {"id": str(i), "topic": f"{topic} (part {i})"}
+        return
+    with open(args.input, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if not isinstance(item, dict) or not item.get("topic"):
+                raise ValueError(f"{args.input}:{line_number}: no topic")
+            item.setdefault("id", str(line_number))
+            yield item
+
+
+def is_rejected(event) -> bool:
+    """Whether `event` is admission control's reply to a rejected call."""
+    parts = event.content.parts if event.content else None
+    return bool(parts) and parts[0].text == REJECTED_TEXT
+
+
+def truncate_partial_line(path: str) -> None:
+    """Drop a half-written last line, left by a crash mid-write."""
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - TAIL_BLOCK)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                f.truncate(start + newline + 1)
+                return
+            end = start
+        f.truncate(0)
+
+
+def done_ids(path: str) -> Set[str]:
+    """The ids of the topics with an ok result in `path`, read line by line."""
+    if not os.path.exists(path):
+        return set()
+    truncate_partial_line(path)
+    done = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if record["status"] == "ok":
+                done.add(str(record["id"]))
+    return done
+
+
+async def generate_post(runner: InMemoryRunner, run_id: str, prompt: str) -> dict:
+    """
+    Run (or resume) the pipeline for one prompt and return its result.
+
+    The run is its own user, so admission control budgets each topic
+    separately.
+
+    Raises:
+        AdmissionRejected: A model call was rejected. Its canned reply may
+            have been saved as the post or the review, so the checkpoint is
+            deleted and a retry starts the topic over
+    """
+    user_id = run_id
+    session, message = await resume_session(runner, user_id, run_id, prompt)
+    rejected = None
+    try:
+        # Run to the end even after a rejection: an ADK run stopped midway
+        # leaves its agents' generators to be closed out of context
+        async for event in runner.run_async(
+            user_id=user_id, session_id=session.id, new_message=message
+        ):
+            if rejected is None and is_rejected(event):
+                rejected = event.author
+        session = await runner.session_service.get_session(
+            app_name=runner.app_name, user_id=user_id, session_id=session.id
+        )
+    finally:
+        await runner.session_service.delete_session(
+            app_name=runner.app_name, user_id=user_id, session_id=session.id
+        )
+    if rejected is not None:
+        get_checkpoint_store().delete(run_id)
+        raise AdmissionRejected(f"{rejected}: model call rejected")
+    post = session.state.get("current_post", "")
+    return {
+        "post": post,
+        "char_count": len(post),
+        "penalty": post_penalty(post),
+        "stop_reason": session.state.get(STOP_REASON_KEY),
+    }
+
+
+async def run_topic(
+    runner: InMemoryRunner,
+    index: int,
+    item: Dict[str, Any],
+    semaphore: asyncio.Semaphore,
+    max_attempts: int,
+) -> dict:
+    """Run one topic with retries; never raises, failures become results."""
+    prompt = PROMPT.format(topic=item["topic"])
+    # The prompt is in the run id, so a rerun of the batch resumes this topic
+    run_id = f"batch-{index}-{zlib.crc32(prompt.encode()):08x}"
+    record = {"id": item["id"], "topic": item["topic"]}
+    # The slot is held through the backoff: a retry that queued behind every
+    # pending topic would finish last
+    async with semaphore:
+        started = time.perf_counter()
+        for attempt in range(1, max_attempts + 1):
+            try:
+                result = await generate_post(runner, run_id, prompt)
+            except Exception as e:
+                if attempt < max_attempts and is_retryable(e):
+                    await asyncio.sleep(backoff(attempt))
+                    continue
+                record.update(status="error", error=f"{type(e).__name__}: {e}")
+                break
+            get_checkpoint_store().delete(run_id)
+            record.update(status="ok", **result)
+            break
+        record.update(attempts=attempt, seconds=round(time.perf_counter() - started, 3))
+    return record
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def report(records, wall_seconds):
+    ok = [record for record in records if record["status"] == "ok"]
+    latencies = [record["seconds"] for record in ok]
+    retries = sum(record["attempts"] - 1 for record in records)
+    print(
+        f"{len(records)} topics in {wall_seconds:.1f}s: {len(ok)} ok, "
+        f"{len(records) - len(ok)} failed, {retries} retries",
+        file=sys.stderr,
+    )
+    if latencies:
+        print(
+            f"throughput {len(records) / wall_seconds:.2f} topics/s; latency "
+            f"mean {statistics.mean(latencies):.2f}s, "
+            f"p50 {percentile(latencies, 0.5):.2f}s, "
+            f"p95 {percentile(latencies, 0.95):.2f}s",
+            file=sys.stderr,
+        )
+
+
+def make_runner(args) -> InMemoryRunner:
+    if not args.scripted:
+        return InMemoryRunner(agent=root_agent, app_name="linkedin_post_agent")
+    from scripted_llm import ScriptedPostLlm, scripted_pipeline
+
+    llm = ScriptedPostLlm(
+        seed=args.seed, latency=args.latency, error_rate=args.error_rate
+    )
+    return InMemoryRunner(agent=scripted_pipeline(llm), app_name="batch_posts")
+
+
+async def main_async(args, output, done: Set[str]):
+    runner = make_runner(args)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    # The index is part of the run id, so it counts the skipped topics too
+    tasks = [
+        asyncio.create_task(
+            run_topic(runner, index, item, semaphore, args.max_attempts)
+        )
+        for index, item in enumerate(read_topics(args))
+        if str(item["id"]) not in done
+    ]
+    if done:
+        print(f"{len(done)} topics already done", file=sys.stderr)
+    started = time.perf_counter()
+    records = []
+    for task in asyncio.as_completed(tasks):
+        record = await task
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+        records.append(record)
+    report(records, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("input", nargs="?", help="JSONL file of topics")
+    parser.add_argument("--output", help="JSONL file to write (default stdout)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--max-attempts", type=int, default=4)
+    parser.add_argument("--scripted", action="store_true")
+    parser.add_argument("--topics", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.input is None and not args.scripted:
+        parser.error("give a topics file, or --scripted")
+
+    done = done_ids(args.output) if args.output else set()
+    output = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    # The agents' progress lines go to stderr, stdout may be the results
+    with contextlib.ExitStack() as stack, contextlib.redirect_stdout(sys.stderr):
+        if output is not sys.stdout:
+            stack.enter_context(output)
+        if args.scripted:
+            # Scripted runs leave no checkpoints behind
+            directory = stack.enter_context(tempfile.TemporaryDirectory())
+            set_checkpoint_store(CheckpointStore(directory))
+        asyncio.run(main_async(args, output, done))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Patch Refinement Benchmark
+
+Runs --posts prompts through the post pipeline with the refiner rewriting
+the post on every iteration, and with the patcher answering with edits
+instead (see linkedin_post_agent/patching.py), and reports per refinement:
+
+- output tokens, the tokens the model generates to refine the post,
+- refine latency, from the review to the refined post in the session,
+- the fallback rate, the share of patches that did not apply and were
+  followed by a full rewrite,
+
+and per post the iterations, the share of posts the reviewer approved and
+the total output tokens.
+
+The model is scripted_llm.ScriptedPostLlm, answering after --latency seconds
+plus --token-latency seconds per output token, so the refine latency grows
+with the length of the answer. The scripted patcher misquotes one edit in
+--misquote-rate of its patches.
+
+Usage:
+    python bench_patch_refinement.py [--posts 100] [--latency 0.2]
+                                     [--token-latency 0.002]
+                                     [--misquote-rate 0.1]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+
+from google.adk.runners import InMemoryRunner
+
+from linkedin_post_agent.subagents.post_patcher import post_patcher
+from linkedin_post_agent.subagents.post_refiner import post_refiner
+from scripted_llm import PROMPT, ScriptedPostLlm, run_post, scripted_pipeline
+
+
+async def run_corpus(args, patch):
+    llm = ScriptedPostLlm(
+        seed=args.seed,
+        fix_rate=args.fix_rate,
+        misquote_rate=args.misquote_rate,
+        latency=args.latency,
+        token_latency=args.token_latency,
+    )
+    runner = InMemoryRunner(
+        agent=scripted_pipeline(llm, patch=patch), app_name="patch_refinement"
+    )
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(i):
+        async with semaphore:
+            return await run_post(runner, PROMPT.format(i))
+
+    # The tools, the pre-check and the patching refiner print a line per call
+    with contextlib.redirect_stdout(io.StringIO()):
+        return await asyncio.gather(*(one(i) for i in range(args.posts)))
+
+
+async def main_async(args):
+    print(
+        f"=== {args.posts} posts, {args.latency:g}s + {args.token_latency:g}s "
+        f"per output token per model call ==="
+    )
+    print(
+        f"{'refiner':<8} {'tokens/refinement':>17} {'latency':>8} "
+        f"{'fallback':>8}  {'iterations':>10} {'converged':>9} "
+        f"{'output tokens':>13}"
+    )
+    for label, patch in (("rewrite", False), ("patch", True)):
+        results = await run_corpus(args, patch)
+
+        def total(key):
+            return sum(stats[key] for stats in results)
+
+        refinements = total("refinements") or 1
+        refine_tokens = total(f"output_tokens:{post_refiner.name}") + total(
+            f"output_tokens:{post_patcher.name}"
+        )
+        patches = total("refine:patch") + total("refine:rewrite")
+        fallback = total("refine:rewrite") / patches if patches else 0.0
+        print(
+            f"{label:<8} {refine_tokens / refinements:17.0f} "
+            f"{total('refine_seconds') / refinements:7.2f}s "
+            f"{fallback:8.1%}  "
+            f"{statistics.mean(s['iterations'] for s in results):10.2f} "
+            f"{total('converged') / len(results):9.1%} "
+            f"{statistics.mean(s['output_tokens'] for s in results):13.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--token-latency", type=float, default=0.002)
+    parser.add_argument("--misquote-rate", type=float, default=0.1)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--fix-rate", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
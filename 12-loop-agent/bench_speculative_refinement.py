@@ -0,0 +1,107 @@
+"""
+Speculative Refinement Benchmark
+
+Runs --posts prompts through the post pipeline with one refiner per
+iteration (K=1, the sequential loop) and with K speculative refiners (see
+linkedin_post_agent/speculative.py), and reports per post:
+
+- wall time from the first draft to the end of the loop,
+- loop iterations, and iterations to convergence for the posts the reviewer
+  approved,
+- model calls, split into reviewer and refiner calls.
+
+The model is scripted_llm.ScriptedPostLlm answering after --latency seconds,
+so the wall time is made of model round-trips. --concurrency posts run at
+once, each in its own session.
+
+Usage:
+    python bench_speculative_refinement.py [--candidates 1 2 3 4]
+                                           [--posts 100] [--latency 0.5]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+
+from google.adk.runners import InMemoryRunner
+
+from linkedin_post_agent.subagents.post_refiner import post_refiner
+from linkedin_post_agent.subagents.post_reviewer import post_reviewer
+from scripted_llm import PROMPT, ScriptedPostLlm, run_post, scripted_pipeline
+
+
+async def run_corpus(args, candidates):
+    llm = ScriptedPostLlm(seed=args.seed, fix_rate=args.fix_rate, latency=args.latency)
+    runner = InMemoryRunner(
+        agent=scripted_pipeline(llm, candidates=candidates), app_name="speculative"
+    )
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(i):
+        async with semaphore:
+            return await run_post(runner, PROMPT.format(i))
+
+    # The tools and the pre-check print a line per call
+    with contextlib.redirect_stdout(io.StringIO()):
+        return await asyncio.gather(*(one(i) for i in range(args.posts)))
+
+
+def refiner_calls(stats):
+    prefix = f"calls:{post_refiner.name}"
+    return sum(count for key, count in stats.items() if key.startswith(prefix))
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def main_async(args):
+    print(
+        f"=== {args.posts} posts, {args.latency:g}s per model call, "
+        f"{args.concurrency} at a time ==="
+    )
+    print(
+        f"{'K':>2}  {'wall mean':>9} {'p95':>6}  {'iterations':>10} "
+        f"{'to converge':>11} {'converged':>9}  {'calls':>5} "
+        f"{'reviewer':>8} {'refiner':>7}  {'wall vs first':>13}"
+    )
+    baseline = None
+    for candidates in args.candidates:
+        results = await run_corpus(args, candidates)
+
+        def mean(values):
+            values = list(values)
+            return statistics.mean(values) if values else 0.0
+
+        seconds = [stats["seconds"] for stats in results]
+        wall = mean(seconds)
+        baseline = baseline or wall
+        converged = [stats for stats in results if stats["converged"]]
+        print(
+            f"{candidates:2d}  {wall:8.2f}s {percentile(seconds, 0.95):5.2f}s  "
+            f"{mean(s['iterations'] for s in results):10.2f} "
+            f"{mean(s['iterations'] for s in converged):11.2f} "
+            f"{len(converged) / len(results):9.1%}  "
+            f"{mean(s['calls'] for s in results):5.2f} "
+            f"{mean(s['calls:' + post_reviewer.name] for s in results):8.2f} "
+            f"{mean(refiner_calls(s) for s in results):7.2f}  "
+            f"{wall / baseline:5.0%}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--candidates", type=int, nargs="+", default=[1, 2, 3, 4])
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--fix-rate", type=float, default=0.6)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
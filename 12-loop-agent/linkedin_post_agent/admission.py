@@ -0,0 +1,393 @@
+"""
+Admission Control for Model Calls
+
+This module provides per-user and global token buckets that gate every model
+call. The controller is enforced from a before_model_callback, so one noisy
+session cannot use up the provider quota for everybody else.
+
+Each call is charged one request and an estimated number of tokens. When the
+buckets cannot cover the charge, the caller waits in a bounded queue; when the
+queue is full or the wait would be too long, the call is rejected immediately
+with a canned model response instead of reaching the provider.
+
+Waiting calls are served first come, first served: a call is only admitted
+ahead of a queued one when the queued call is held back by its own user's
+budget, never by the global budget they share.
+
+Every example directory runs on its own (adk web is started from inside
+it), so 8-stateful-multi-agent and 12-loop-agent each carry this module;
+keep the two copies identical.
+"""
+
+import asyncio
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+# --- Constants ---
+CHARS_PER_TOKEN = 4
+DEFAULT_OUTPUT_TOKENS = 512
+MAX_TRACKED_USERS = 10_000
+# The model's reply to a rejected call
+REJECTED_TEXT = (
+    "We're receiving a lot of requests from you right now. "
+    "Please wait a moment and try again."
+)
+
+
+class TokenBucket:
+    """A token bucket that refills continuously at a fixed rate."""
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens the bucket can hold
+            now: Current clock reading, the bucket starts full
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` tokens are available (inf if never)."""
+        if amount > self.capacity:
+            return float("inf")
+        self._refill(now)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float, now: float) -> None:
+        """Remove `amount` tokens. Callers check wait_time() first."""
+        self._refill(now)
+        self.tokens -= amount
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+@dataclass
+class _Waiter:
+    """A queued call and the future its caller waits on."""
+
+    user_id: str
+    tokens: float
+    deadline: float
+    future: asyncio.Future
+
+
+@dataclass
+class AdmissionDecision:
+    """The outcome of an admission request."""
+
+    admitted: bool
+    waited_seconds: float = 0.0
+    reason: Optional[str] = None
+
+
+class AdmissionController:
+    """
+    Admission control with per-user and global budgets.
+
+    Four buckets are checked for every call: the user's request and token
+    buckets and the global request and token buckets. A call is admitted only
+    when all four can cover it, and it is charged against all four at once.
+    """
+
+    def __init__(
+        self,
+        user_requests_per_minute: float = 20,
+        user_tokens_per_minute: float = 40_000,
+        global_requests_per_minute: float = 600,
+        global_tokens_per_minute: float = 1_000_000,
+        burst_seconds: float = 30.0,
+        max_queue_size: int = 100,
+        max_wait_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            user_requests_per_minute: Sustained request rate allowed per user
+            user_tokens_per_minute: Sustained token rate allowed per user
+            global_requests_per_minute: Sustained request rate for all users
+            global_tokens_per_minute: Sustained token rate for all users
+            burst_seconds: Bucket capacity, in seconds of sustained rate
+            max_queue_size: Maximum number of calls waiting for admission
+            max_wait_seconds: Calls that would wait longer are rejected
+            clock: Monotonic clock, replaceable for simulations
+        """
+        self.user_request_rate = user_requests_per_minute / 60
+        self.user_token_rate = user_tokens_per_minute / 60
+        self.burst_seconds = burst_seconds
+        self.max_queue_size = max_queue_size
+        self.max_wait_seconds = max_wait_seconds
+        self.clock = clock
+
+        now = clock()
+        global_request_rate = global_requests_per_minute / 60
+        global_token_rate = global_tokens_per_minute / 60
+        self.global_requests = TokenBucket(
+            global_request_rate, max(1.0, global_request_rate * burst_seconds), now
+        )
+        self.global_tokens = TokenBucket(
+            global_token_rate, global_token_rate * burst_seconds, now
+        )
+        self.user_buckets: Dict[str, tuple] = {}
+        # Waiting calls in arrival order, and how many of them each user has
+        self._waiters: Deque[_Waiter] = deque()
+        self._waiting_users: Counter = Counter()
+        # Set while the oldest call the global budget cannot cover is queued
+        self._global_blocked = False
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.stats = {"admitted": 0, "queued": 0, "rejected": 0}
+
+    def _buckets_for(self, user_id: str, now: float) -> tuple:
+        buckets = self.user_buckets.get(user_id)
+        if buckets is None:
+            if len(self.user_buckets) >= MAX_TRACKED_USERS:
+                self.prune_idle_users()
+            buckets = (
+                TokenBucket(
+                    self.user_request_rate,
+                    max(1.0, self.user_request_rate * self.burst_seconds),
+                    now,
+                ),
+                TokenBucket(
+                    self.user_token_rate, self.user_token_rate * self.burst_seconds, now
+                ),
+            )
+            self.user_buckets[user_id] = buckets
+        return buckets
+
+    def _clamp(self, tokens: float) -> float:
+        # A single oversized call may drain a full bucket but is never refused outright
+        return min(
+            tokens,
+            self.user_token_rate * self.burst_seconds,
+            self.global_tokens.capacity,
+        )
+
+    def _wait_time(self, user_id: str, tokens: float, now: float) -> float:
+        user_requests, user_tokens = self._buckets_for(user_id, now)
+        return max(
+            user_requests.wait_time(1, now),
+            user_tokens.wait_time(tokens, now),
+            self.global_requests.wait_time(1, now),
+            self.global_tokens.wait_time(tokens, now),
+        )
+
+    def _charge(self, user_id: str, tokens: float, now: float) -> None:
+        user_requests, user_tokens = self.user_buckets[user_id]
+        user_requests.take(1, now)
+        user_tokens.take(tokens, now)
+        self.global_requests.take(1, now)
+        self.global_tokens.take(tokens, now)
+
+    @property
+    def waiting(self) -> int:
+        """The number of calls waiting for admission."""
+        return len(self._waiters)
+
+    def _can_admit_now(self, user_id: str, tokens: float, now: float) -> bool:
+        # Queued calls go first: the user's own, and any held by the global budget
+        if self._waiting_users[user_id] or self._global_blocked:
+            return False
+        return self._wait_time(user_id, tokens, now) == 0
+
+    def try_acquire(self, user_id: str, tokens: float) -> bool:
+        """Admit the call immediately if the budgets allow it, never waits."""
+        tokens = self._clamp(tokens)
+        self._serve()
+        now = self.clock()
+        if not self._can_admit_now(user_id, tokens, now):
+            return False
+        self._charge(user_id, tokens, now)
+        self.stats["admitted"] += 1
+        return True
+
+    async def acquire(self, user_id: str, tokens: float) -> AdmissionDecision:
+        """
+        Wait for budget to cover the call, or reject it quickly.
+
+        Args:
+            user_id: The user the call is charged to
+            tokens: Estimated tokens the call will consume
+
+        Returns:
+            AdmissionDecision: Whether the call was admitted and how long it waited
+        """
+        tokens = self._clamp(tokens)
+        self._serve()
+        start = self.clock()
+        if self._can_admit_now(user_id, tokens, start):
+            self._charge(user_id, tokens, start)
+            self.stats["admitted"] += 1
+            return AdmissionDecision(admitted=True)
+
+        # Fast rejection when the wait is hopeless or the queue is full
+        if self._wait_time(user_id, tokens, start) > self.max_wait_seconds:
+            self.stats["rejected"] += 1
+            return AdmissionDecision(admitted=False, reason="over budget")
+        if self.waiting >= self.max_queue_size:
+            self.stats["rejected"] += 1
+            return AdmissionDecision(admitted=False, reason="queue full")
+
+        waiter = _Waiter(
+            user_id,
+            tokens,
+            start + self.max_wait_seconds,
+            asyncio.get_running_loop().create_future(),
+        )
+        self._waiters.append(waiter)
+        self._waiting_users[user_id] += 1
+        self.stats["queued"] += 1
+        try:
+            self._serve()
+            reason = await waiter.future
+        finally:
+            if waiter in self._waiters:
+                # The caller was cancelled; the calls behind it may go now
+                self._remove(waiter)
+                self._serve()
+        waited = self.clock() - start
+        if reason is None:
+            return AdmissionDecision(admitted=True, waited_seconds=waited)
+        return AdmissionDecision(admitted=False, waited_seconds=waited, reason=reason)
+
+    def _remove(self, waiter: _Waiter) -> None:
+        self._waiters.remove(waiter)
+        self._waiting_users[waiter.user_id] -= 1
+        if not self._waiting_users[waiter.user_id]:
+            del self._waiting_users[waiter.user_id]
+
+    def _finish(self, waiter: _Waiter, reason: Optional[str]) -> None:
+        self._remove(waiter)
+        self.stats["admitted" if reason is None else "rejected"] += 1
+        if not waiter.future.done():
+            waiter.future.set_result(reason)
+
+    def _serve(self) -> None:
+        """
+        Admit queued calls in arrival order, as far as the budgets allow.
+
+        A call held back by its user's budget holds back that user's later
+        calls only. A call held back by the global budget holds back every
+        call behind it. Calls that could not be admitted before their
+        deadline are rejected, and a timer runs the queue again when the
+        next call can go.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = self.clock()
+        self._global_blocked = False
+        blocked_users = set()
+        next_wait = float("inf")
+        for waiter in list(self._waiters):
+            if waiter.future.done():
+                self._remove(waiter)
+                continue
+            if self._global_blocked or waiter.user_id in blocked_users:
+                # Its turn has not come, but its deadline still holds
+                if now >= waiter.deadline:
+                    self._finish(waiter, "timed out")
+                else:
+                    next_wait = min(next_wait, waiter.deadline - now)
+                continue
+            user_requests, user_tokens = self._buckets_for(waiter.user_id, now)
+            user_wait = max(
+                user_requests.wait_time(1, now),
+                user_tokens.wait_time(waiter.tokens, now),
+            )
+            global_wait = max(
+                self.global_requests.wait_time(1, now),
+                self.global_tokens.wait_time(waiter.tokens, now),
+            )
+            wait = max(user_wait, global_wait)
+            if wait == 0:
+                self._charge(waiter.user_id, waiter.tokens, now)
+                self._finish(waiter, None)
+                continue
+            if now + wait > waiter.deadline:
+                self._finish(waiter, "timed out")
+                continue
+            next_wait = min(next_wait, wait)
+            if user_wait > 0:
+                blocked_users.add(waiter.user_id)
+                continue
+            # The global budget goes to the oldest call first
+            self._global_blocked = True
+        if self._waiters and next_wait < float("inf"):
+            loop = self._waiters[0].future.get_loop()
+            self._timer = loop.call_later(next_wait, self._serve)
+
+    def prune_idle_users(self) -> int:
+        """Drop buckets of users whose budgets have fully refilled."""
+        now = self.clock()
+        idle = [
+            user_id
+            for user_id, (requests, tokens) in self.user_buckets.items()
+            if requests.is_full(now) and tokens.is_full(now)
+        ]
+        for user_id in idle:
+            del self.user_buckets[user_id]
+        return len(idle)
+
+
+def estimate_tokens(llm_request: LlmRequest) -> int:
+    """
+    Cheaply estimate the tokens a model call will consume.
+
+    Counts the characters in the prompt and system instruction and adds an
+    allowance for the response.
+    """
+    chars = 0
+    for content in llm_request.contents or []:
+        for part in content.parts or []:
+            if part.text:
+                chars += len(part.text)
+    config = llm_request.config
+    if config and isinstance(config.system_instruction, str):
+        chars += len(config.system_instruction)
+    output_tokens = DEFAULT_OUTPUT_TOKENS
+    if config and config.max_output_tokens:
+        output_tokens = config.max_output_tokens
+    return chars // CHARS_PER_TOKEN + output_tokens
+
+
+def create_admission_callback(controller: AdmissionController):
+    """Create a before_model_callback that enforces `controller`."""
+
+    async def before_model_callback(
+        callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        user_id = callback_context._invocation_context.user_id
+        decision = await controller.acquire(user_id, estimate_tokens(llm_request))
+        if decision.admitted:
+            return None
+
+        print(f"[ADMISSION] Rejected model call for {user_id}: {decision.reason}")
+        return LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=REJECTED_TEXT)])
+        )
+
+    return before_model_callback
+
+
+# Shared by every agent in this application
+admission_controller = AdmissionController()
+enforce_admission_control = create_admission_callback(admission_controller)
@@ -3,27 +3,58 @@ LinkedIn Post Generator Root Agent
 
 This module defines the root agent for the LinkedIn post generation application.
 It uses a sequential agent with an initial post generator followed by a refinement loop.
+The loop also stops at a deadline, a token budget or when the post stops
+improving, and keeps the best post it saw (see budget.py).
+
+Setting LINKEDIN_POST_CANDIDATES to K > 1 switches the loop to speculative
+refinement (see speculative.py): each iteration requests K rewrites
+concurrently and keeps the one that scores best on the local rules.
+Setting LINKEDIN_POST_REFINE_MODE=patch instead has the post patched with
+edits and rewritten only when they do not apply (see patching.py); it takes
+precedence over speculative refinement.
+
+The pipeline checkpoints after each stage and each loop iteration when run
+through run_checkpointed.py, which resumes a run that died (see
+checkpoint.py).
 """
 
-from google.adk.agents import LoopAgent, SequentialAgent
+import os
 
+from .budget import BudgetedLoopAgent
+from .checkpoint import CheckpointedSequentialAgent
+from .patching import create_patching_refiner
+from .speculative import create_speculative_refiner
 from .subagents.post_generator import initial_post_generator
+from .subagents.post_patcher import post_patcher
 from .subagents.post_refiner import post_refiner
 from .subagents.post_reviewer import post_reviewer
 
+# Pick the patching refiner, K speculative refiners or one refiner
+REFINE_MODE = os.environ.get("LINKEDIN_POST_REFINE_MODE", "rewrite")
+SPECULATIVE_CANDIDATES = int(os.environ.get("LINKEDIN_POST_CANDIDATES", "1"))
+if REFINE_MODE == "patch":
+    refiner = create_patching_refiner(post_patcher, post_refiner)
+elif SPECULATIVE_CANDIDATES > 1:
+    refiner = create_speculative_refiner(post_refiner, SPECULATIVE_CANDIDATES)
+else:
+    refiner = post_refiner
+
 # Create the Refinement Loop Agent
-refinement_loop = LoopAgent(
+refinement_loop = BudgetedLoopAgent(
     name="PostRefinementLoop",
     max_iterations=10,
+    deadline_seconds=120,
+    max_tokens=60_000,
+    patience=3,
     sub_agents=[
         post_reviewer,
-        post_refiner,
+        refiner,
     ],
     description="Iteratively reviews and refines a LinkedIn post until quality requirements are met",
 )
 
 # Create the Sequential Pipeline
-root_agent = SequentialAgent(
+root_agent = CheckpointedSequentialAgent(
     name="LinkedInPostGenerationPipeline",
     sub_agents=[
         initial_post_generator,  # Step 1: Generate initial post
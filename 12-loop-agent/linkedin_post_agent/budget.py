@@ -0,0 +1,193 @@
+"""
+Budget-Aware Refinement Loop
+
+A LoopAgent stops only when a sub-agent escalates or after max_iterations,
+so a reviewer that never approves spends the whole iteration budget.
+BudgetedLoopAgent also stops when:
+
+- the wall-clock deadline has passed,
+- the model calls made by the loop have used up the token budget, or
+- the post has not improved for `patience` iterations, where improving means
+  a lower post_penalty (rules.py): fewer failed hard rules, or fewer
+  characters outside the length range, or
+- the refiner has gone back to a post from an earlier iteration (A, B, A),
+  which would only repeat the reviews and rewrites that led away from it.
+  A post handed back unchanged is left to `patience`.
+
+Budgets are checked before each sub-agent runs, so a call already in flight
+is allowed to finish. The best post seen is kept: when the loop stops for
+any reason other than the reviewer's approval, it is written back to
+current_post. Every iteration appends a telemetry record to loop_telemetry
+in the session state, and loop_stop_reason records why the loop ended.
+
+In a checkpointed run (checkpoint.py), the loop saves its counters after
+every iteration and, when the run is resumed, carries on from the last
+iteration saved with the tokens and time it had already used.
+"""
+
+import time
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from google.adk.agents import LoopAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+from .checkpoint import loop_progress, save_checkpoint
+from .rules import length_distance, post_penalty
+from .verdicts import post_fingerprint
+
+# --- Constants ---
+DEFAULT_DEADLINE_SECONDS = 120.0
+DEFAULT_MAX_TOKENS = 60_000
+DEFAULT_PATIENCE = 3
+POST_KEY = "current_post"
+TELEMETRY_KEY = "loop_telemetry"
+STOP_REASON_KEY = "loop_stop_reason"
+BUDGET_FIELDS = ("deadline_seconds", "max_tokens", "patience")
+
+
+class BudgetedLoopAgent(LoopAgent):
+    """A LoopAgent with a deadline, a token budget and early stopping."""
+
+    deadline_seconds: Optional[float] = DEFAULT_DEADLINE_SECONDS
+    """Wall-clock budget for the whole loop; None for no deadline."""
+
+    max_tokens: Optional[int] = DEFAULT_MAX_TOKENS
+    """Prompt plus output tokens the loop's model calls may use; None for no limit."""
+
+    patience: Optional[int] = DEFAULT_PATIENCE
+    """Iterations without a better post before stopping; None to never stop early."""
+
+    detect_oscillation: bool = True
+    """Stop when the post returns to one from before the previous iteration."""
+
+    def _over_budget(self, started: float, tokens: int) -> Optional[str]:
+        if (
+            self.deadline_seconds is not None
+            and time.monotonic() - started >= self.deadline_seconds
+        ):
+            return "deadline"
+        if self.max_tokens is not None and tokens >= self.max_tokens:
+            return "token_budget"
+        return None
+
+    def _event(self, ctx: InvocationContext, state_delta: Dict[str, Any]) -> Event:
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=state_delta),
+        )
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        progress = loop_progress(ctx, self.name)
+        if progress is None:
+            started = time.monotonic()
+            tokens = 0
+            telemetry = []
+            best_post = ctx.session.state.get(POST_KEY)
+            best_penalty = post_penalty(best_post) if best_post is not None else None
+            stale_iterations = 0
+            iteration = 0
+            # The iteration each post was last seen after, by fingerprint
+            seen = {} if best_post is None else {post_fingerprint(best_post): 0}
+        else:
+            # The time spent before the crash counts, the downtime does not
+            started = time.monotonic() - progress["elapsed_seconds"]
+            tokens = progress["tokens"]
+            telemetry = list(ctx.session.state.get(TELEMETRY_KEY, []))
+            best_post = progress["best_post"]
+            best_penalty = progress["best_penalty"]
+            stale_iterations = progress["stale_iterations"]
+            iteration = progress["iteration"]
+            seen = progress["seen"]
+            print(f"[LOOP] Resuming after iteration {iteration}")
+        stop_reason = None
+
+        while stop_reason is None:
+            if self.max_iterations and iteration >= self.max_iterations:
+                stop_reason = "max_iterations"
+                break
+            for sub_agent in self.sub_agents:
+                stop_reason = self._over_budget(started, tokens)
+                if stop_reason:
+                    break
+                async for event in sub_agent.run_async(ctx):
+                    yield event
+                    if event.usage_metadata is not None:
+                        tokens += event.usage_metadata.total_token_count or 0
+                    if event.actions.escalate:
+                        # Like LoopAgent, skip the reviewer's closing remarks
+                        stop_reason = "approved"
+                        break
+                if stop_reason:
+                    break
+            if stop_reason in ("deadline", "token_budget"):
+                break
+            iteration += 1
+
+            # The runner has applied every yielded event to the session by now
+            post = ctx.session.state.get(POST_KEY)
+            penalty = post_penalty(post) if post is not None else None
+            if penalty is not None and (best_penalty is None or penalty < best_penalty):
+                best_post, best_penalty = post, penalty
+                stale_iterations = 0
+            else:
+                if penalty is not None and penalty == best_penalty:
+                    best_post = post  # The newer post answers more of the feedback
+                stale_iterations += 1
+            if post is not None:
+                fingerprint = post_fingerprint(post)
+                if (
+                    stop_reason is None
+                    and self.detect_oscillation
+                    and seen.get(fingerprint, iteration - 1) < iteration - 1
+                ):
+                    print(f"[LOOP] Post from iteration {seen[fingerprint]} is back")
+                    stop_reason = "oscillation"
+                seen[fingerprint] = iteration
+            telemetry.append(
+                {
+                    "iteration": iteration,
+                    "elapsed_seconds": round(time.monotonic() - started, 3),
+                    "tokens": tokens,
+                    "char_count": len(post) if post is not None else None,
+                    "length_distance": (
+                        length_distance(post) if post is not None else None
+                    ),
+                    "penalty": penalty,
+                    "best_penalty": best_penalty,
+                }
+            )
+            yield self._event(ctx, {TELEMETRY_KEY: list(telemetry)})
+            save_checkpoint(
+                ctx,
+                loop=(
+                    self.name,
+                    {
+                        "iteration": iteration,
+                        "elapsed_seconds": time.monotonic() - started,
+                        "tokens": tokens,
+                        "best_post": best_post,
+                        "best_penalty": best_penalty,
+                        "stale_iterations": stale_iterations,
+                        "seen": seen,
+                    },
+                ),
+            )
+
+            if (
+                stop_reason is None
+                and self.patience is not None
+                and stale_iterations >= self.patience
+            ):
+                stop_reason = "no_improvement"
+
+        state_delta = {STOP_REASON_KEY: stop_reason}
+        if stop_reason != "approved" and best_post is not None:
+            if ctx.session.state.get(POST_KEY) != best_post:
+                state_delta[POST_KEY] = best_post
+        print(f"[LOOP] Stopped after {iteration} iterations: {stop_reason}")
+        yield self._event(ctx, state_delta)
@@ -0,0 +1,169 @@
+"""
+Patch-Based Refinement
+
+The refiner rewrites the whole post on every iteration, even when the
+feedback is "remove 40 characters", so every iteration pays for 1000-1500
+characters of output. In patch mode the PostPatcherAgent answers with a
+list of edits instead:
+
+    {"edits": [
+        {"op": "replace", "target": "<exact text>", "text": "<new text>"},
+        {"op": "delete", "target": "<exact text>"},
+        {"op": "insert_after", "anchor": "<exact text>", "text": "<new text>"}
+    ]}
+
+and PatchingRefiner applies them to current_post in code. Targets and
+anchors are quoted text rather than offsets, which models get wrong, and
+each must occur exactly once in the post at the time its edit is applied.
+A patch that does not parse, quotes text that is not in the post, or
+changes nothing is rejected, and the refiner rewrites the post in full.
+"""
+
+import json
+from typing import Any, AsyncGenerator, Dict, List
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+# --- Constants ---
+MAX_EDITS = 20
+EDIT_FIELDS = {
+    "replace": ("target", "text"),
+    "delete": ("target",),
+    "insert_after": ("anchor", "text"),
+}
+
+
+class PatchError(ValueError):
+    """A patch that cannot be applied to the post."""
+
+
+def parse_edits(text: str) -> List[Dict[str, str]]:
+    """
+    Parse the patcher's output into a list of validated edits.
+
+    Accepts {"edits": [...]} or a bare list, optionally in a Markdown code
+    fence.
+
+    Raises:
+        PatchError: The output is not JSON or an edit is malformed
+    """
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[-1].rsplit("```", 1)[0]
+    try:
+        patch = json.loads(text)
+    except ValueError as e:
+        raise PatchError(f"patch is not valid JSON: {e}") from None
+    edits = patch.get("edits") if isinstance(patch, dict) else patch
+    if not isinstance(edits, list) or not edits:
+        raise PatchError("patch has no edits")
+    if len(edits) > MAX_EDITS:
+        raise PatchError(f"patch has {len(edits)} edits, more than {MAX_EDITS}")
+
+    for number, edit in enumerate(edits, 1):
+        if not isinstance(edit, dict) or edit.get("op") not in EDIT_FIELDS:
+            raise PatchError(f"edit {number} has no valid op")
+        for field in EDIT_FIELDS[edit["op"]]:
+            if not isinstance(edit.get(field), str):
+                raise PatchError(f"edit {number} ({edit['op']}) has no {field}")
+        span = edit.get("target", edit.get("anchor"))
+        if not span:
+            raise PatchError(f"edit {number} ({edit['op']}) quotes no text")
+    return edits
+
+
+def apply_edits(post: str, edits: List[Dict[str, str]]) -> str:
+    """
+    Apply `edits` to `post` in order.
+
+    Raises:
+        PatchError: A quoted span is missing or ambiguous, or nothing changed
+    """
+    patched = post
+    for number, edit in enumerate(edits, 1):
+        op = edit["op"]
+        span = edit["anchor"] if op == "insert_after" else edit["target"]
+        count = patched.count(span)
+        if count != 1:
+            where = "not found" if count == 0 else f"found {count} times"
+            raise PatchError(f"edit {number} ({op}): quoted text {where}")
+
+        if op == "replace":
+            patched = patched.replace(span, edit["text"], 1)
+        elif op == "delete":
+            patched = patched.replace(span, "", 1)
+        else:
+            patched = patched.replace(span, span + edit["text"], 1)
+
+    patched = patched.strip()
+    if not patched:
+        raise PatchError("patch deletes the whole post")
+    if patched == post.strip():
+        raise PatchError("patch changes nothing")
+    return patched
+
+
+class PatchingRefiner(BaseAgent):
+    """
+    Runs the patcher and applies its edits, or falls back to the refiner.
+
+    sub_agents must be [patcher, refiner]: the patcher writes its edits to
+    its output_key, the refiner rewrites current_post in full. The key is
+    cleared before the patcher runs: a patcher that answers with no text
+    leaves it as it was, and the previous iteration's edits must not be
+    applied to the new post.
+    """
+
+    def _event(self, ctx: InvocationContext, state_delta: Dict[str, Any], text=None):
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=(
+                types.Content(role="model", parts=[types.Part(text=text)])
+                if text is not None
+                else None
+            ),
+            actions=EventActions(state_delta=state_delta),
+        )
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        patcher, refiner = self.sub_agents
+        if ctx.session.state.get(patcher.output_key) is not None:
+            yield self._event(ctx, {patcher.output_key: None})
+        async for event in patcher.run_async(ctx):
+            yield event
+
+        post = ctx.session.state.get("current_post", "")
+        try:
+            patch = ctx.session.state.get(patcher.output_key)
+            if not patch:
+                raise PatchError("the patcher returned no patch")
+            edits = parse_edits(str(patch))
+            patched = apply_edits(post, edits)
+        except PatchError as e:
+            print(f"[PATCH] Falling back to a full rewrite: {e}")
+            yield self._event(ctx, {"refine_mode": "rewrite", "patch_error": str(e)})
+            async for event in refiner.run_async(ctx):
+                yield event
+            return
+
+        yield self._event(
+            ctx,
+            {"current_post": patched, "refine_mode": "patch", "patch_error": None},
+            text=patched,
+        )
+
+
+def create_patching_refiner(patcher: LlmAgent, refiner: LlmAgent) -> PatchingRefiner:
+    """Build a refiner that patches the post and rewrites it only as a fallback."""
+    return PatchingRefiner(
+        name="PatchingPostRefiner",
+        sub_agents=[patcher, refiner],
+        description="Refines the post with edits, or rewrites it if they do not apply",
+    )
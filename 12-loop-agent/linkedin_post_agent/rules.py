@@ -0,0 +1,176 @@
+"""
+Deterministic Post Rules
+
+The hard requirements on a post (its length, no emojis, no hashtags and the
+@aiwithbrandon mention) can be checked in code. check_post() runs those rules
+and returns every violation with targeted feedback.
+
+check_post_rules is a before_agent_callback for the reviewer: when a rule
+fails, it writes the feedback to review_feedback itself and skips the
+reviewer, saving its model calls (the count_characters round-trip and the
+verdict). Posts that pass every rule still go to the reviewer, which judges
+what code cannot: the capabilities listed, the call-to-action and the tone.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+# --- Constants ---
+MIN_LENGTH = 1000
+MAX_LENGTH = 1500
+REQUIRED_MENTIONS = ("@aiwithbrandon",)
+
+# Pictographs, emoticons, dingbats and flags, plus the characters that join
+# them into sequences
+EMOJI_PATTERN = re.compile(
+    "["
+    "\U0001f000-\U0001faff"  # Mahjong tiles through Symbols Extended-A
+    "\u2600-\u27bf"  # Miscellaneous Symbols and Dingbats
+    "\u231a\u231b\u23e9-\u23f3\u23f8-\u23fa"  # Watch, hourglass, media keys
+    "\u2b05-\u2b07\u2b1b\u2b1c\u2b50\u2b55"  # Arrows, squares, star, circle
+    "\u3030\u303d\u3297\u3299"
+    "\ufe0f\u200d"  # Emoji presentation selector, zero-width joiner
+    "\U000e0020-\U000e007f"  # Tag characters of subdivision flags
+    "]"
+)
+# Only part of an emoji, never one on their own
+EMOJI_JOINERS = "\ufe0f\u200d"
+# A hashtag has a letter in it and does not follow a word, path or entity
+HASHTAG_PATTERN = re.compile(r"(?<![\w/&])#\w*[^\W\d_]\w*")
+
+
+@dataclass
+class RuleViolation:
+    """A failed rule and the feedback that tells the refiner how to fix it."""
+
+    rule: str
+    feedback: str
+
+
+def check_length(text: str) -> Dict[str, Any]:
+    """
+    Check the post length against MIN_LENGTH and MAX_LENGTH.
+
+    Returns:
+        Dict[str, Any]: The count_characters tool result: 'pass' or 'fail',
+        the character count, the characters to add or remove and a message
+    """
+    char_count = len(text)
+    if char_count < MIN_LENGTH:
+        chars_needed = MIN_LENGTH - char_count
+        return {
+            "result": "fail",
+            "char_count": char_count,
+            "chars_needed": chars_needed,
+            "message": f"Post is too short. Add {chars_needed} more characters to reach minimum length of {MIN_LENGTH}.",
+        }
+    if char_count > MAX_LENGTH:
+        chars_to_remove = char_count - MAX_LENGTH
+        return {
+            "result": "fail",
+            "char_count": char_count,
+            "chars_to_remove": chars_to_remove,
+            "message": f"Post is too long. Remove {chars_to_remove} characters to meet maximum length of {MAX_LENGTH}.",
+        }
+    return {
+        "result": "pass",
+        "char_count": char_count,
+        "message": f"Post length is good ({char_count} characters).",
+    }
+
+
+def _found(matches: List[str]) -> str:
+    # Each distinct match once, in order of appearance
+    return ", ".join(dict.fromkeys(matches))
+
+
+def check_post(text: str) -> List[RuleViolation]:
+    """Run every hard rule on `text`; an empty list means the post passes."""
+    violations = []
+
+    length = check_length(text)
+    if length["result"] == "fail":
+        violations.append(RuleViolation("length", length["message"]))
+
+    emojis = [e for e in EMOJI_PATTERN.findall(text) if e not in EMOJI_JOINERS]
+    if emojis:
+        violations.append(
+            RuleViolation(
+                "emoji",
+                f"Remove every emoji ({len(emojis)} found: {_found(emojis)}).",
+            )
+        )
+
+    hashtags = HASHTAG_PATTERN.findall(text)
+    if hashtags:
+        violations.append(
+            RuleViolation(
+                "hashtag",
+                f"Remove every hashtag ({len(hashtags)} found: {_found(hashtags)}). "
+                "Work the topic into a sentence instead.",
+            )
+        )
+
+    lowered = text.lower()
+    for mention in REQUIRED_MENTIONS:
+        if mention not in lowered:
+            violations.append(
+                RuleViolation(
+                    "mention",
+                    f"Mention {mention} by name, crediting the tutorial to them.",
+                )
+            )
+
+    return violations
+
+
+def length_distance(text: str) -> int:
+    """Characters to add or remove to bring `text` within the length range."""
+    return max(0, MIN_LENGTH - len(text), len(text) - MAX_LENGTH)
+
+
+def post_penalty(text: str) -> int:
+    """
+    A cheap score for ranking candidate posts; lower is better.
+
+    Each failed rule costs 1000, so a post with fewer failures always ranks
+    higher, and ties are broken by the distance to the length range.
+    """
+    return 1000 * len(check_post(text)) + length_distance(text)
+
+
+def format_feedback(violations: List[RuleViolation]) -> str:
+    """The review feedback for a post that failed the hard rules."""
+    lines = ["The post fails these required checks:"]
+    lines += [f"- {violation.feedback}" for violation in violations]
+    return "\n".join(lines)
+
+
+def check_post_rules(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    Review the post in code before the reviewer runs.
+
+    When a hard rule fails, sets review_status to "fail" and review_feedback
+    to targeted feedback, and returns it so the reviewer is skipped. Returns
+    None to let the reviewer run when every rule passes.
+    """
+    post = callback_context.state.get("current_post")
+    if post is None:
+        return None
+
+    violations = check_post(post)
+    if not violations:
+        return None
+
+    feedback = format_feedback(violations)
+    print(
+        "[RULES] Skipping the reviewer, failed: "
+        + ", ".join(violation.rule for violation in violations)
+    )
+    callback_context.state["review_status"] = "fail"
+    callback_context.state["review_feedback"] = feedback
+    return types.Content(role="model", parts=[types.Part(text=feedback)])
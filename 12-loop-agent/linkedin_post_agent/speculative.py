@@ -0,0 +1,129 @@
+"""
+Speculative Best-of-K Refinement
+
+The refinement loop explores one rewrite per iteration, so a refiner that
+misses part of the feedback costs another reviewer and refiner round-trip.
+Speculative refinement asks for K rewrites of the same post and feedback at
+once, each sampled at a different temperature, and advances the one that
+scores best on the local rules (post_penalty in rules.py). The K calls run
+concurrently under a ParallelAgent, so an iteration takes about as long as
+one refiner call, at K times its cost.
+
+The candidate keys are cleared before the K refiners run, so a refiner that
+returns no text cannot leave the selector an earlier iteration's post.
+"""
+
+from typing import AsyncGenerator, List, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent, ParallelAgent, SequentialAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from .rules import post_penalty
+
+# --- Constants ---
+MIN_TEMPERATURE = 0.2
+MAX_TEMPERATURE = 1.0
+CANDIDATE_KEY = "refine_candidate_{}"
+
+
+class CandidateSelector(BaseAgent):
+    """Advances the best-scoring candidate post to current_post."""
+
+    candidate_keys: List[str]
+    """
+    The session state keys the candidate refiners wrote their posts to,
+    cleared before they ran (see create_candidate_reset).
+    """
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        candidates = [state[key] for key in self.candidate_keys if state.get(key)]
+        if not candidates:
+            return  # Every candidate failed; keep the current post
+        penalties = [post_penalty(candidate) for candidate in candidates]
+        best = min(range(len(candidates)), key=penalties.__getitem__)
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(
+                role="model", parts=[types.Part(text=candidates[best])]
+            ),
+            actions=EventActions(
+                state_delta={
+                    "current_post": candidates[best],
+                    "candidate_penalties": penalties,
+                }
+            ),
+        )
+
+
+def create_candidate_reset(candidate_keys: List[str]):
+    """Create a before_agent_callback that clears `candidate_keys`."""
+
+    def clear_candidates(callback_context: CallbackContext) -> Optional[types.Content]:
+        for key in candidate_keys:
+            if callback_context.state.get(key) is not None:
+                callback_context.state[key] = None
+        return None
+
+    return clear_candidates
+
+
+def candidate_temperatures(candidates: int) -> List[float]:
+    """Temperatures spread evenly from MIN_TEMPERATURE to MAX_TEMPERATURE."""
+    if candidates == 1:
+        return [MIN_TEMPERATURE]
+    step = (MAX_TEMPERATURE - MIN_TEMPERATURE) / (candidates - 1)
+    return [round(MIN_TEMPERATURE + i * step, 2) for i in range(candidates)]
+
+
+def create_speculative_refiner(refiner: LlmAgent, candidates: int) -> SequentialAgent:
+    """
+    Build a drop-in replacement for `refiner` that tries `candidates` rewrites.
+
+    Args:
+        refiner: The refiner to copy; its instruction, model and callbacks are kept
+        candidates: Number of rewrites to request concurrently (K)
+
+    Returns:
+        SequentialAgent: Runs the K refiners in parallel, then the selector
+    """
+    candidate_refiners = []
+    for i, temperature in enumerate(candidate_temperatures(candidates)):
+        config = (
+            refiner.generate_content_config.model_copy()
+            if refiner.generate_content_config
+            else types.GenerateContentConfig()
+        )
+        config.temperature = temperature
+        candidate_refiners.append(
+            refiner.model_copy(
+                update={
+                    "name": f"{refiner.name}Candidate{i}",
+                    "output_key": CANDIDATE_KEY.format(i),
+                    "generate_content_config": config,
+                    "parent_agent": None,
+                }
+            )
+        )
+
+    candidate_keys = [agent.output_key for agent in candidate_refiners]
+    return SequentialAgent(
+        name="SpeculativePostRefiner",
+        sub_agents=[
+            ParallelAgent(
+                name="CandidateRefiners",
+                sub_agents=candidate_refiners,
+                before_agent_callback=create_candidate_reset(candidate_keys),
+            ),
+            CandidateSelector(name="CandidateSelector", candidate_keys=candidate_keys),
+        ],
+        description=f"Refines the post {candidates} ways at once and keeps the best",
+    )
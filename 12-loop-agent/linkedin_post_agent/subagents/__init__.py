@@ -5,5 +5,6 @@ This package provides all subagents used in the LinkedIn post generation system.
 """
 
 from .post_generator import initial_post_generator
+from .post_patcher import post_patcher
 from .post_refiner import post_refiner
 from .post_reviewer import post_reviewer
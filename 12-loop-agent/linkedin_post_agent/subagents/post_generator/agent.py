@@ -6,6 +6,8 @@ This agent generates the initial LinkedIn post before refinement.
 
 from google.adk.agents.llm_agent import LlmAgent
 
+from ...admission import enforce_admission_control
+
 # Constants
 GEMINI_MODEL = "gemini-2.0-flash"
 
@@ -50,4 +52,5 @@ initial_post_generator = LlmAgent(
     """,
     description="Generates the initial LinkedIn post to start the refinement process",
     output_key="current_post",
+    before_model_callback=enforce_admission_control,
 )
@@ -0,0 +1,8 @@
+"""
+LinkedIn Post Patcher Agent Package
+
+This package provides an agent that answers review feedback with edits to a
+LinkedIn post instead of a full rewrite.
+"""
+
+from .agent import post_patcher
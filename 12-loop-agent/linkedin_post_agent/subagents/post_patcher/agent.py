@@ -0,0 +1,58 @@
+"""
+LinkedIn Post Patcher Agent
+
+This agent answers review feedback with a list of edits to the post (see
+patching.py), so small fixes cost a few output tokens instead of the whole
+post.
+"""
+
+from google.adk.agents.llm_agent import LlmAgent
+from google.genai import types
+
+from ...admission import enforce_admission_control
+
+# Constants
+GEMINI_MODEL = "gemini-2.0-flash"
+
+# Define the Post Patcher Agent
+post_patcher = LlmAgent(
+    name="PostPatcherAgent",
+    model=GEMINI_MODEL,
+    instruction="""You are a LinkedIn Post Patcher.
+
+    Your task is to fix a LinkedIn post based on review feedback by listing the edits to make, not by rewriting it.
+    
+    ## INPUTS
+    **Current Post:**
+    {current_post}
+    
+    **Review Feedback:**
+    {review_feedback}
+    
+    ## TASK
+    Work out the smallest set of edits that applies the feedback.
+    - Maintain the original tone and theme of the post
+    - Keep every content requirement met: excitement about the tutorial, at least 4 ADK capabilities,
+      a statement about improving AI applications, a mention of @aiwithbrandon and a call-to-action
+    - Keep to the style requirements: 1000-1500 characters, NO emojis, NO hashtags
+    
+    ## EDIT OPERATIONS
+    - {"op": "replace", "target": "<exact text from the post>", "text": "<new text>"}
+    - {"op": "delete", "target": "<exact text from the post>"}
+    - {"op": "insert_after", "anchor": "<exact text from the post>", "text": "<text to insert>"}
+    
+    Copy every target and anchor character for character from the current post, long enough to occur only once.
+    Include the blank line ("\\n\\n") in the inserted or deleted text when adding or removing a paragraph.
+    Edits are applied in order, each to the result of the previous one.
+    
+    ## OUTPUT INSTRUCTIONS
+    - Output ONLY a JSON object of the form {"edits": [...]}
+    - Do not add explanations or justifications
+    """,
+    description="Fixes LinkedIn posts by listing edits that apply the review feedback",
+    generate_content_config=types.GenerateContentConfig(
+        response_mime_type="application/json"
+    ),
+    output_key="post_patch",
+    before_model_callback=enforce_admission_control,
+)
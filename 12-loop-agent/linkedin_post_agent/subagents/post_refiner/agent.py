@@ -6,6 +6,8 @@ This agent refines LinkedIn posts based on review feedback.
 
 from google.adk.agents.llm_agent import LlmAgent
 
+from ...admission import enforce_admission_control
+
 # Constants
 GEMINI_MODEL = "gemini-2.0-flash"
 
@@ -47,4 +49,5 @@ post_refiner = LlmAgent(
     """,
     description="Refines LinkedIn posts based on feedback to improve quality",
     output_key="current_post",
+    before_model_callback=enforce_admission_control,
 )
@@ -2,10 +2,16 @@
 LinkedIn Post Reviewer Agent
 
 This agent reviews LinkedIn posts for quality and provides feedback.
+Posts that break a hard rule (length, emojis, hashtags, the @aiwithbrandon
+mention) are answered by the rule engine in rules.py without calling the model,
+and a post it has already reviewed gets its earlier verdict back (verdicts.py).
 """
 
 from google.adk.agents.llm_agent import LlmAgent
 
+from ...admission import enforce_admission_control
+from ...rules import check_post_rules
+from ...verdicts import record_verdict, reuse_verdict
 from .tools import count_characters, exit_loop
 
 # Constants
@@ -57,4 +63,7 @@ post_reviewer = LlmAgent(
     description="Reviews post quality and provides feedback on what to improve or exits the loop if requirements are met",
     tools=[count_characters, exit_loop],
     output_key="review_feedback",
+    before_agent_callback=[check_post_rules, reuse_verdict],
+    after_agent_callback=record_verdict,
+    before_model_callback=enforce_admission_control,
 )
@@ -8,11 +8,15 @@ from typing import Any, Dict
 
 from google.adk.tools.tool_context import ToolContext
 
+from ...rules import check_length
+from ...verdicts import LENGTH_CHECK_KEY
+
 
 def count_characters(text: str, tool_context: ToolContext) -> Dict[str, Any]:
     """
     Tool to count characters in the provided text and provide length-based feedback.
-    Updates review_status in the state based on length requirements.
+    Updates review_status in the state based on length requirements, and
+    keeps the result in length_check for the verdict cache.
 
     Args:
         text: The text to analyze for character count
@@ -24,39 +28,15 @@ def count_characters(text: str, tool_context: ToolContext) -> Dict[str, Any]:
             - char_count: number of characters in text
             - message: feedback message about the length
     """
-    char_count = len(text)
-    MIN_LENGTH = 1000
-    MAX_LENGTH = 1500
+    result = check_length(text)
 
     print("\n----------- TOOL DEBUG -----------")
-    print(f"Checking text length: {char_count} characters")
+    print(f"Checking text length: {result['char_count']} characters")
     print("----------------------------------\n")
 
-    if char_count < MIN_LENGTH:
-        chars_needed = MIN_LENGTH - char_count
-        tool_context.state["review_status"] = "fail"
-        return {
-            "result": "fail",
-            "char_count": char_count,
-            "chars_needed": chars_needed,
-            "message": f"Post is too short. Add {chars_needed} more characters to reach minimum length of {MIN_LENGTH}.",
-        }
-    elif char_count > MAX_LENGTH:
-        chars_to_remove = char_count - MAX_LENGTH
-        tool_context.state["review_status"] = "fail"
-        return {
-            "result": "fail",
-            "char_count": char_count,
-            "chars_to_remove": chars_to_remove,
-            "message": f"Post is too long. Remove {chars_to_remove} characters to meet maximum length of {MAX_LENGTH}.",
-        }
-    else:
-        tool_context.state["review_status"] = "pass"
-        return {
-            "result": "pass",
-            "char_count": char_count,
-            "message": f"Post length is good ({char_count} characters).",
-        }
+    tool_context.state["review_status"] = result["result"]
+    tool_context.state[LENGTH_CHECK_KEY] = result
+    return result
 
 
 def exit_loop(tool_context: ToolContext) -> Dict[str, Any]:
@@ -0,0 +1,83 @@
+"""
+Reviewer Verdict Cache
+
+The refiner sometimes hands back the post it was given, or one it wrote a
+few iterations earlier, and the reviewer would then pay two model calls to
+review text it has already judged. Each verdict is kept in review_verdicts
+in the session state: review_status, review_feedback and the
+count_characters result, keyed by post_fingerprint(), a hash of the post
+with its whitespace normalized.
+
+reuse_verdict is a before_agent_callback for the reviewer: when the post
+has a verdict, it restores it and skips the reviewer. record_verdict is the
+matching after_agent_callback. An approval ends the loop, so only verdicts
+asking for changes are ever reused.
+"""
+
+import hashlib
+import re
+import unicodedata
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+# --- Constants ---
+POST_KEY = "current_post"
+VERDICTS_KEY = "review_verdicts"
+LENGTH_CHECK_KEY = "length_check"
+VERDICT_FIELDS = ("review_status", "review_feedback", LENGTH_CHECK_KEY)
+
+
+def post_fingerprint(text: str) -> str:
+    """
+    A hash of `text` that ignores differences in whitespace.
+
+    Runs of spaces and tabs become one space, trailing spaces go, blank
+    lines collapse to one paragraph break and the text is NFC-normalized,
+    so a post that only differs in layout gets the same fingerprint.
+    """
+    text = unicodedata.normalize("NFC", text)
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r" ?\n ?", "\n", text)
+    text = re.sub(r"\n{3,}", "\n\n", text).strip()
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def reuse_verdict(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    Answer for the reviewer when the post has been reviewed before.
+
+    Restores review_status, review_feedback and the length check, and
+    returns the feedback so the reviewer is skipped. Returns None to let
+    the reviewer run on a post it has not seen.
+    """
+    post = callback_context.state.get(POST_KEY)
+    if post is None:
+        return None
+    verdict = callback_context.state.get(VERDICTS_KEY, {}).get(post_fingerprint(post))
+    if verdict is None:
+        return None
+
+    print("[VERDICT] Skipping the reviewer, this post was reviewed before")
+    for field in VERDICT_FIELDS:
+        callback_context.state[field] = verdict[field]
+    return types.Content(
+        role="model", parts=[types.Part(text=verdict["review_feedback"])]
+    )
+
+
+def record_verdict(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Keep the verdict the reviewer has just given on the current post."""
+    post = callback_context.state.get(POST_KEY)
+    feedback = callback_context.state.get("review_feedback")
+    if post is None or feedback is None:
+        return None
+
+    verdicts = dict(callback_context.state.get(VERDICTS_KEY, {}))
+    verdicts[post_fingerprint(post)] = {
+        field: callback_context.state.get(field) for field in VERDICT_FIELDS
+    }
+    # Assigned whole, so the change is recorded in the state delta
+    callback_context.state[VERDICTS_KEY] = verdicts
+    return None
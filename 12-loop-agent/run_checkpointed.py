@@ -0,0 +1,55 @@
+"""
+Checkpointed Post Run
+
+Runs the LinkedIn post pipeline as a named run that saves a checkpoint
+after each stage and each refinement loop iteration (see
+linkedin_post_agent/checkpoint.py). If the process dies, running the same
+--run-id again resumes it: the completed stages are skipped, and the loop
+carries on from the last iteration it saved.
+
+- the prompt is needed only to start a run, a resumed run reuses it,
+- checkpoints are JSON files in CHECKPOINT_DIR (default .checkpoints).
+
+Usage:
+    python run_checkpointed.py --run-id adk-post "Generate a LinkedIn post..."
+    python run_checkpointed.py --run-id adk-post
+"""
+
+import argparse
+import asyncio
+
+from dotenv import load_dotenv
+from google.adk.runners import InMemoryRunner
+
+from linkedin_post_agent.agent import root_agent
+from linkedin_post_agent.checkpoint import resume_session
+
+load_dotenv()
+
+USER_ID = "checkpointed"
+
+
+async def main_async(args):
+    runner = InMemoryRunner(agent=root_agent, app_name="linkedin_post_agent")
+    session, message = await resume_session(runner, USER_ID, args.run_id, args.prompt)
+    async for event in runner.run_async(
+        user_id=USER_ID, session_id=session.id, new_message=message
+    ):
+        if event.is_final_response() and event.content and event.content.parts:
+            print(f"\n[{event.author}]\n{event.content.parts[0].text}")
+
+    session = await runner.session_service.get_session(
+        app_name=runner.app_name, user_id=USER_ID, session_id=session.id
+    )
+    print(f"\n=== Final post ===\n{session.state.get('current_post')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--run-id", required=True)
+    parser.add_argument("prompt", nargs="?")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
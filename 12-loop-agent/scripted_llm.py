@@ -0,0 +1,565 @@
+"""
+Scripted LinkedIn Post Model
+
+A stand-in for Gemini that plays the generator, reviewer, refiner and
+patcher of linkedin_post_agent, for simulations and benchmarks that must not
+call a provider. It recognizes the agent from its instruction and answers
+the way a capable but imperfect model would:
+
+- the generator writes a draft assembled from stock sentences, with defects
+  drawn at random (off length, emojis, hashtags, no @aiwithbrandon mention,
+  too few capabilities, no call-to-action),
+- the reviewer calls count_characters, then either gives feedback naming
+  every defect or calls exit_loop; with approval_rate below 1 it sometimes
+  nitpicks a post with no defects instead of approving it, and
+- the refiner fixes each defect named in the feedback with probability
+  fix_rate, and sometimes introduces a new one (an emoji, an extra sentence),
+- the patcher makes the same rewrite but answers with the edits that produce
+  it, misquoting the text of one edit with probability misquote_rate.
+
+Every answer is a function of the prompt, the text it is given, the length
+of the conversation, the sampling temperature and the seed, so runs are
+reproducible, while a refiner given the same post and feedback on a later
+turn or at another temperature may answer differently.
+
+Each response carries usage metadata (about 4 characters per token), and
+sleeps `latency` seconds plus `token_latency` per output token to stand in
+for the provider's response time. With error_rate above 0, that share of
+calls fails the way an overloaded provider does, with a 503 ServerError.
+
+scripted_pipeline() builds the post pipeline around the model, and
+run_post() runs one post through it and counts what happened.
+"""
+
+import asyncio
+import difflib
+import json
+import os
+import random
+import time
+import zlib
+from collections import Counter
+from typing import AsyncGenerator, List, Optional, Tuple
+
+from google.adk.agents import SequentialAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.genai import errors, types
+from pydantic import PrivateAttr
+
+from linkedin_post_agent.agent import refinement_loop, root_agent
+from linkedin_post_agent.budget import BUDGET_FIELDS, STOP_REASON_KEY
+from linkedin_post_agent.checkpoint import resume_session
+from linkedin_post_agent.patching import apply_edits, create_patching_refiner
+from linkedin_post_agent.rules import (
+    EMOJI_PATTERN,
+    HASHTAG_PATTERN,
+    MAX_LENGTH,
+    MIN_LENGTH,
+    check_length,
+    check_post,
+    check_post_rules,
+    post_penalty,
+)
+from linkedin_post_agent.speculative import create_speculative_refiner
+from linkedin_post_agent.verdicts import (
+    LENGTH_CHECK_KEY,
+    record_verdict,
+    reuse_verdict,
+)
+from linkedin_post_agent.subagents.post_generator import initial_post_generator
+from linkedin_post_agent.subagents.post_patcher import post_patcher
+from linkedin_post_agent.subagents.post_refiner import post_refiner
+from linkedin_post_agent.subagents.post_reviewer import post_reviewer
+
+# --- Constants ---
+PROMPT = (
+    "Post {}: Generate a LinkedIn post about what I've learned from "
+    "@aiwithbrandon's Agent Development Kit tutorial."
+)
+CHARS_PER_TOKEN = 4
+# ADK appends the agent's name and description to its instruction
+IDENTITY_MARKER = "\n\nYou are an agent."
+REQUIRED_CAPABILITIES = 4
+
+OPENER_WITH_MENTION = (
+    "I just worked through @aiwithbrandon's Agent Development Kit tutorial, "
+    "and I am genuinely excited about what I can build with it now."
+)
+OPENER_WITHOUT_MENTION = (
+    "I just worked through an Agent Development Kit tutorial, and I am "
+    "genuinely excited about what I can build with it now."
+)
+CAPABILITIES = [
+    "The basic agent example showed how little code it takes to wire a "
+    "model, an instruction and a name into something that answers reliably.",
+    "Tool integration was a highlight: giving an agent plain Python "
+    "functions to call means it looks things up instead of guessing.",
+    "Running the same agent through LiteLLM made it clear that the "
+    "framework does not lock you into a single model provider.",
+    "Sessions and memory finally clicked for me, since state carries across "
+    "turns without me threading it through every call by hand.",
+    "Persistent storage takes those sessions to a database, so a "
+    "conversation can pick up exactly where it left off after a restart.",
+    "Multi-agent orchestration lets a root agent delegate to specialists, "
+    "which keeps each instruction short and each agent easy to test.",
+    "Callbacks give you hooks before and after every model and tool call, "
+    "which is exactly where guardrails and logging belong.",
+    "Sequential agents turn a multi-step workflow into a pipeline where "
+    "each stage hands its output to the next through shared state.",
+    "Parallel agents run independent work at the same time, which cut the "
+    "wall-clock time of my data gathering step dramatically.",
+    "Loop agents refine a result until it meets the bar, with a reviewer "
+    "deciding when the work is good enough to stop.",
+]
+APPLICATIONS = [
+    "I can already see these patterns handling support ticket triage, "
+    "weekly report generation and lead qualification at work.",
+    "What I appreciate most is how practical it all is: every pattern maps "
+    "onto a real problem a team is trying to automate today.",
+    "It has changed how I think about building AI applications, from one "
+    "giant prompt to small agents with clear responsibilities.",
+    "The examples are small enough to read in one sitting but complete "
+    "enough to adapt to a production service.",
+]
+CALL_TO_ACTION = (
+    "If you are building with AI agents too, let's connect and compare notes "
+    "on what is working for you."
+)
+EMOJIS = ["\U0001f680", "\U0001f525", "\u2728", "\U0001f916", "\U0001f4a1"]
+HASHTAGS = "#AI #AgentDevelopmentKit #MachineLearning #GenAI"
+# What a reviewer that will not approve says about a post with no defects
+NITPICK = "Make the enthusiasm more specific to your own projects."
+# The body of the provider's 503 when it sheds load
+OVERLOADED = {
+    "error": {
+        "code": 503,
+        "message": "The model is overloaded.",
+        "status": "UNAVAILABLE",
+    }
+}
+
+
+def _rng(seed: int, *texts: str) -> random.Random:
+    return random.Random(zlib.crc32("\x00".join(texts).encode()) ^ seed)
+
+
+def _paragraphs(post: str) -> List[str]:
+    return [p for p in post.split("\n\n") if p.strip()]
+
+
+def _capability_count(post: str) -> int:
+    return sum(capability in post for capability in CAPABILITIES)
+
+
+def _add_emoji(post: str, rng: random.Random) -> str:
+    paragraphs = _paragraphs(post)
+    i = rng.randrange(len(paragraphs))
+    paragraphs[i] = f"{paragraphs[i]} {rng.choice(EMOJIS)}"
+    return "\n\n".join(paragraphs)
+
+
+def write_draft(prompt: str, seed: int = 0) -> str:
+    """The generator's first draft for `prompt`, with random defects."""
+    rng = _rng(seed, "draft", prompt)
+    opener = OPENER_WITHOUT_MENTION if rng.random() < 0.25 else OPENER_WITH_MENTION
+    # Two or three capabilities miss the soft requirement, seven or more
+    # usually run past the maximum length
+    capabilities = rng.sample(CAPABILITIES, rng.choice([3, 4, 5, 5, 6, 6, 7, 8]))
+    paragraphs = [opener, *capabilities, rng.choice(APPLICATIONS)]
+    if rng.random() < 0.8:
+        paragraphs.append(CALL_TO_ACTION)
+    post = "\n\n".join(paragraphs)
+    if rng.random() < 0.35:
+        post = _add_emoji(post, rng)
+    if rng.random() < 0.4:
+        post = f"{post}\n\n{HASHTAGS}"
+    return post
+
+
+def review_issues(post: str) -> List[str]:
+    """Everything a careful reviewer objects to, as feedback lines."""
+    issues = [violation.feedback for violation in check_post(post)]
+    if _capability_count(post) < REQUIRED_CAPABILITIES:
+        issues.append(
+            f"List at least {REQUIRED_CAPABILITIES} specific ADK capabilities."
+        )
+    if CALL_TO_ACTION not in post:
+        issues.append("End with a clear call-to-action for connections.")
+    return issues
+
+
+def refine_post(post: str, feedback: str, seed: int = 0, fix_rate: float = 0.8):
+    """The refiner's rewrite of `post` after `feedback`."""
+    rng = _rng(seed, "refine", post, feedback)
+    feedback = feedback.lower()
+
+    def asked(*words):
+        return any(word in feedback for word in words) and rng.random() < fix_rate
+
+    if asked("emoji"):
+        post = EMOJI_PATTERN.sub("", post).replace(" \n", "\n").rstrip()
+    if asked("hashtag"):
+        post = HASHTAG_PATTERN.sub("", post)
+        post = "\n\n".join(p.strip() for p in _paragraphs(post) if p.strip())
+    if asked("@aiwithbrandon"):
+        post = post.replace(OPENER_WITHOUT_MENTION, OPENER_WITH_MENTION)
+    if asked("call-to-action"):
+        post = f"{post}\n\n{CALL_TO_ACTION}"
+
+    paragraphs = _paragraphs(post)
+    unused = [c for c in CAPABILITIES if c not in post]
+    rng.shuffle(unused)
+    if asked("capabilities"):
+        while _capability_count("\n\n".join(paragraphs)) < REQUIRED_CAPABILITIES:
+            paragraphs.insert(1, unused.pop())
+    if asked("too short"):
+        # Aims for the range but guesses sentence lengths, so may overshoot
+        while unused and len("\n\n".join(paragraphs)) < MIN_LENGTH:
+            paragraphs.insert(1, unused.pop())
+        if unused and rng.random() < 0.3:
+            paragraphs.insert(1, unused.pop())
+    if asked("too long"):
+        while len("\n\n".join(paragraphs)) > MAX_LENGTH and len(paragraphs) > 3:
+            keep = _capability_count("\n\n".join(paragraphs)) > REQUIRED_CAPABILITIES
+            removable = [
+                i
+                for i, p in enumerate(paragraphs[1:-1], 1)
+                if keep or p not in CAPABILITIES
+            ]
+            if not removable:
+                break
+            paragraphs.pop(rng.choice(removable))
+        if len(paragraphs) > 3 and rng.random() < 0.3:
+            paragraphs.pop(rng.randrange(1, len(paragraphs) - 1))
+    post = "\n\n".join(paragraphs)
+
+    # Rewrites drift: a new sentence or an emoji creeps in now and then
+    if unused and rng.random() < 0.15:
+        paragraphs.insert(len(paragraphs) - 1, unused.pop())
+        post = "\n\n".join(paragraphs)
+    if rng.random() < 0.1:
+        post = _add_emoji(post, rng)
+    return post
+
+
+def _unique_tail(text: str, post: str, minimum: int = 30) -> str:
+    """The shortest tail of `text`, from `minimum` characters, found once in `post`."""
+    size = minimum
+    while size < len(text) and post.count(text[-size:]) != 1:
+        size += minimum
+    return text[-size:]
+
+
+def _unique_span(post: str, start: int, end: int) -> Tuple[int, int]:
+    """Widen post[start:end] a word at a time until it occurs only once."""
+    while post.count(post[start:end]) != 1 or start == end:
+        if start > 0:
+            start = post.rfind(" ", 0, start - 1) + 1
+        if end < len(post) and post.count(post[start:end]) != 1:
+            following = post.find(" ", end + 1)
+            end = len(post) if following < 0 else following
+        if start == 0 and end == len(post):
+            break
+    return start, end
+
+
+def patch_edits(post: str, rewrite: str) -> List[dict]:
+    """The edits (see linkedin_post_agent/patching.py) that turn `post` into `rewrite`."""
+    old, new = _paragraphs(post), _paragraphs(rewrite)
+    opcodes = difflib.SequenceMatcher(a=old, b=new, autojunk=False).get_opcodes()
+    edits = []
+    current = post
+    # From the end, so each edit's quoted text is checked against the post
+    # as the earlier edits leave it
+    for tag, i1, i2, j1, j2 in reversed(opcodes):
+        removed, added = "\n\n".join(old[i1:i2]), "\n\n".join(new[j1:j2])
+        if tag == "equal":
+            continue
+        if tag == "replace":
+            # Only the changed middle, widened until it is unique
+            prefix = len(os.path.commonprefix([removed, added]))
+            suffix = len(
+                os.path.commonprefix([removed[prefix:][::-1], added[prefix:][::-1]])
+            )
+            offset = current.index(removed)
+            start, end = _unique_span(
+                current, offset + prefix, offset + len(removed) - suffix
+            )
+            target = current[start:end]
+            text = added[start - offset : len(added) - (offset + len(removed) - end)]
+            edit = {"op": "replace", "target": target, "text": text}
+        elif tag == "delete":
+            target = f"\n\n{removed}" if i1 > 0 else f"{removed}\n\n"
+            edit = {"op": "delete", "target": target}
+        elif i1 > 0:
+            anchor = _unique_tail(old[i1 - 1], current)
+            edit = {"op": "insert_after", "anchor": anchor, "text": f"\n\n{added}"}
+        else:
+            edit = {"op": "replace", "target": old[0], "text": f"{added}\n\n{old[0]}"}
+        edits.append(edit)
+        current = apply_edits(current, [edit])
+    return edits
+
+
+def _misquote(edit: dict) -> dict:
+    """The edit with its quoted text slightly paraphrased, as models do."""
+    field = "anchor" if edit["op"] == "insert_after" else "target"
+    span = edit[field]
+    return {**edit, field: f"{span[: len(span) // 2]} really{span[len(span) // 2 :]}"}
+
+
+def _text(text: str) -> types.Content:
+    return types.Content(role="model", parts=[types.Part(text=text)])
+
+
+def _call(name: str, **args) -> types.Content:
+    return types.Content(
+        role="model",
+        parts=[types.Part(function_call=types.FunctionCall(name=name, args=args))],
+    )
+
+
+def _section(instruction: str, start: str, end: str = None) -> str:
+    text = instruction.split(start, 1)[1]
+    if end is not None:
+        text = text.split(end, 1)[0]
+    return text.strip()
+
+
+def _usage(
+    llm_request: LlmRequest, content: types.Content
+) -> types.GenerateContentResponseUsageMetadata:
+    prompt_chars = len(llm_request.config.system_instruction or "")
+    for request_content in llm_request.contents:
+        for part in request_content.parts or []:
+            prompt_chars += len(part.text or "")
+    output_chars = sum(
+        len(part.text or "") + len(str(part.function_call or ""))
+        for part in content.parts
+    )
+    return types.GenerateContentResponseUsageMetadata(
+        prompt_token_count=prompt_chars // CHARS_PER_TOKEN,
+        candidates_token_count=output_chars // CHARS_PER_TOKEN,
+        total_token_count=(prompt_chars + output_chars) // CHARS_PER_TOKEN,
+    )
+
+
+class ScriptedPostLlm(BaseLlm):
+    """Plays the post generator, reviewer, refiner and patcher without a provider."""
+
+    model: str = "scripted-post-llm"
+    seed: int = 0
+    fix_rate: float = 0.8
+    approval_rate: float = 1.0
+    misquote_rate: float = 0.1
+    error_rate: float = 0.0
+    latency: float = 0.0
+    token_latency: float = 0.0
+    _errors: random.Random = PrivateAttr(default=None)
+
+    def model_post_init(self, context) -> None:
+        super().model_post_init(context)
+        self._errors = random.Random(self.seed)
+
+    def answer(self, llm_request: LlmRequest) -> types.Content:
+        instruction = llm_request.config.system_instruction or ""
+        instruction = instruction.split(IDENTITY_MARKER, 1)[0]
+        # The conversation grows every turn, so a retry is not a replay
+        turn = len(llm_request.contents)
+        if "Post Generator" in instruction:
+            prompt = "".join(
+                part.text or ""
+                for content in llm_request.contents
+                if content.role == "user"
+                for part in content.parts or []
+            )
+            return _text(write_draft(prompt, self.seed))
+        if "Post Quality Reviewer" in instruction:
+            return self._review(instruction, llm_request)
+        if "Post Refiner" in instruction:
+            post = _section(instruction, "**Current Post:**", "**Review Feedback:**")
+            feedback = _section(instruction, "**Review Feedback:**", "## TASK")
+            # Each sampling temperature draws a different rewrite
+            temperature = llm_request.config.temperature or 0.0
+            seed = self.seed + turn + int(temperature * 1000)
+            return _text(refine_post(post, feedback, seed, self.fix_rate))
+        if "Post Patcher" in instruction:
+            post = _section(instruction, "**Current Post:**", "**Review Feedback:**")
+            feedback = _section(instruction, "**Review Feedback:**", "## TASK")
+            rewrite = refine_post(post, feedback, self.seed + turn, self.fix_rate)
+            edits = patch_edits(post, rewrite)
+            rng = _rng(self.seed + turn, "misquote", post, feedback)
+            if edits and rng.random() < self.misquote_rate:
+                edits[0] = _misquote(edits[0])
+            return _text(json.dumps({"edits": edits}))
+        raise ValueError("ScriptedPostLlm does not know this agent")
+
+    def _review(self, instruction: str, llm_request: LlmRequest) -> types.Content:
+        post = _section(instruction, "## POST TO REVIEW")
+        last = llm_request.contents[-1].parts[0] if llm_request.contents else None
+        response = last.function_response if last else None
+        if response is None or response.name not in ("count_characters", "exit_loop"):
+            return _call("count_characters", text=post)
+        if response.name == "exit_loop":
+            return _text("Post meets all requirements. Exiting the refinement loop.")
+        issues = review_issues(post)
+        if not issues:
+            if _rng(self.seed, "approve", post).random() < self.approval_rate:
+                return _call("exit_loop")
+            issues = [NITPICK]
+        if check_length(post)["result"] == "fail":
+            issues[0] += " Tighten or expand the capability paragraphs accordingly."
+        return _text("\n".join(f"- {issue}" for issue in issues))
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self._errors.random() < self.error_rate:
+            await asyncio.sleep(self.latency)
+            raise errors.ServerError(503, OVERLOADED)
+        content = self.answer(llm_request)
+        usage = _usage(llm_request, content)
+        delay = self.latency + self.token_latency * usage.candidates_token_count
+        if delay:
+            await asyncio.sleep(delay)
+        yield LlmResponse(content=content, usage_metadata=usage)
+
+
+def with_model(agent, llm: BaseLlm, **update):
+    """A copy of an LlmAgent (outside any tree) that calls `llm` instead."""
+    return agent.model_copy(update={"parent_agent": None, "model": llm, **update})
+
+
+def scripted_pipeline(
+    llm: BaseLlm,
+    precheck: bool = True,
+    candidates: int = 1,
+    patch: bool = False,
+    verdict_cache: bool = True,
+    **loop_options,
+) -> SequentialAgent:
+    """
+    The post pipeline with every agent calling `llm`.
+
+    Admission control is left out, since every simulated post would be
+    charged to the same budget.
+
+    Args:
+        llm: The model every agent calls
+        precheck: Keep the reviewer's rule pre-check
+        candidates: Refinements per iteration; more than one is speculative
+        patch: Refine with the patcher, falling back to the refiner
+        verdict_cache: Reuse the reviewer's verdicts on posts it has seen
+        loop_options: Overrides of the refinement loop's budgets, e.g.
+            patience=None or detect_oscillation=False; loop_class=LoopAgent
+            runs the plain ADK loop
+    """
+
+    def copy(agent, **update):
+        return with_model(agent, llm, before_model_callback=None, **update)
+
+    before_review = [check_post_rules] if precheck else []
+    if verdict_cache:
+        before_review.append(reuse_verdict)
+    reviewer = copy(
+        post_reviewer,
+        before_agent_callback=before_review or None,
+        after_agent_callback=record_verdict if verdict_cache else None,
+    )
+    refiner = copy(post_refiner)
+    if patch:
+        refiner = create_patching_refiner(copy(post_patcher), refiner)
+    elif candidates > 1:
+        refiner = create_speculative_refiner(refiner, candidates)
+    loop_class = loop_options.pop("loop_class", type(refinement_loop))
+    options = {
+        field: getattr(refinement_loop, field)
+        for field in ("max_iterations", "detect_oscillation", *BUDGET_FIELDS)
+        if field in loop_class.model_fields
+    }
+    options.update(loop_options)
+    return type(root_agent)(
+        name=root_agent.name,
+        sub_agents=[
+            copy(initial_post_generator),
+            loop_class(
+                name=refinement_loop.name, sub_agents=[reviewer, refiner], **options
+            ),
+        ],
+    )
+
+
+async def run_post(
+    runner: InMemoryRunner, prompt: Optional[str], run_id: Optional[str] = None
+) -> Counter:
+    """
+    Run one post through `runner` in a new session.
+
+    With a `run_id`, the post is a checkpointed run (see
+    linkedin_post_agent/checkpoint.py), resumed if it has a checkpoint;
+    `prompt` may then be None.
+
+    Returns:
+        Counter: model calls (in total and per agent as "calls:<name>"),
+        prompt_tokens, output_tokens (also per agent as "output_tokens:<name>"),
+        rule_verdicts (reviewer turns answered by the rules), cached_verdicts
+        (reviewer turns answered by an earlier verdict), refinements,
+        refine_seconds (from each review to the refined post), iterations,
+        converged (1 if the reviewer approved), seconds, final_penalty
+        (post_penalty of the final post), "stop:<loop_stop_reason>" and, in
+        patch mode, "refine:<refine_mode>"
+    """
+    started = time.perf_counter()
+    if run_id is None:
+        session = await runner.session_service.create_session(
+            app_name=runner.app_name, user_id="simulation"
+        )
+        message = types.Content(role="user", parts=[types.Part(text=prompt)])
+    else:
+        session, message = await resume_session(runner, "simulation", run_id, prompt)
+    stats = Counter()
+    reviewed = started
+    async for event in runner.run_async(
+        user_id="simulation", session_id=session.id, new_message=message
+    ):
+        if event.usage_metadata is not None:
+            output_tokens = event.usage_metadata.candidates_token_count
+            stats[f"calls:{event.author}"] += 1
+            stats["calls"] += 1
+            stats["prompt_tokens"] += event.usage_metadata.prompt_token_count
+            stats["output_tokens"] += output_tokens
+            stats[f"output_tokens:{event.author}"] += output_tokens
+        elif (
+            event.author == post_reviewer.name
+            and event.content is not None
+            and event.is_final_response()
+        ):
+            # Answered without the model: a cached verdict restores the
+            # length check too, the rules do not
+            if LENGTH_CHECK_KEY in event.actions.state_delta:
+                stats["cached_verdicts"] += 1
+            else:
+                stats["rule_verdicts"] += 1
+        if event.author == post_reviewer.name:
+            reviewed = time.perf_counter()
+        if "refine_mode" in event.actions.state_delta:
+            stats[f"refine:{event.actions.state_delta['refine_mode']}"] += 1
+        # The loop itself writes current_post only to restore the best post
+        if "current_post" in event.actions.state_delta and event.author not in (
+            initial_post_generator.name,
+            refinement_loop.name,
+        ):
+            stats["refinements"] += 1
+            stats["refine_seconds"] += time.perf_counter() - reviewed
+        if event.actions.escalate:
+            stats["converged"] = 1
+    # Every iteration but an approving last one ends with a refinement
+    stats["iterations"] = stats["refinements"] + stats["converged"]
+    stats["seconds"] = time.perf_counter() - started
+    session = await runner.session_service.get_session(
+        app_name=runner.app_name, user_id="simulation", session_id=session.id
+    )
+    stats["final_penalty"] = post_penalty(session.state["current_post"])
+    stats[f"stop:{session.state.get(STOP_REASON_KEY)}"] = 1
+    return stats
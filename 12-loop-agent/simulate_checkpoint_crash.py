@@ -0,0 +1,186 @@
+"""
+Checkpoint Crash Simulation
+
+Kills the post pipeline partway through and checks that the checkpointed
+run resumes where it died (see linkedin_post_agent/checkpoint.py). For each
+of --posts prompts it:
+
+- runs the post once without a crash, to count its model calls,
+- runs it in a child process that exits abruptly, like a killed process, on
+  a model call drawn at random from that count, and
+- resumes the run from its checkpoint in a new session.
+
+It checks that the resumed run never calls an agent whose stage completed
+before the crash, that the loop carries on from the iteration after the
+last one saved, and that the run finishes. It reports the calls a resumed
+run makes against a rerun from scratch.
+
+The model is scripted_llm.ScriptedPostLlm; the reviewer approves
+--approval-rate of the posts that pass every check, so loops run long.
+
+Usage:
+    python simulate_checkpoint_crash.py [--posts 20] [--approval-rate 0.3]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from google.adk.runners import InMemoryRunner
+from pydantic import PrivateAttr
+
+from linkedin_post_agent.budget import STOP_REASON_KEY, TELEMETRY_KEY
+from linkedin_post_agent.checkpoint import CheckpointStore, set_checkpoint_store
+from linkedin_post_agent.subagents.post_generator import initial_post_generator
+from scripted_llm import PROMPT, ScriptedPostLlm, run_post, scripted_pipeline
+
+CRASH_EXIT_CODE = 75
+
+
+class CrashingLlm(ScriptedPostLlm):
+    """Kills the process on its crash_after-th call, before answering it."""
+
+    crash_after: int = 0
+    _calls: int = PrivateAttr(default=0)
+
+    async def generate_content_async(self, llm_request, stream=False):
+        self._calls += 1
+        if self._calls == self.crash_after:
+            os._exit(CRASH_EXIT_CODE)
+        async for response in super().generate_content_async(llm_request, stream):
+            yield response
+
+
+def make_runner(args, crash_after=0):
+    llm = CrashingLlm(
+        seed=args.seed,
+        fix_rate=args.fix_rate,
+        approval_rate=args.approval_rate,
+        crash_after=crash_after,
+    )
+    return InMemoryRunner(agent=scripted_pipeline(llm), app_name="checkpoint_crash")
+
+
+async def final_state(runner):
+    sessions = await runner.session_service.list_sessions(
+        app_name=runner.app_name, user_id="simulation"
+    )
+    session = await runner.session_service.get_session(
+        app_name=runner.app_name,
+        user_id="simulation",
+        session_id=sessions.sessions[-1].id,
+    )
+    return session.state
+
+
+def crash(args, run_id, prompt, crash_after):
+    """Run the post in a child process that dies on call `crash_after`."""
+    child = subprocess.run(
+        [
+            sys.executable,
+            __file__,
+            *("--checkpoint-dir", args.checkpoint_dir),
+            *("--approval-rate", str(args.approval_rate)),
+            *("--fix-rate", str(args.fix_rate)),
+            *("--seed", str(args.seed)),
+            *("--crash-run", run_id, prompt, str(crash_after)),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return child.returncode
+
+
+async def simulate(args):
+    store = CheckpointStore(args.checkpoint_dir)
+    set_checkpoint_store(store)
+    rng = random.Random(args.seed)
+    scratch_calls, resumed_calls, failures = [], [], []
+    crashed_in = {"generator": 0, "loop": 0}
+    for i in range(args.posts):
+        prompt = PROMPT.format(i)
+        with contextlib.redirect_stdout(io.StringIO()):
+            baseline = await run_post(make_runner(args), prompt)
+        crash_after = rng.randint(1, baseline["calls"])
+
+        run_id = f"post-{i}"
+        code = crash(args, run_id, prompt, crash_after)
+        checkpoint = store.load(run_id)
+        if code != CRASH_EXIT_CODE or checkpoint is None:
+            failures.append(f"{run_id}: the child exited with {code}")
+            continue
+        generator_done = initial_post_generator.name in checkpoint["completed"]
+        crashed_in["loop" if generator_done else "generator"] += 1
+        saved_iteration = next(iter(checkpoint["loops"].values()), {}).get(
+            "iteration", 0
+        )
+
+        runner = make_runner(args)
+        with contextlib.redirect_stdout(io.StringIO()):
+            resumed = await run_post(runner, None, run_id=run_id)
+        state = await final_state(runner)
+        telemetry = state.get(TELEMETRY_KEY, [])
+        new_iterations = [r["iteration"] for r in telemetry][saved_iteration:]
+
+        if generator_done and resumed[f"calls:{initial_post_generator.name}"]:
+            failures.append(f"{run_id}: the completed generator ran again")
+        if new_iterations and new_iterations[0] != saved_iteration + 1:
+            failures.append(
+                f"{run_id}: resumed at iteration {new_iterations[0]}, "
+                f"saved {saved_iteration}"
+            )
+        if state.get(STOP_REASON_KEY) is None:
+            failures.append(f"{run_id}: the resumed run did not finish")
+        scratch_calls.append(baseline["calls"])
+        resumed_calls.append(resumed["calls"])
+        store.delete(run_id)
+
+    print(
+        f"=== {args.posts} posts, crashed in the generator {crashed_in['generator']} "
+        f"times and in the loop {crashed_in['loop']} times ==="
+    )
+    if scratch_calls:
+        print(
+            f"model calls to finish after the crash: "
+            f"{statistics.mean(resumed_calls):.2f} resuming, "
+            f"{statistics.mean(scratch_calls):.2f} rerunning from scratch"
+        )
+    print(f"failed checks: {len(failures)}")
+    for failure in failures:
+        print(f"  {failure}")
+    return not failures
+
+
+async def crash_run(args):
+    run_id, prompt, crash_after = args.crash_run
+    set_checkpoint_store(CheckpointStore(args.checkpoint_dir))
+    await run_post(make_runner(args, int(crash_after)), prompt, run_id=run_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--posts", type=int, default=20)
+    parser.add_argument("--approval-rate", type=float, default=0.3)
+    parser.add_argument("--fix-rate", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--checkpoint-dir")
+    # Internal: the child process that crashes
+    parser.add_argument("--crash-run", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.crash_run:
+        asyncio.run(crash_run(args))
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        args.checkpoint_dir = args.checkpoint_dir or directory
+        sys.exit(0 if asyncio.run(simulate(args)) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Loop Budget Simulation
+
+Runs --posts prompts through the post pipeline with a reviewer that rarely
+approves (--approval-rate), once with the plain LoopAgent and once per
+budget of BudgetedLoopAgent (linkedin_post_agent/budget.py):
+
+- patience: stop after --patience iterations without a better post,
+- tokens: stop once the loop has used --max-tokens tokens,
+- deadline: stop --deadline seconds into the loop, and
+- all three together.
+
+For each it reports per post the iterations, tokens, wall time and the
+penalty of the final post (post_penalty in rules.py: 1000 per failed hard
+rule plus characters outside the length range, so 0 means every hard rule
+passes), and why the loops stopped. It ends with one post's loop_telemetry.
+
+The model is scripted_llm.ScriptedPostLlm answering after --latency seconds.
+
+Usage:
+    python simulate_loop_budget.py [--posts 50] [--approval-rate 0.0]
+                                   [--patience 3] [--max-tokens 20000]
+                                   [--deadline 1.5]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+from collections import Counter
+
+from google.adk.agents import LoopAgent
+from google.adk.runners import InMemoryRunner
+
+from linkedin_post_agent.budget import TELEMETRY_KEY
+from scripted_llm import PROMPT, ScriptedPostLlm, run_post, scripted_pipeline
+
+# Each budget on its own, without the loop's other early stop
+NO_BUDGETS = {
+    "deadline_seconds": None,
+    "max_tokens": None,
+    "patience": None,
+    "detect_oscillation": False,
+}
+
+
+async def run_corpus(args, loop_options):
+    llm = ScriptedPostLlm(
+        seed=args.seed,
+        fix_rate=args.fix_rate,
+        approval_rate=args.approval_rate,
+        latency=args.latency,
+    )
+    runner = InMemoryRunner(
+        agent=scripted_pipeline(llm, **loop_options), app_name="loop_budget"
+    )
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(i):
+        async with semaphore:
+            return await run_post(runner, PROMPT.format(i))
+
+    # The tools, the pre-check and the loop print a line per call
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = await asyncio.gather(*(one(i) for i in range(args.posts)))
+    return runner, results
+
+
+def summarize(label, results):
+    def mean(key):
+        return statistics.mean(stats[key] for stats in results)
+
+    stops = Counter()
+    for stats in results:
+        stops.update(key[5:] for key in stats if key.startswith("stop:"))
+    stops["not recorded"] = stops.pop("None", 0)
+    stops = +stops
+    print(
+        f"{label:<18} {mean('iterations'):10.2f} {mean('tokens'):8.0f} "
+        f"{mean('seconds'):7.2f}s {mean('final_penalty'):8.1f}  "
+        + ", ".join(f"{reason} {count}" for reason, count in stops.most_common())
+    )
+
+
+async def main_async(args):
+    print(
+        f"=== {args.posts} posts, reviewer approves {args.approval_rate:.0%} "
+        f"of clean posts, {args.latency:g}s per model call ==="
+    )
+    print(
+        f"{'loop':<18} {'iterations':>10} {'tokens':>8} {'wall':>8} "
+        f"{'penalty':>8}  stopped by"
+    )
+    variants = [
+        ("LoopAgent", {"loop_class": LoopAgent}),
+        (f"patience {args.patience}", {**NO_BUDGETS, "patience": args.patience}),
+        (f"{args.max_tokens} tokens", {**NO_BUDGETS, "max_tokens": args.max_tokens}),
+        (
+            f"{args.deadline:g}s deadline",
+            {**NO_BUDGETS, "deadline_seconds": args.deadline},
+        ),
+        (
+            "all three",
+            {
+                "deadline_seconds": args.deadline,
+                "max_tokens": args.max_tokens,
+                "patience": args.patience,
+            },
+        ),
+    ]
+    for label, loop_options in variants:
+        runner, results = await run_corpus(args, loop_options)
+        for stats in results:
+            stats["tokens"] = stats["prompt_tokens"] + stats["output_tokens"]
+        summarize(label, results)
+
+    sessions = await runner.session_service.list_sessions(
+        app_name=runner.app_name, user_id="simulation"
+    )
+    session = await runner.session_service.get_session(
+        app_name=runner.app_name,
+        user_id="simulation",
+        session_id=sessions.sessions[0].id,
+    )
+    print(f"\n=== {TELEMETRY_KEY} of one post (all three budgets) ===")
+    for record in session.state[TELEMETRY_KEY]:
+        print(record)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--posts", type=int, default=50)
+    parser.add_argument("--approval-rate", type=float, default=0.0)
+    parser.add_argument("--patience", type=int, default=3)
+    parser.add_argument("--max-tokens", type=int, default=20_000)
+    parser.add_argument("--deadline", type=float, default=1.5)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--fix-rate", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Rule Pre-Check Simulation
+
+Runs the post pipeline over a corpus of --posts prompts twice, with the
+reviewer's rule pre-check (linkedin_post_agent/rules.py) and without it, and
+reports per post:
+
+- loop iterations (reviewer turns, whether answered by the rules or the
+  model) and whether the loop converged (the reviewer approved the post)
+  before max_iterations,
+- model calls, split by agent, and output tokens.
+
+The model is scripted_llm.ScriptedPostLlm, so no provider is called and both
+runs see the same drafts.
+
+Usage:
+    python simulate_rule_precheck.py [--posts 200] [--fix-rate 0.8] [--seed 0]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+from collections import Counter
+
+from google.adk.runners import InMemoryRunner
+
+from linkedin_post_agent.rules import check_post
+from linkedin_post_agent.subagents.post_refiner import post_refiner
+from linkedin_post_agent.subagents.post_reviewer import post_reviewer
+from scripted_llm import (
+    PROMPT,
+    ScriptedPostLlm,
+    run_post,
+    scripted_pipeline,
+    write_draft,
+)
+
+
+async def run_corpus(args, precheck):
+    llm = ScriptedPostLlm(seed=args.seed, fix_rate=args.fix_rate)
+    runner = InMemoryRunner(
+        agent=scripted_pipeline(llm, precheck), app_name="rule_precheck"
+    )
+    results = []
+    # The tools and the pre-check print a line per call
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(args.posts):
+            results.append(await run_post(runner, PROMPT.format(i)))
+    return results
+
+
+def summarize(label, results):
+    def mean(key):
+        return statistics.mean(stats[key] for stats in results)
+
+    print(
+        f"{label:<14} iterations={mean('iterations'):5.2f}  "
+        f"model calls={mean('calls'):5.2f} "
+        f"(reviewer {mean('calls:' + post_reviewer.name):5.2f}, "
+        f"refiner {mean('calls:' + post_refiner.name):4.2f})  "
+        f"output tokens={mean('output_tokens'):6.0f}  "
+        f"converged={mean('converged'):6.1%}"
+    )
+    return mean("calls")
+
+
+async def main_async(args):
+    drafts = [write_draft(PROMPT.format(i), args.seed) for i in range(args.posts)]
+    failures = Counter(
+        violation.rule for draft in drafts for violation in check_post(draft)
+    )
+    print(f"=== Corpus: {args.posts} drafts ===")
+    print(
+        "drafts failing a hard rule: "
+        f"{sum(bool(check_post(draft)) for draft in drafts) / len(drafts):.0%}  "
+        + "  ".join(f"{rule}={count}" for rule, count in failures.most_common())
+    )
+
+    print("\n=== Per post (means) ===")
+    baseline = summarize("reviewer only", await run_corpus(args, precheck=False))
+    results = await run_corpus(args, precheck=True)
+    with_rules = summarize("rule pre-check", results)
+    verdicts = sum(stats["rule_verdicts"] for stats in results)
+    turns = sum(stats["iterations"] for stats in results)
+    print(
+        f"\nrule pre-check answered {verdicts}/{turns} reviewer turns; "
+        f"model calls per post {1 - with_rules / baseline:.0%} lower"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--fix-rate", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
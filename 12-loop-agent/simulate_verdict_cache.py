@@ -0,0 +1,102 @@
+"""
+Verdict Cache Simulation
+
+Runs --posts prompts through the post pipeline three times, with a reviewer
+that approves only --approval-rate of the posts it has no objection to, so
+that the refiner is often asked for changes it cannot find and hands back
+the same post:
+
+- without the verdict cache or oscillation detection,
+- with the verdict cache (linkedin_post_agent/verdicts.py), and
+- with the cache and the loop stopping when the post returns to one from
+  an earlier iteration (A, B, A).
+
+For each it reports per post the reviewer's model calls, the reviews
+answered from the cache, iterations, all model calls, output tokens, the
+share approved, the penalty of the final post (0 when every hard rule
+passes) and why the loops stopped.
+
+Usage:
+    python simulate_verdict_cache.py [--posts 200] [--approval-rate 0.5]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+from collections import Counter
+
+from google.adk.runners import InMemoryRunner
+
+from linkedin_post_agent.subagents.post_reviewer import post_reviewer
+from scripted_llm import PROMPT, ScriptedPostLlm, run_post, scripted_pipeline
+
+VARIANTS = [
+    ("no cache", {"verdict_cache": False, "detect_oscillation": False}),
+    ("verdict cache", {"verdict_cache": True, "detect_oscillation": False}),
+    ("+ oscillation", {"verdict_cache": True, "detect_oscillation": True}),
+]
+
+
+async def run_corpus(args, options):
+    llm = ScriptedPostLlm(
+        seed=args.seed, fix_rate=args.fix_rate, approval_rate=args.approval_rate
+    )
+    runner = InMemoryRunner(
+        agent=scripted_pipeline(llm, **options), app_name="verdict_cache"
+    )
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(i):
+        async with semaphore:
+            return await run_post(runner, PROMPT.format(i))
+
+    # The tools, the callbacks and the loop print a line per call
+    with contextlib.redirect_stdout(io.StringIO()):
+        return await asyncio.gather(*(one(i) for i in range(args.posts)))
+
+
+async def main_async(args):
+    print(
+        f"=== {args.posts} posts, reviewer approves {args.approval_rate:.0%} "
+        f"of clean posts ==="
+    )
+    print(
+        f"{'variant':<14} {'reviewer':>8} {'cached':>6} {'iterations':>10} "
+        f"{'calls':>6} {'tokens':>6} {'approved':>8} {'penalty':>7}  stopped by"
+    )
+    baseline = None
+    for label, options in VARIANTS:
+        results = await run_corpus(args, options)
+
+        def mean(key):
+            return statistics.mean(stats[key] for stats in results)
+
+        stops = Counter()
+        for stats in results:
+            stops.update(key[5:] for key in stats if key.startswith("stop:"))
+        reviewer_calls = mean(f"calls:{post_reviewer.name}")
+        baseline = baseline or reviewer_calls
+        print(
+            f"{label:<14} {reviewer_calls:8.2f} {mean('cached_verdicts'):6.2f} "
+            f"{mean('iterations'):10.2f} {mean('calls'):6.2f} "
+            f"{mean('output_tokens'):6.0f} {mean('converged'):8.1%} "
+            f"{mean('final_penalty'):7.1f}  "
+            + ", ".join(f"{reason} {count}" for reason, count in stops.most_common())
+        )
+    print(f"reviewer calls vs no cache: {reviewer_calls / baseline - 1:+.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--approval-rate", type=float, default=0.5)
+    parser.add_argument("--fix-rate", type=float, default=0.8)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@ import random
 from google.adk.agents import Agent
 from google.adk.models.lite_llm import LiteLlm
 
+from .coalescing import coalesce_after_model, coalesce_before_model
+
 # https://docs.litellm.ai/docs/providers/openrouter
 model = LiteLlm(
     model="openrouter/openai/gpt-4.1",
@@ -30,4 +32,6 @@ root_agent = Agent(
     Only use the tool `get_dad_joke` to tell jokes.
     """,
     tools=[get_dad_joke],
+    before_model_callback=coalesce_before_model,
+    after_model_callback=coalesce_after_model,
 )
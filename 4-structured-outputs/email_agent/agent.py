@@ -1,6 +1,8 @@
 from google.adk.agents import LlmAgent
 from pydantic import BaseModel, Field
 
+from .coalescing import coalesce_after_model, coalesce_before_model
+
 
 # --- Define Output Schema ---
 class EmailContent(BaseModel):
@@ -42,4 +44,6 @@ root_agent = LlmAgent(
     description="Generates professional emails with structured subject and body",
     output_schema=EmailContent,
     output_key="email",
+    before_model_callback=coalesce_before_model,
+    after_model_callback=coalesce_after_model,
 )
@@ -1,5 +1,7 @@
 from google.adk.agents import Agent
 
+from .admission import enforce_admission_control
+
 from .sub_agents.course_support_agent.agent import course_support_agent
 from .sub_agents.order_agent.agent import order_agent
 from .sub_agents.policy_agent.agent import policy_agent
@@ -77,4 +79,5 @@ customer_service_agent = Agent(
     """,
     sub_agents=[policy_agent, sales_agent, course_support_agent, order_agent],
     tools=[],
+    before_model_callback=enforce_admission_control,
 )
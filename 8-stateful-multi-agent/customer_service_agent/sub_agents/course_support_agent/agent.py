@@ -1,5 +1,7 @@
 from google.adk.agents import Agent
 
+from ...admission import enforce_admission_control
+
 # Create the course support agent
 course_support_agent = Agent(
     name="course_support",
@@ -140,4 +142,5 @@ course_support_agent = Agent(
     4. Encourage hands-on practice
     """,
     tools=[],
+    before_model_callback=enforce_admission_control,
 )
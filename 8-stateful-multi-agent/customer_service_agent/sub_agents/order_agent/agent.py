@@ -3,6 +3,8 @@ from datetime import datetime
 from google.adk.agents import Agent
 from google.adk.tools.tool_context import ToolContext
 
+from ...admission import enforce_admission_control
+
 
 def get_current_time() -> dict:
     """Get the current time in the format YYYY-MM-DD HH:MM:SS"""
@@ -131,4 +133,5 @@ order_agent = Agent(
     - Direct purchase inquiries to sales
     """,
     tools=[refund_course, get_current_time],
+    before_model_callback=enforce_admission_control,
 )
@@ -1,5 +1,7 @@
 from google.adk.agents import Agent
 
+from ...admission import enforce_admission_control
+
 # Create the policy agent
 policy_agent = Agent(
     name="policy_agent",
@@ -57,4 +59,5 @@ policy_agent = Agent(
     4. Direct complex issues to support
     """,
     tools=[],
+    before_model_callback=enforce_admission_control,
 )
@@ -3,6 +3,8 @@ from datetime import datetime
 from google.adk.agents import Agent
 from google.adk.tools.tool_context import ToolContext
 
+from ...admission import enforce_admission_control
+
 
 def purchase_course(tool_context: ToolContext) -> dict:
     """
@@ -109,4 +111,5 @@ sales_agent = Agent(
     - Emphasize the hands-on nature of building a real AI application
     """,
     tools=[purchase_course],
+    before_model_callback=enforce_admission_control,
 )
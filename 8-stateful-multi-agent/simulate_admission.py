@@ -0,0 +1,114 @@
+"""
+Admission Control Simulation
+
+Drives the AdmissionController with 1,000 simulated users, a handful of which
+are noisy, and reports how the admitted calls were shared. No model is called.
+
+Usage:
+    python simulate_admission.py [--users 1000] [--noisy 10] [--seconds 15]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from customer_service_agent.admission import AdmissionController
+
+
+def jain_index(values):
+    """Jain's fairness index: 1.0 when every user got the same share."""
+    total = sum(values)
+    squares = sum(v * v for v in values)
+    return (total * total) / (len(values) * squares) if squares else 1.0
+
+
+async def simulate_user(controller, user_id, rate, deadline, results):
+    """Send requests as a Poisson process until the deadline."""
+    sent = admitted = 0
+    waits = []
+    while True:
+        delay = random.expovariate(rate)
+        if time.monotonic() + delay >= deadline:
+            break
+        await asyncio.sleep(delay)
+        sent += 1
+        decision = await controller.acquire(user_id, random.randint(200, 2000))
+        if decision.admitted:
+            admitted += 1
+            waits.append(decision.waited_seconds)
+    results[user_id] = (sent, admitted, waits)
+
+
+async def main_async(args):
+    controller = AdmissionController(
+        user_requests_per_minute=args.user_rpm,
+        user_tokens_per_minute=args.user_rpm * 2_000,
+        global_requests_per_minute=args.global_rpm,
+        global_tokens_per_minute=args.global_rpm * 1_500,
+        burst_seconds=5,
+        max_queue_size=args.queue_size,
+        max_wait_seconds=2.0,
+    )
+
+    deadline = time.monotonic() + args.seconds
+    results = {}
+    users = []
+    for i in range(args.users):
+        noisy = i < args.noisy
+        rate = args.noisy_rate if noisy else args.polite_rate
+        users.append(
+            simulate_user(controller, f"user-{i:04d}", rate, deadline, results)
+        )
+    await asyncio.gather(*users)
+
+    noisy_ids = {f"user-{i:04d}" for i in range(args.noisy)}
+    polite = [r for u, r in results.items() if u not in noisy_ids]
+    noisy = [r for u, r in results.items() if u in noisy_ids]
+
+    def summarize(label, group):
+        sent = sum(r[0] for r in group)
+        admitted = sum(r[1] for r in group)
+        waits = [w for r in group for w in r[2]]
+        ratios = [r[1] / r[0] for r in group if r[0]]
+        print(f"{label}: {len(group)} users")
+        print(f"  sent={sent} admitted={admitted} ({admitted / max(sent, 1):.1%})")
+        if waits:
+            waits.sort()
+            p95 = waits[int(len(waits) * 0.95) - 1] if len(waits) > 1 else waits[0]
+            print(
+                f"  wait mean={statistics.mean(waits) * 1000:.1f}ms "
+                f"p95={p95 * 1000:.1f}ms"
+            )
+        if ratios:
+            print(f"  admit-ratio fairness (Jain)={jain_index(ratios):.3f}")
+        return admitted
+
+    print(f"\n=== Admission simulation ({args.seconds}s) ===")
+    polite_admitted = summarize("Polite users", polite)
+    noisy_admitted = summarize("Noisy users", noisy)
+    total = polite_admitted + noisy_admitted
+    print(f"\nNoisy share of admitted calls: {noisy_admitted / max(total, 1):.1%}")
+    print(
+        f"Global admitted rate: {total / args.seconds * 60:.0f}/min "
+        f"(limit {args.global_rpm}/min)"
+    )
+    print(f"Controller stats: {controller.stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--noisy", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--polite-rate", type=float, default=0.1, help="req/s")
+    parser.add_argument("--noisy-rate", type=float, default=20, help="req/s")
+    parser.add_argument("--user-rpm", type=float, default=20)
+    parser.add_argument("--global-rpm", type=float, default=6000)
+    parser.add_argument("--queue-size", type=int, default=200)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()